@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Replay recorded Bash commands through gh-api-guard and report throughput.
+
+Compares the compiled single-pass rule table in scripts/gh-api-guard.py
+against the previous per-pattern re.search implementation (kept below as
+the reference), checks that both reach the same decision for every
+command, and reports decisions per second.
+
+Usage:
+    uv run bench/bench_gh_api_guard.py
+    uv run bench/bench_gh_api_guard.py --corpus commands.jsonl
+    uv run bench/bench_gh_api_guard.py --count 20000 --repeat 5
+
+Corpus format: one hook payload per line ({"tool_input": {"command": ...}}),
+or one plain command per line. Without --corpus a synthetic corpus of
+--count commands is generated from common agent commands.
+"""
+
+import argparse
+import importlib.util
+import json
+import random
+import re
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+SAMPLE_COMMANDS = [
+    "gh api repos/{owner}/{repo}/issues/{n}",
+    "gh api repos/{owner}/{repo}/issues/{n}/comments --jq '.[].body'",
+    "gh api -X POST repos/{owner}/{repo}/issues/{n}/comments -f body='done'",
+    "gh api --method PATCH repos/{owner}/{repo}/issues/{n} -f state=closed",
+    "gh api graphql -f query='{{ viewer {{ login }} }}'",
+    "gh issue edit {n} --repo {owner}/{repo} --add-label in-progress --remove-label to-do",
+    "gh issue edit {n} --repo {owner}/{repo} --title 'New title'",
+    "gh issue edit {n} --add-label review --body-file notes.md",
+    "gh issue view {n} --repo {owner}/{repo} --json title,body",
+    "git -c core.editor=true rebase --continue",
+    "git -c user.name=bot commit -m 'wip' --amend",
+    "git -c color.ui=never log --oneline -n {n}",
+    "git -c core.pager=cat diff HEAD~{n}",
+    "git -c http.postBuffer=524288000 push origin issue-{n} --force-with-lease",
+    "git -c x=y stash drop",
+    "git status && git diff --stat",
+    "ls -la .claude/tracking/issue-{n}",
+    "uv run ~/.claude/lib/fetch_issue_context.py {n}",
+    "git commit -m 'Fix parser\n\nRefs {owner}/{repo}#{n}'",
+]
+
+OWNERS = ["DaveX2001", "MariusWilsch", "acme"]
+REPOS = ["deliverable-tracking", "claude-code-improvements", "some-repo"]
+
+
+def load_guard():
+    """Import scripts/gh-api-guard.py (hyphenated file name) as a module."""
+    spec = importlib.util.spec_from_file_location(
+        "gh_api_guard", SCRIPTS_DIR / "gh-api-guard.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_decide(command: str) -> str | None:
+    """Previous implementation: one re.search per pattern per command."""
+    if "gh api" in command:
+        write_patterns = [
+            r"--method\s+DELETE", r"--method\s+PATCH",
+            r"--method\s+POST", r"--method\s+PUT",
+            r"-X\s+DELETE", r"-X\s+PATCH", r"-X\s+POST", r"-X\s+PUT",
+        ]
+        if any(re.search(p, command, re.IGNORECASE) for p in write_patterns):
+            return None
+        return "Read-only gh api operation (GET)"
+
+    if "gh issue edit" in command:
+        label_patterns = [r'--add-label', r'--remove-label']
+        non_label_patterns = [
+            r'--title', r'--body', r'--assignee', r'--milestone', r'--project',
+        ]
+        has_label_op = any(re.search(p, command) for p in label_patterns)
+        has_non_label_op = any(re.search(p, command) for p in non_label_patterns)
+        if has_label_op and not has_non_label_op:
+            return "Label-only gh issue edit"
+        return None
+
+    if re.search(r'^git\s+-c\b', command):
+        risky_patterns = [
+            r'reset\s+--hard', r'push\s+.*(-f|--force)', r'commit\s+.*--amend',
+            r'clean\s+-[fd]', r'\brebase\b', r'branch\s+-[dD]', r'stash\s+(drop|clear)',
+        ]
+        if any(re.search(p, command) for p in risky_patterns):
+            return None
+        return "Safe git -c operation"
+
+    return None
+
+
+def load_corpus(path: Path) -> list[str]:
+    """Read commands from hook payload JSONL or plain lines."""
+    commands = []
+    for line in path.read_text().splitlines():
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            commands.append(line)
+            continue
+        if isinstance(data, dict):
+            command = (data.get("tool_input") or {}).get("command")
+            if isinstance(command, str):
+                commands.append(command)
+    return commands
+
+
+def synthetic_corpus(count: int, seed: int = 0) -> list[str]:
+    """Generate commands from SAMPLE_COMMANDS with varied owners/repos/numbers."""
+    rng = random.Random(seed)
+    return [
+        rng.choice(SAMPLE_COMMANDS).format(
+            owner=rng.choice(OWNERS), repo=rng.choice(REPOS), n=rng.randint(1, 999)
+        )
+        for _ in range(count)
+    ]
+
+
+def measure(decide, commands: list[str], repeat: int) -> float:
+    """Best-of-repeat decisions per second."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for command in commands:
+            decide(command)
+        best = min(best, time.perf_counter() - start)
+    return len(commands) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gh-api-guard rule evaluation")
+    parser.add_argument("--corpus", type=Path, help="Recorded commands (JSONL payloads or lines)")
+    parser.add_argument("--count", type=int, default=5000, help="Synthetic corpus size")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs (best is reported)")
+    args = parser.parse_args()
+
+    commands = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.count)
+    if not commands:
+        print(json.dumps({"error": "Corpus is empty"}))
+        return
+
+    start = time.perf_counter()
+    guard = load_guard()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    def compiled_decide(command: str) -> str | None:
+        return guard.decide(guard.classify(command))
+
+    mismatches = [c for c in commands if compiled_decide(c) != legacy_decide(c)]
+
+    result = {
+        "commands": len(commands),
+        "module_load_ms": round(load_ms, 2),
+        "compiled_decisions_per_sec": round(measure(compiled_decide, commands, args.repeat)),
+        "legacy_decisions_per_sec": round(measure(legacy_decide, commands, args.repeat)),
+        "mismatches": len(mismatches),
+        "mismatch_examples": mismatches[:5],
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Replay tool calls through the hooks.json chains and report hook latency.
+
+Parses hooks/hooks.json and runs every recorded (or synthetic) tool call
+through the PreToolUse and PostToolUse hooks whose matcher fits its tool
+name, exactly as configured: each command runs through `sh -c` with the
+payload on stdin and CLAUDE_PLUGIN_ROOT set. SessionStart hooks run once
+first, so the Bash chain is measured against a running hook daemon like in
+a real session (--no-daemon measures the script fallback instead).
+
+Reports p50/p95/p99 latency and forks per hook and per chain. A chain is
+one matcher group of one event; its latency is the sum of its hooks, run
+one after another. Forks are new processes per hook run (the hook's own
+shell included), read from the system-wide counter in /proc/stat - keep
+the machine otherwise idle. They are null where /proc/stat is missing.
+
+Baselines: --save-baseline stores the report; --compare checks a new run
+against it and exits 1 if any hook or chain p95 grew by more than
+--tolerance (and by at least --min-ms, to ignore timer noise).
+
+Usage:
+    uv run bench/bench_hooks.py
+    uv run bench/bench_hooks.py --corpus payloads.jsonl --repeat 3
+    uv run bench/bench_hooks.py --save-baseline
+    uv run bench/bench_hooks.py --compare --tolerance 0.2
+    uv run bench/bench_hooks.py --no-daemon
+
+Corpus format: one hook payload per line ({"tool_name": ..., "tool_input":
+{...}}); a payload with only tool_input.command is a Bash call. Without
+--corpus, --count Bash and Read calls are generated from common agent
+commands (see bench_gh_api_guard.py).
+
+The daemon started here uses a private XDG_RUNTIME_DIR and exits after
+DAEMON_IDLE seconds, so it never answers a real session's hooks.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_gh_api_guard import load_corpus, synthetic_corpus
+
+PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+HOOKS_FILE = PLUGIN_ROOT / "hooks" / "hooks.json"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "hooks.json"
+
+# Events replayed for each tool call, in order
+TOOL_EVENTS = ["PreToolUse", "PostToolUse"]
+
+# Idle timeout of the benchmark's own hook daemon (seconds)
+DAEMON_IDLE = 15
+
+# Share of synthetic calls that are Read instead of Bash
+READ_SHARE = 0.2
+
+READ_PATHS = [
+    "/home/user/project/lib/fetch_issue_context.py",
+    "/home/user/project/README.md",
+    "/home/user/.claude/projects/-home-user-project/{n:08x}-session.jsonl",
+    "/home/user/project/.claude/tracking/issue-{n}/tracking.md",
+]
+
+
+def hook_name(command: str) -> str:
+    """Short name for a hook command: its script file, else its first word."""
+    try:
+        words = shlex.split(command)
+    except ValueError:
+        words = command.split()
+    for word in words:
+        if "/" in word and "." in os.path.basename(word):
+            return os.path.basename(word)
+    return words[0] if words else command
+
+
+def load_chains(path: Path) -> dict[str, list[dict]]:
+    """{event: [{name, matcher, hooks: [{name, command}]}]} from hooks.json."""
+    config = json.loads(path.read_text()).get("hooks", {})
+    chains = {}
+    for event, groups in config.items():
+        for group in groups:
+            matcher = group.get("matcher", "")
+            hooks = [
+                {"name": hook_name(hook["command"]), "command": hook["command"]}
+                for hook in group.get("hooks", []) if hook.get("type") == "command"
+            ]
+            name = f"{event}:{matcher}" if matcher else event
+            chains.setdefault(event, []).append({"name": name, "matcher": matcher, "hooks": hooks})
+    return chains
+
+
+def matches(matcher: str, tool_name: str) -> bool:
+    """Hook matcher semantics: empty or * matches all, else a regex on the tool name."""
+    if matcher in ("", "*"):
+        return True
+    try:
+        return re.fullmatch(matcher, tool_name) is not None
+    except re.error:
+        return matcher == tool_name
+
+
+def load_payloads(path: Path) -> list[dict]:
+    """Read hook payloads; bare commands become Bash calls."""
+    payloads = []
+    for line in path.read_text().splitlines():
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(data, dict) or not isinstance(data.get("tool_input"), dict):
+            continue
+        payloads.append({
+            "tool_name": data.get("tool_name") or "Bash",
+            "tool_input": data["tool_input"]
+        })
+    if not payloads:
+        # Plain command lines, as accepted by bench_gh_api_guard.py
+        payloads = [{"tool_name": "Bash", "tool_input": {"command": c}} for c in load_corpus(path)]
+    return payloads
+
+
+def synthetic_payloads(count: int, seed: int = 0) -> list[dict]:
+    """Mix of Bash commands and Read calls (some on conversation JSONL)."""
+    rng = random.Random(seed)
+    commands = iter(synthetic_corpus(count, seed))
+    payloads = []
+    for _ in range(count):
+        if rng.random() < READ_SHARE:
+            file_path = rng.choice(READ_PATHS).format(n=rng.randint(1, 999))
+            payloads.append({"tool_name": "Read", "tool_input": {"file_path": file_path}})
+        else:
+            payloads.append({"tool_name": "Bash", "tool_input": {"command": next(commands)}})
+    return payloads
+
+
+def fork_counter() -> int | None:
+    """Processes created since boot (Linux), or None."""
+    try:
+        with open("/proc/stat", "rb") as f:
+            for line in f:
+                if line.startswith(b"processes "):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def run_hook(command: str, payload: bytes, env: dict) -> tuple[float, int | None, str]:
+    """Run one hook command; return (milliseconds, forks, decision)."""
+    before = fork_counter()
+    start = time.perf_counter()
+    proc = subprocess.run(
+        command, shell=True, input=payload, capture_output=True, env=env, timeout=60
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    after = fork_counter()
+    forks = after - before if before is not None and after is not None else None
+    return elapsed, forks, decision(proc.returncode, proc.stdout)
+
+
+def decision(exit_code: int, stdout: bytes) -> str:
+    """allow/ask/deny from hook output, block for exit 2, else pass."""
+    if exit_code == 2:
+        return "block"
+    if exit_code != 0:
+        return "error"
+    try:
+        output = json.loads(stdout)
+        return output["hookSpecificOutput"]["permissionDecision"]
+    except (ValueError, KeyError, TypeError):
+        return "pass"
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = math.ceil(q / 100 * len(values)) - 1
+    return values[max(0, min(len(values) - 1, index))]
+
+
+def summarize(samples: dict[str, dict]) -> dict[str, dict]:
+    """Latency percentiles, fork counts and decisions per name."""
+    summary = {}
+    for name, sample in samples.items():
+        latencies = sorted(sample["ms"])
+        forks = sorted(f for f in sample["forks"] if f is not None)
+        entry = {
+            "runs": len(latencies),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "forks_p50": percentile(forks, 50) if forks else None,
+            "forks_max": forks[-1] if forks else None
+        }
+        if sample.get("decisions"):
+            entry["decisions"] = dict(sorted(sample["decisions"].items()))
+        summary[name] = entry
+    return summary
+
+
+def wait_for_daemon(env: dict, timeout: float = 2.0) -> bool:
+    """Wait until the daemon started by SessionStart has created its socket."""
+    runtime_dir = Path(env["XDG_RUNTIME_DIR"]) / "claude-code-team-plugin"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if any(runtime_dir.glob("hooks-*.sock")):
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def replay(chains: dict, payloads: list[dict], repeat: int, env: dict, workdir: Path) -> dict:
+    """Run SessionStart once, then every payload through its tool chains."""
+    hooks, chain_samples = {}, {}
+
+    def record(samples: dict, name: str, ms: float, forks: int | None, result: str | None = None):
+        sample = samples.setdefault(name, {"ms": [], "forks": [], "decisions": {}})
+        sample["ms"].append(ms)
+        sample["forks"].append(forks)
+        if result:
+            sample["decisions"][result] = sample["decisions"].get(result, 0) + 1
+
+    def run_chain(chain: dict, payload: dict):
+        data = json.dumps(payload).encode()
+        total_ms, total_forks = 0.0, 0
+        for hook in chain["hooks"]:
+            ms, forks, result = run_hook(hook["command"], data, env)
+            record(hooks, f"{chain['name']}/{hook['name']}", ms, forks, result)
+            total_ms += ms
+            total_forks = None if forks is None or total_forks is None else total_forks + forks
+        record(chain_samples, chain["name"], total_ms, total_forks)
+
+    transcript = workdir / "transcript.jsonl"
+    transcript.touch()
+    base = {"session_id": "bench", "transcript_path": str(transcript), "cwd": os.getcwd()}
+
+    for chain in chains.get("SessionStart", []):
+        run_chain(chain, {**base, "hook_event_name": "SessionStart", "source": "startup"})
+    if chains.get("SessionStart"):
+        wait_for_daemon(env)
+
+    for _ in range(repeat):
+        for payload in payloads:
+            for event in TOOL_EVENTS:
+                event_payload = {**base, "hook_event_name": event, **payload}
+                if event == "PostToolUse":
+                    event_payload["tool_response"] = {}
+                for chain in chains.get(event, []):
+                    if matches(chain["matcher"], payload["tool_name"]):
+                        run_chain(chain, event_payload)
+
+    return {"hooks": summarize(hooks), "chains": summarize(chain_samples)}
+
+
+def compare(report: dict, baseline: dict, tolerance: float, min_ms: float) -> list[dict]:
+    """Hooks and chains whose p95 regressed beyond tolerance."""
+    regressions = []
+    for section in ("hooks", "chains"):
+        for name, entry in report[section].items():
+            old = baseline.get(section, {}).get(name)
+            if not old:
+                continue
+            delta = entry["p95_ms"] - old["p95_ms"]
+            if delta > min_ms and entry["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+                regressions.append({
+                    "name": name,
+                    "baseline_p95_ms": old["p95_ms"],
+                    "p95_ms": entry["p95_ms"],
+                    "ratio": round(entry["p95_ms"] / old["p95_ms"], 2) if old["p95_ms"] else None
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hooks.json hook chains")
+    parser.add_argument("--corpus", type=Path, help="Recorded hook payloads (JSONL)")
+    parser.add_argument("--count", type=int, default=200, help="Synthetic corpus size")
+    parser.add_argument("--repeat", type=int, default=1, help="Replays of the corpus")
+    parser.add_argument("--hooks", type=Path, default=HOOKS_FILE, help="hooks.json to replay")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Make the daemon unreachable to measure the script fallback")
+    parser.add_argument("--save-baseline", type=Path, nargs="?", const=DEFAULT_BASELINE,
+                        metavar="PATH", help=f"Save the report (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--compare", type=Path, nargs="?", const=DEFAULT_BASELINE,
+                        metavar="PATH", help="Compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed p95 growth as a fraction (default: 0.25)")
+    parser.add_argument("--min-ms", type=float, default=2.0,
+                        help="Ignore p95 growth below this many ms (default: 2)")
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.corpus) if args.corpus else synthetic_payloads(args.count)
+    if not payloads:
+        print(json.dumps({"error": "Corpus is empty"}))
+        sys.exit(1)
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = json.loads(args.compare.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            print(json.dumps({"error": f"Cannot read baseline {args.compare}: {e}"}))
+            sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        runtime_dir = workdir / "run"
+        runtime_dir.mkdir(mode=0o700)
+        if args.no_daemon:
+            # hook-daemon.py refuses a socket directory others can access
+            socket_dir = runtime_dir / "claude-code-team-plugin"
+            socket_dir.mkdir()
+            socket_dir.chmod(0o755)
+        env = {
+            **os.environ,
+            "CLAUDE_PLUGIN_ROOT": str(PLUGIN_ROOT),
+            "CLAUDE_ENV_FILE": str(workdir / "env"),
+            "CLAUDE_HOOK_DAEMON_IDLE": str(DAEMON_IDLE),
+            "XDG_RUNTIME_DIR": str(runtime_dir)
+        }
+
+        chains = load_chains(args.hooks)
+        if args.no_daemon:
+            chains.pop("SessionStart", None)
+        report = replay(chains, payloads, args.repeat, env, workdir)
+
+    report = {
+        "payloads": len(payloads),
+        "repeat": args.repeat,
+        "daemon": not args.no_daemon,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        **report
+    }
+
+    if baseline is not None:
+        report["regressions"] = compare(report, baseline, args.tolerance, args.min_ms)
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(report, indent=2) + "\n")
+
+    print(json.dumps(report, indent=2))
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
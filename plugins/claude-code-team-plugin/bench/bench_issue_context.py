@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Check fetch_issue_context.py's request paths against a stub gh.
+
+Runs lib/fetch_issue_context.py with a stub `gh` first on PATH. The stub
+serves a chain of issues (each the parent of the next) with a fixed
+latency and logs every call. Each path must give the same output as the
+single-query path; the report shows the gh calls and wall time of each:
+
+    tree        one GraphQL request: the issue with nested parents
+    serial      --serial: gh issue view, then one request per ancestor level
+    fallback    the single query fails: the serial path after it
+    batch       several issues in one aliased GraphQL request
+
+Usage:
+    uv run bench/bench_issue_context.py
+    uv run bench/bench_issue_context.py --depth 8 --latency 0.1
+    uv run bench/bench_issue_context.py --depth 14   # past ANCESTOR_DEPTH
+
+Returns:
+    JSON with depth, latency_ms, ok and checks of {name, gh_calls,
+    expected_calls, tree_queries, same_output, ms, ok}; exits 1 if a check
+    fails.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "lib" / "fetch_issue_context.py"
+
+sys.path.insert(0, str(SCRIPT.parent))
+from fetch_issue_context import ANCESTOR_DEPTH
+
+REPO = "octo/stub"
+
+# Issues served by the stub; 1 is the root, n's parent is n - 1
+STUB_GH = '''#!{python}
+import json, os, re, sys, time
+
+args = sys.argv[1:]
+with open(os.environ["GH_STUB_LOG"], "a") as log:
+    log.write(json.dumps(args) + "\\n")
+time.sleep(float(os.environ.get("GH_STUB_LATENCY", "0")))
+
+
+def issue(n):
+    comments = [
+        {{"author": {{"login": f"user{{i}}"}}, "createdAt": f"2026-01-01T00:00:{{i:02d}}Z",
+         "body": f"comment {{i}} on {{n}}"}}
+        for i in range(n % 7)
+    ]
+    return {{
+        "title": f"Issue {{n}}", "state": "OPEN" if n % 2 else "CLOSED",
+        "body": f"Body of issue {{n}}", "labels": [{{"name": "to-do"}}, {{"name": "stub"}}],
+        "comments": comments
+    }}
+
+
+# Like GraphQL, a level selected without "parent {{" has no parent key
+def parents(n, depth):
+    if n <= 1:
+        return None
+    p = n - 1
+    parent = {{"number": p, "title": f"Issue {{p}}", "state": issue(p)["state"]}}
+    if depth > 1:
+        parent["parent"] = parents(p, depth - 1)
+    return parent
+
+
+def node(n, query):
+    data = issue(n)
+    last = int(re.search(r"comments\\(last: (\\d+)\\)", query).group(1))
+    result = {{
+        "title": data["title"], "state": data["state"], "body": data["body"],
+        "labels": {{"nodes": data["labels"]}},
+        "comments": {{"totalCount": len(data["comments"]), "nodes": data["comments"][-last:]}}
+    }}
+    depth = query.count("parent {{")
+    if depth:
+        result["parent"] = parents(n, depth)
+    return result
+
+
+def field(name):
+    for flag, value in zip(args, args[1:]):
+        if flag in ("-f", "-F") and value.startswith(name + "="):
+            return value.split("=", 1)[1]
+    return None
+
+
+if args[:2] == ["issue", "view"]:
+    print(json.dumps(issue(int(args[2]))))
+elif args[:2] == ["api", "graphql"]:
+    query = field("query")
+    if "fragment IssueContext" in query:
+        aliases = re.findall(r"(i\\d+): issue\\(number: (\\d+)\\)", query)
+        print(json.dumps({{"data": {{"repository": {{a: node(int(n), query) for a, n in aliases}}}}}}))
+    elif "$number" in query:
+        if os.environ.get("GH_STUB_FAIL_TREE"):
+            sys.exit(1)
+        print(json.dumps({{"data": {{"repository": {{"issue": node(int(field("number")), query)}}}}}}))
+    else:
+        n = int(re.search(r"issue\\(number: (\\d+)\\)", query).group(1))
+        parent = parents(n, 1)
+        print(json.dumps({{"data": {{"repository": {{"issue": {{"parent": parent}}}}}}}}))
+else:
+    sys.exit(1)
+'''
+
+
+def run(workdir: Path, args: list[str], latency: float, fail_tree: bool = False) -> dict:
+    """Run fetch_issue_context.py against the stub; returns output, calls and time."""
+    log = workdir / "gh.log"
+    log.write_text("")
+    env = {
+        **os.environ,
+        "PATH": f"{workdir / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}",
+        "GH_STUB_LOG": str(log),
+        "GH_STUB_LATENCY": str(latency),
+        "CLAUDE_PLUGIN_CACHE_DIR": str(workdir / "cache"),
+        "CLAUDE_OFFLINE_FIRST": "0"
+    }
+    if fail_tree:
+        env["GH_STUB_FAIL_TREE"] = "1"
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), *args, "--repo", REPO, "--no-cache"],
+        cwd=workdir / "project", env=env, capture_output=True, text=True
+    )
+    ms = (time.perf_counter() - start) * 1000
+
+    calls = [json.loads(line) for line in log.read_text().splitlines()]
+    return {
+        "stdout": result.stdout,
+        "calls": calls,
+        "tree_queries": sum(
+            1 for call in calls if call[:2] == ["api", "graphql"] and "$number" in " ".join(call)
+        ),
+        "ms": ms
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check fetch_issue_context.py against a stub gh")
+    parser.add_argument("--depth", type=int, default=8, help="Ancestors of the checked issue (default: 8)")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Seconds each stub gh call takes (default: 0.05)"
+    )
+    args = parser.parse_args()
+
+    depth = max(1, args.depth)
+    issue = depth + 1
+    batch = [str(n) for n in range(issue, issue - 3, -1) if n >= 1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / "project").mkdir()
+        stub = workdir / "bin" / "gh"
+        stub.parent.mkdir()
+        stub.write_text(STUB_GH.format(python=sys.executable))
+        stub.chmod(0o755)
+
+        singles = {n: run(workdir, [n], args.latency) for n in batch}
+        reference = singles[str(issue)]
+        try:
+            expected = json.loads(reference["stdout"])
+        except json.JSONDecodeError:
+            print(json.dumps({"error": f"No JSON from the tree path: {reference['stdout'][:200]}"}))
+            sys.exit(1)
+        if "error" in expected:
+            print(json.dumps({"error": f"Tree path failed: {expected['error']}"}))
+            sys.exit(1)
+
+        # Each ancestor level is one request, plus the last one finding no
+        # parent - unless the walk stops at its depth limit first
+        serial_calls = 1 + min(depth + 1, ANCESTOR_DEPTH)
+        scenarios = [
+            ("tree", reference, 1),
+            ("serial", run(workdir, [str(issue), "--serial"], args.latency), serial_calls),
+            ("fallback", run(workdir, [str(issue)], args.latency, fail_tree=True), 2 + serial_calls),
+        ]
+
+        checks = []
+        for name, result, calls in scenarios:
+            try:
+                same = json.loads(result["stdout"]) == expected
+            except json.JSONDecodeError:
+                same = False
+            checks.append((name, result, calls, same))
+
+        result = run(workdir, batch, args.latency)
+        try:
+            lines = [json.loads(line) for line in result["stdout"].splitlines()]
+            same = lines == [json.loads(singles[n]["stdout"]) for n in batch]
+        except json.JSONDecodeError:
+            same = False
+        checks.append(("batch", result, 1, same))
+
+    report = []
+    for name, result, calls, same in checks:
+        ok = same and len(result["calls"]) == calls
+        if name == "serial":
+            ok = ok and result["tree_queries"] == 0
+        report.append({
+            "name": name,
+            "gh_calls": len(result["calls"]),
+            "expected_calls": calls,
+            "tree_queries": result["tree_queries"],
+            "same_output": same,
+            "ms": round(result["ms"], 1),
+            "ok": ok
+        })
+
+    ok = all(check["ok"] for check in report)
+    print(json.dumps({
+        "depth": depth,
+        "latency_ms": round(args.latency * 1000),
+        "ok": ok,
+        "checks": report
+    }, indent=2))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Compare JSON decoding backends on a transcript usage scan.
+
+Generates a synthetic conversation transcript (or uses --transcript), then
+scans it once per backend the way context_usage.py does a full scan: every
+line is read, lines passing the byte prefilter are decoded into usage
+records. Each scan runs in its own process so peak RSS is per backend.
+
+Modes:
+    baseline       json.loads on every line (no prefilter)
+    json           prefilter + content cut + stdlib json
+    orjson         prefilter + content cut + orjson        (if installed)
+    msgspec        prefilter + typed msgspec structs       (if installed)
+
+Usage:
+    uv run bench/bench_transcript_decoders.py
+    uv run bench/bench_transcript_decoders.py --lines 100000 --repeat 3
+    uv run bench/bench_transcript_decoders.py --transcript ~/.claude/projects/<project>/<id>.jsonl
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+LIB_DIR = Path(__file__).resolve().parent.parent / "lib"
+
+TEXT = (
+    "Let me check the worktree first. The parser reads the transcript from "
+    "the end and stops at the newest usage entry. "
+)
+CODE = (
+    'def main():\n    parser = argparse.ArgumentParser(description="Fetch issue")\n'
+    '    parser.add_argument("issue", help="Issue number")\n'
+    '    print(json.dumps({"error": f"Not found: {args.issue}"}))\n'
+)
+
+
+def synthetic_transcript(path: Path, lines: int, seed: int = 0) -> None:
+    """Write a transcript shaped like Claude Code's.
+
+    Mixes user prompts, tool results (with their toolUseResult copies) and
+    assistant messages with usage; about 10% of entries are sidechain.
+    """
+    rng = random.Random(seed)
+    tokens = 20_000
+
+    with path.open("w") as f:
+        for i in range(lines):
+            header = {
+                "parentUuid": str(uuid.UUID(int=rng.getrandbits(128))),
+                "isSidechain": rng.random() < 0.1,
+                "userType": "external",
+                "cwd": "/home/user/project",
+                "sessionId": "3f1c2b7a-0000-4000-8000-000000000000",
+                "version": "2.0.0",
+                "gitBranch": "issue-227"
+            }
+            entry_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            timestamp = f"2026-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}.000Z"
+            kind = rng.random()
+
+            if kind < 0.1:
+                entry = {
+                    **header, "type": "user",
+                    "message": {"role": "user", "content": TEXT * rng.randint(1, 5)},
+                    "uuid": entry_id, "timestamp": timestamp
+                }
+            elif kind < 0.45:
+                output = CODE * rng.randint(1, 30)
+                entry = {
+                    **header, "type": "user",
+                    "message": {"role": "user", "content": [
+                        {"tool_use_id": "toolu_01", "type": "tool_result", "content": output}
+                    ]},
+                    "uuid": entry_id, "timestamp": timestamp,
+                    "toolUseResult": {"stdout": output, "stderr": "", "interrupted": False}
+                }
+            else:
+                tokens += rng.randint(0, 400)
+                entry = {
+                    **header,
+                    "message": {
+                        "model": "claude-sonnet-4-5-20250929",
+                        "id": f"msg_{i}",
+                        "type": "message",
+                        "role": "assistant",
+                        "content": [
+                            {"type": "text", "text": TEXT * rng.randint(1, 20)},
+                            {"type": "tool_use", "id": "toolu_01", "name": "Bash",
+                             "input": {"command": "git status", "description": "Check status"}}
+                        ],
+                        "stop_reason": None,
+                        "stop_sequence": None,
+                        "usage": {
+                            "input_tokens": 4,
+                            "cache_creation_input_tokens": rng.randint(0, 2000),
+                            "cache_read_input_tokens": tokens,
+                            "output_tokens": rng.randint(1, 800)
+                        }
+                    },
+                    "requestId": f"req_{i}",
+                    "type": "assistant",
+                    "uuid": entry_id,
+                    "timestamp": timestamp
+                }
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def scan(path: Path, mode: str) -> tuple[int, int]:
+    """Scan the transcript once. Returns (lines read, usage records decoded)."""
+    sys.path.insert(0, str(LIB_DIR))
+    from decoders import get_usage_decoder, is_usage_candidate
+
+    lines = records = 0
+    with path.open("rb") as f:
+        if mode == "baseline":
+            for line in f:
+                lines += 1
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue
+                message = data.get("message") if isinstance(data, dict) else None
+                if isinstance(message, dict) and message.get("usage") and data.get("isSidechain") is not True:
+                    records += 1
+            return lines, records
+
+        decode_usage = get_usage_decoder(mode)
+        for line in f:
+            lines += 1
+            if not is_usage_candidate(line):
+                continue
+            record = decode_usage(line)
+            if record is not None and record.usage and not record.is_sidechain:
+                records += 1
+    return lines, records
+
+
+def worker(path: Path, mode: str, repeat: int) -> None:
+    """Run in a subprocess: time repeated scans, print one JSON result."""
+    rss_before = peak_rss_mb()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lines, records = scan(path, mode)
+        best = min(best, time.perf_counter() - start)
+
+    print(json.dumps({
+        "mode": mode,
+        "lines": lines,
+        "usage_records": records,
+        "seconds": round(best, 3),
+        "lines_per_sec": round(lines / best),
+        "mb_per_sec": round(path.stat().st_size / best / 1e6, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "startup_rss_mb": rss_before
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcript JSON decoding backends")
+    parser.add_argument("--transcript", type=Path, help="Existing transcript to scan")
+    parser.add_argument("--lines", type=int, default=100_000, help="Synthetic transcript size")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs (best is reported)")
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(Path(args.worker[1]), args.worker[0], args.repeat)
+        return
+
+    sys.path.insert(0, str(LIB_DIR))
+    from decoders import available_backends
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.transcript
+        if path is None:
+            path = Path(tmp) / "transcript.jsonl"
+            synthetic_transcript(path, args.lines)
+        elif not path.exists():
+            print(json.dumps({"error": f"File not found: {path}"}))
+            return
+
+        results = []
+        for mode in ["baseline", *reversed(available_backends())]:
+            proc = subprocess.run(
+                [sys.executable, __file__, "--worker", mode, str(path), "--repeat", str(args.repeat)],
+                capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                results.append({"mode": mode, "error": proc.stderr.strip().splitlines()[-1:]})
+                continue
+            results.append(json.loads(proc.stdout))
+
+        print(json.dumps({
+            "transcript_bytes": path.stat().st_size,
+            "results": results
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,36 +2,382 @@
 """Calculate Claude Code context usage from conversation JSONL.
 
 Reads the most recent main-chain entry's token usage and returns percentage
-against 200k token limit. Skips sidechain entries, API errors, and entries
-without usage data.
+against the model's context window (MODEL_CONTEXT_LIMITS by message.model,
+200k otherwise; overridable). Skips sidechain entries, API errors, and
+entries without usage data.
+
+The transcript is memory-mapped and read backwards from EOF: line
+boundaries are found with rfind() on the mapped bytes, lines that cannot
+hold main-chain usage are rejected in place, and only the rest are handed
+to the decoder as zero-copy memoryviews (see decoders.py). Cost does not
+grow with transcript length. Use --full-scan to force a forward scan of
+every line; pages already scanned are released as it goes, so resident
+memory stays bounded however large the transcript is.
+
+Between hook invocations a checkpoint (byte offset plus the best entry found
+so far) is kept per transcript in the plugin cache, keyed by path, inode and
+size. Since transcripts are append-only, the next call only parses the bytes
+appended since then. Truncation or rotation invalidates the checkpoint.
+
+--series emits the context size of every main-chain turn in file order,
+plus the burn rate (tokens per turn over the last --window turns since the
+last compaction) and how many turns remain before the limit at that rate,
+so long sessions can wind down before the gate trips. The series is
+checkpointed the same way.
 
 Usage:
     uv run ~/.claude/lib/context_usage.py <conversation_path>
+    uv run ~/.claude/lib/context_usage.py <conversation_path> --full-scan
+    uv run ~/.claude/lib/context_usage.py <conversation_path> --no-checkpoint
+    uv run ~/.claude/lib/context_usage.py <conversation_path> --series [--window 10]
+    uv run ~/.claude/lib/context_usage.py '~/.claude/projects/*/*.jsonl' [--jobs 8]
+    uv run ~/.claude/lib/context_usage.py <path> --limits '{"claude-sonnet-4": 1000000}'
     uv run ~/.claude/lib/context_usage.py --help
 
+Several paths, glob patterns or a directory (its *.jsonl files, recursively)
+switch to batch mode: transcripts are processed in a process pool and
+printed as JSON Lines, one per transcript with its path, in input order.
+
+A single path without options (the context gate's call) skips argparse,
+and the process pool is only imported in batch mode, so the common case
+starts fast under `python3 -S` (see plugin_cli.py).
+
 Returns:
-    JSON with tokens and percentage, or error message.
+    JSON with tokens, percentage, model and limit (plus turns, burn_rate,
+    turns_remaining and series with --series), or error message.
 
 Reference: https://codelynx.dev/posts/calculate-claude-code-context
 """
 
-import argparse
+from __future__ import annotations
+
+import glob
 import json
+import os
 import sys
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Callable, Iterator, Optional
 
+from decoders import UsageLine, get_usage_decoder, is_usage_candidate_span
+from plugin_cache import get_cache_dir, key_digest, load_json, save_json
+from transcript import Buffer, expand_paths, iter_spans, iter_spans_reverse, open_buffer
+
+# Limit for models not in the table below
 MAX_CONTEXT_TOKENS = 200_000
 
+# Context window by model name prefix (longest match wins). The API reports
+# the same model name with and without the 1M-token context beta, so fleets
+# on it override the table, e.g. CLAUDE_CONTEXT_LIMITS='{"claude-sonnet-4": 1000000}'
+MODEL_CONTEXT_LIMITS = {
+    "claude-opus-4": 200_000,
+    "claude-sonnet-4": 200_000,
+    "claude-haiku-4": 200_000,
+    "claude-3-7-sonnet": 200_000,
+    "claude-3-5": 200_000,
+}
+
+# Bytes before the checkpoint offset kept to detect in-place rewrites
+FINGERPRINT_SIZE = 64
+
+# Turns the burn rate is averaged over
+BURN_WINDOW = 10
+
+# A turn below this fraction of the previous one means compaction or /clear
+RESET_RATIO = 0.8
+
+# (timestamp, usage, model)
+Entry = tuple[datetime, dict, Optional[str]]
+
+# Fastest installed JSON backend (see decoders.py)
+_decode_usage = get_usage_decoder()
+
+
+def load_limits(spec: str | None = None) -> dict[str, int]:
+    """Return MODEL_CONTEXT_LIMITS with overrides applied.
+
+    Args:
+        spec: JSON object of model prefix -> tokens, inline or as a file
+            path; defaults to $CLAUDE_CONTEXT_LIMITS
+
+    Raises:
+        ValueError: The overrides are not a prefix -> positive int mapping
+    """
+    spec = spec if spec is not None else os.environ.get("CLAUDE_CONTEXT_LIMITS", "")
+    if not spec.strip():
+        return dict(MODEL_CONTEXT_LIMITS)
+
+    try:
+        text = spec if spec.lstrip().startswith("{") else Path(spec).expanduser().read_text()
+        overrides = json.loads(text)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid context limits: {e}") from e
+
+    if not isinstance(overrides, dict) or not all(
+        isinstance(v, int) and not isinstance(v, bool) and v > 0 for v in overrides.values()
+    ):
+        raise ValueError("Context limits must map model prefixes to positive token counts")
+
+    return {**MODEL_CONTEXT_LIMITS, **overrides}
+
+
+def context_limit(model: str | None, limits: dict[str, int] | None = None) -> int:
+    """Context window for a model: longest matching prefix, else MAX_CONTEXT_TOKENS."""
+    limits = MODEL_CONTEXT_LIMITS if limits is None else limits
+    matches = [prefix for prefix in limits if model and model.startswith(prefix)]
+    return limits[max(matches, key=len)] if matches else MAX_CONTEXT_TOKENS
+
+
+def _parse_usage_record(line: bytes | memoryview) -> tuple[datetime, UsageLine] | None:
+    """Decode one JSONL line and return (timestamp, record) if it counts.
+
+    Returns None for undecodable lines, entries without usage data,
+    sidechain entries, API errors, and entries without a valid timestamp.
+    """
+    record = _decode_usage(line)
+    if record is None:
+        return None
+
+    # Skip if no usage data
+    if not record.usage:
+        return None
+
+    # Skip sidechain entries (agent calls)
+    if record.is_sidechain:
+        return None
+
+    # Skip API error messages
+    if record.is_api_error:
+        return None
+
+    # Skip entries without timestamp
+    timestamp_str = record.timestamp
+    if not timestamp_str:
+        return None
+
+    try:
+        entry_time = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+
+    return entry_time, record
+
+
+def _parse_usage_entry(line: bytes | memoryview) -> Entry | None:
+    """Decode one JSONL line and return (timestamp, usage, model) if it counts."""
+    parsed = _parse_usage_record(line)
+    if parsed is None:
+        return None
+    entry_time, record = parsed
+    model = record.model if isinstance(record.model, str) else None
+    return entry_time, record.usage, model
+
+
+def _usage_tokens(usage: dict) -> int:
+    """Context size of a turn: all input token types summed."""
+    input_tokens = usage.get("input_tokens", 0) or 0
+    cache_read = usage.get("cache_read_input_tokens", 0) or 0
+    cache_creation = usage.get("cache_creation_input_tokens", 0) or 0
+    return input_tokens + cache_read + cache_creation
+
+
+def _decode_span(buf: Buffer, start: int, end: int, parse: Callable = _parse_usage_entry):
+    """Run parse on buf[start:end] through a memoryview, without copying the line."""
+    with memoryview(buf)[start:end] as line:
+        return parse(line)
+
+
+def _scan_tail(path: Path) -> tuple[bool, Entry | None]:
+    """Find the newest usage entry by reading the transcript backwards.
+
+    Stops at the last valid entry in file order, after checking it against
+    the valid entry just before it. Transcripts are appended in time order,
+    so a newer timestamp earlier in the file means the order can't be
+    trusted.
+
+    Returns:
+        (True, entry) when the tail answer is reliable (entry may be None
+        for transcripts without usage data), (False, None) when timestamps
+        are out of order and a full scan is needed.
+    """
+    candidate = None
+
+    with open_buffer(path) as buf:
+        for start, end in iter_spans_reverse(buf):
+            # Cheap pre-filter: only lines that can hold usage get decoded
+            if not is_usage_candidate_span(buf, start, end):
+                continue
+
+            entry = _decode_span(buf, start, end)
+            if entry is None:
+                continue
+
+            if candidate is None:
+                candidate = entry
+                continue
+
+            if entry[0] > candidate[0]:
+                return False, None
+            return True, candidate
+
+    return True, candidate
+
+
+def _scan_forward(
+    path: Path, offset: int = 0, best: Entry | None = None
+) -> tuple[Entry | None, int]:
+    """Scan complete lines from offset onward, keeping the newest valid entry.
+
+    Args:
+        path: Transcript path
+        offset: Byte offset of the first line to scan (0 = full scan)
+        best: Newest entry found before offset, if any
+
+    Returns:
+        (newest entry, offset just past the last complete line). A trailing
+        line without newline may still be mid-write, so it is parsed but the
+        offset stays before it and the next call reads it again.
+    """
+    with open_buffer(path) as buf:
+        for start, end in iter_spans(buf, offset):
+            if buf[end - 1:end] == b"\n":
+                offset = end
+
+            if not is_usage_candidate_span(buf, start, end):
+                continue
+
+            entry = _decode_span(buf, start, end)
+            if entry is None:
+                continue
+
+            if best is None or entry[0] > best[0]:
+                best = entry
+
+    return best, offset
+
+
+def _complete_offset(path: Path, size: int) -> int:
+    """Return the offset just past the last newline within the first size bytes."""
+    with open_buffer(path) as buf:
+        return buf.rfind(b"\n", 0, size) + 1
+
+
+def _read_fingerprint(path: Path, offset: int) -> str:
+    """Return the bytes just before offset, hex-encoded."""
+    start = max(0, offset - FINGERPRINT_SIZE)
+    with path.open("rb") as f:
+        f.seek(start)
+        return f.read(offset - start).hex()
+
+
+def _checkpoint_file(path: Path, kind: str = "") -> Path:
+    """Checkpoint location for a transcript, keyed by its resolved path."""
+    suffix = f".{kind}" if kind else ""
+    return get_cache_dir("context_usage") / f"{key_digest(str(path.resolve()))}{suffix}.json"
+
+
+def _load_checkpoint_data(path: Path, stat: os.stat_result, kind: str = "") -> dict | None:
+    """Load a checkpoint's raw data if it still describes this file.
+
+    A checkpoint is valid only when the inode matches (no rotation), the
+    file has not shrunk (no truncation), and the bytes before the stored
+    offset are unchanged (no in-place rewrite). An unusable cache directory
+    counts as no checkpoint.
+    """
+    try:
+        data = load_json(_checkpoint_file(path, kind))
+    except OSError:
+        return None
+    if not data:
+        return None
+
+    try:
+        if (
+            data["path"] != str(path.resolve())
+            or data["inode"] != stat.st_ino
+            or data["size"] > stat.st_size
+            or data["offset"] > stat.st_size
+            or _read_fingerprint(path, data["offset"]) != data["fingerprint"]
+        ):
+            return None
+    except (KeyError, TypeError, OSError):
+        return None
+    return data
+
+
+def _save_checkpoint_data(
+    path: Path, stat: os.stat_result, offset: int, kind: str = "", **state
+) -> None:
+    """Persist the scan position plus mode-specific state for the next invocation.
+
+    Best effort like the rest of the cache: a failure only costs the next
+    call a rescan.
+    """
+    try:
+        save_json(_checkpoint_file(path, kind), {
+            "path": str(path.resolve()),
+            "inode": stat.st_ino,
+            "size": max(stat.st_size, offset),
+            "offset": offset,
+            "fingerprint": _read_fingerprint(path, offset),
+            **state
+        })
+    except OSError:
+        pass
+
+
+def _load_checkpoint(path: Path, stat: os.stat_result) -> tuple[Entry | None, int] | None:
+    """Load the newest-entry checkpoint for a transcript.
+
+    Returns:
+        (best entry, offset) or None if missing or invalid
+    """
+    data = _load_checkpoint_data(path, stat)
+    if not data:
+        return None
+
+    try:
+        best = None
+        if data["timestamp"] is not None:
+            best = (datetime.fromisoformat(data["timestamp"]), data["usage"], data.get("model"))
+        return best, data["offset"]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _save_checkpoint(path: Path, stat: os.stat_result, best: Entry | None, offset: int) -> None:
+    """Persist the scan position and best entry for the next invocation."""
+    _save_checkpoint_data(
+        path, stat, offset,
+        timestamp=best[0].isoformat() if best else None,
+        usage=best[1] if best else None,
+        model=best[2] if best else None
+    )
+
 
-def get_context_usage(transcript_path: str) -> dict:
+def get_context_usage(
+    transcript_path: str,
+    full_scan: bool = False,
+    use_checkpoint: bool = True,
+    limits: dict[str, int] | None = None
+) -> dict:
     """Calculate context usage from conversation JSONL.
 
+    With a valid checkpoint only the bytes appended since the last call are
+    parsed. Otherwise reads the transcript backwards from EOF and stops at
+    the newest valid entry, falling back to a full scan if timestamps turn
+    out to be out of order.
+
     Args:
         transcript_path: Path to conversation JSONL file
+        full_scan: Always scan the whole file, ignoring any checkpoint
+        use_checkpoint: Read and update the on-disk checkpoint
+        limits: Model limit table (see load_limits); built-in table if None
 
     Returns:
-        dict with 'tokens', 'percentage', or 'error'
+        dict with 'tokens', 'percentage', 'model' and 'limit' (the model's
+        context window), or 'error'
     """
     path = Path(transcript_path)
 
@@ -39,78 +385,261 @@ def get_context_usage(transcript_path: str) -> dict:
         return {"error": f"File not found: {transcript_path}"}
 
     try:
-        content = path.read_text()
+        stat = path.stat()
+        use_checkpoint = use_checkpoint and not full_scan
+        checkpoint = _load_checkpoint(path, stat) if use_checkpoint else None
+
+        if checkpoint is not None:
+            best, offset = checkpoint
+            if offset < stat.st_size:
+                best, offset = _scan_forward(path, offset, best)
+        else:
+            in_order, best = (False, None) if full_scan else _scan_tail(path)
+            if in_order:
+                offset = _complete_offset(path, stat.st_size)
+            else:
+                best, offset = _scan_forward(path)
+
+        # Nothing new scanned: the stored checkpoint is still exact
+        if use_checkpoint and (checkpoint is None or offset != checkpoint[1]):
+            _save_checkpoint(path, stat, best, offset)
     except Exception as e:
         return {"error": f"Failed to read file: {e}"}
 
-    lines = content.strip().split("\n")
-    if not lines or lines == [""]:
-        return {"tokens": 0, "percentage": 0}
+    most_recent_usage = best[1] if best else None
+    model = best[2] if best else None
+    limit = context_limit(model, limits)
+    if not most_recent_usage:
+        return {"tokens": 0, "percentage": 0, "model": model, "limit": limit}
 
-    most_recent_usage = None
-    most_recent_timestamp = None
+    total_tokens = _usage_tokens(most_recent_usage)
+    percentage = min(100, round((total_tokens / limit) * 100))
 
-    for line in lines:
-        if not line.strip():
-            continue
+    return {
+        "tokens": total_tokens,
+        "percentage": percentage,
+        "model": model,
+        "limit": limit
+    }
 
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
-            continue
 
-        # Skip if no usage data
-        message = data.get("message", {})
-        if not message or not message.get("usage"):
-            continue
+def _scan_series(
+    path: Path,
+    offset: int = 0,
+    series: list[int] | None = None,
+    last_id: str | None = None,
+    model: str | None = None
+) -> tuple[list[int], str | None, str | None, int]:
+    """Append the context size of each main-chain turn from offset onward.
 
-        # Skip sidechain entries (agent calls)
-        if data.get("isSidechain") is True:
-            continue
+    Claude Code writes one line per content block, each carrying the same
+    message id and usage, so consecutive lines of one message count as one
+    turn. Only complete lines are read: a line still being written is
+    picked up by the next call, which keeps appending exact.
 
-        # Skip API error messages
-        if data.get("isApiErrorMessage") is True:
-            continue
+    Returns:
+        (series, id and model of the last message counted, offset just past
+        the last complete line)
+    """
+    series = list(series or [])
+    with open_buffer(path) as buf:
+        for start, end in iter_spans(buf, offset):
+            if buf[end - 1:end] != b"\n":
+                break
+            offset = end
 
-        # Skip entries without timestamp
-        timestamp_str = data.get("timestamp")
-        if not timestamp_str:
-            continue
+            if not is_usage_candidate_span(buf, start, end):
+                continue
 
-        try:
-            entry_time = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
-            continue
+            parsed = _decode_span(buf, start, end, _parse_usage_record)
+            if parsed is None:
+                continue
 
-        if most_recent_timestamp is None or entry_time > most_recent_timestamp:
-            most_recent_timestamp = entry_time
-            most_recent_usage = message.get("usage")
+            record = parsed[1]
+            if record.message_id is not None and record.message_id == last_id:
+                continue
+            last_id = record.message_id
+            if isinstance(record.model, str):
+                model = record.model
+            series.append(_usage_tokens(record.usage))
 
-    if not most_recent_usage:
-        return {"tokens": 0, "percentage": 0}
+    return series, last_id, model, offset
+
+
+def forecast(series: list[int], limit: int, window: int = BURN_WINDOW) -> dict:
+    """Burn rate over the last window turns and the turns left before limit.
+
+    Only turns since the last compaction (a drop below RESET_RATIO of the
+    previous turn) count towards the burn rate.
+
+    Returns:
+        dict with 'burn_rate' (tokens per turn) and 'turns_remaining', both
+        None while there is too little history or the context isn't growing
+    """
+    start = 0
+    for i in range(len(series) - 1, 0, -1):
+        if series[i] < series[i - 1] * RESET_RATIO:
+            start = i
+            break
+
+    recent = series[start:][-(window + 1):]
+    if len(recent) < 2:
+        return {"burn_rate": None, "turns_remaining": None}
+
+    burn_rate = (recent[-1] - recent[0]) / (len(recent) - 1)
+    turns_remaining = None
+    if burn_rate > 0:
+        turns_remaining = max(0, int((limit - recent[-1]) // burn_rate))
+
+    return {"burn_rate": round(burn_rate, 1), "turns_remaining": turns_remaining}
+
+
+def get_context_series(
+    transcript_path: str,
+    window: int = BURN_WINDOW,
+    use_checkpoint: bool = True,
+    limits: dict[str, int] | None = None
+) -> dict:
+    """Per-turn context size series with burn rate and turns-remaining forecast.
+
+    The series is checkpointed like get_context_usage, so each call only
+    parses the bytes appended since the last one.
+
+    Args:
+        transcript_path: Path to conversation JSONL file
+        window: Turns the burn rate is averaged over
+        use_checkpoint: Read and update the on-disk checkpoint
+        limits: Model limit table (see load_limits); built-in table if None
+
+    Returns:
+        dict with 'tokens', 'percentage', 'model', 'limit', 'turns',
+        'burn_rate', 'turns_remaining' and 'series', or 'error'
+    """
+    path = Path(transcript_path)
 
-    # Sum all input token types
-    input_tokens = most_recent_usage.get("input_tokens", 0) or 0
-    cache_read = most_recent_usage.get("cache_read_input_tokens", 0) or 0
-    cache_creation = most_recent_usage.get("cache_creation_input_tokens", 0) or 0
+    if not path.exists():
+        return {"error": f"File not found: {transcript_path}"}
 
-    total_tokens = input_tokens + cache_read + cache_creation
-    percentage = min(100, round((total_tokens / MAX_CONTEXT_TOKENS) * 100))
+    try:
+        stat = path.stat()
+        series, last_id, model, offset = [], None, None, 0
+
+        data = _load_checkpoint_data(path, stat, "series") if use_checkpoint else None
+        if data and isinstance(data.get("series"), list):
+            series, offset = data["series"], data["offset"]
+            last_id, model = data.get("last_id"), data.get("model")
+
+        new_series, last_id, model, new_offset = _scan_series(path, offset, series, last_id, model)
+
+        if use_checkpoint and (data is None or new_offset != offset):
+            _save_checkpoint_data(
+                path, stat, new_offset, "series",
+                series=new_series, last_id=last_id, model=model
+            )
+        series = new_series
+    except Exception as e:
+        return {"error": f"Failed to read file: {e}"}
 
+    tokens = series[-1] if series else 0
+    limit = context_limit(model, limits)
     return {
-        "tokens": total_tokens,
-        "percentage": percentage
+        "tokens": tokens,
+        "percentage": min(100, round((tokens / limit) * 100)),
+        "model": model,
+        "limit": limit,
+        "turns": len(series),
+        **forecast(series, limit, window),
+        "series": series
     }
 
 
+def _usage_for_path(path: str, series: bool = False, **options) -> dict:
+    """One batch result line (runs in a worker process)."""
+    if series:
+        return {"path": path, **get_context_series(path, **options)}
+    return {"path": path, **get_context_usage(path, **options)}
+
+
+def run_batch(paths: list[str], jobs: int | None = None, **options) -> Iterator[dict]:
+    """Compute usage for many transcripts in a process pool, in input order.
+
+    Args:
+        paths: Transcript paths
+        jobs: Worker processes (default: CPU count); 1 runs inline
+        **options: Passed to get_context_usage, or get_context_series with series=True
+    """
+    worker = partial(_usage_for_path, **options)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        yield from map(worker, paths)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Several transcripts per task keep the pickling overhead down
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(worker, paths, chunksize=chunksize)
+
+
 def main():
+    # Context gate fast path: one transcript, no options, no argparse
+    argv = sys.argv[1:]
+    if (len(argv) == 1 and not argv[0].startswith("-")
+            and not glob.has_magic(argv[0]) and not os.path.isdir(argv[0])):
+        try:
+            limits = load_limits(None)
+        except ValueError as e:
+            print(json.dumps({"error": str(e)}))
+            sys.exit(1)
+        print(json.dumps(get_context_usage(argv[0], limits=limits)))
+        return
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Calculate Claude Code context usage from conversation JSONL"
     )
     parser.add_argument(
         "conversation_path",
-        nargs="?",
-        help="Path to conversation JSONL file"
+        nargs="*",
+        help="Path to conversation JSONL file (several paths, globs or a directory for batch mode)"
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Scan every line instead of reading backwards from EOF"
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Neither read nor update the incremental checkpoint"
+    )
+    parser.add_argument(
+        "--series",
+        action="store_true",
+        help="Emit the per-turn token series with burn rate and turns-remaining forecast"
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=BURN_WINDOW,
+        help=f"Turns the burn rate is averaged over (default: {BURN_WINDOW})"
+    )
+    parser.add_argument(
+        "--limits",
+        help="Model prefix -> context tokens overrides, as JSON or a JSON file "
+             "(default: $CLAUDE_CONTEXT_LIMITS)"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Emit JSON Lines (one result per transcript, with its path)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Worker processes for batch mode (default: CPU count)"
     )
 
     args = parser.parse_args()
@@ -119,8 +648,36 @@ def main():
         parser.print_help()
         sys.exit(1)
 
-    result = get_context_usage(args.conversation_path)
-    print(json.dumps(result))
+    try:
+        limits = load_limits(args.limits)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+    if args.series:
+        options = {
+            "series": True,
+            "window": max(1, args.window),
+            "use_checkpoint": not (args.no_checkpoint or args.full_scan),
+            "limits": limits
+        }
+    else:
+        options = {
+            "full_scan": args.full_scan,
+            "use_checkpoint": not args.no_checkpoint,
+            "limits": limits
+        }
+    separators = (",", ":") if args.series else None
+
+    paths = args.conversation_path
+    if args.batch or len(paths) > 1 or glob.has_magic(paths[0]) or os.path.isdir(paths[0]):
+        for result in run_batch(expand_paths(paths), jobs=args.jobs, **options):
+            print(json.dumps(result, separators=separators))
+        return
+
+    result = _usage_for_path(paths[0], **options)
+    result.pop("path")
+    print(json.dumps(result, separators=separators))
 
 
 if __name__ == "__main__":
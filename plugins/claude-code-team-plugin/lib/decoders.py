@@ -0,0 +1,240 @@
+"""JSON decoding layer for transcript scans.
+
+Transcript scans decode one JSONL line at a time, so the decoder is the hot
+path. From cheapest to most expensive:
+
+1. Byte prefilters - is_usage_candidate() rejects lines that cannot hold a
+   main-chain usage entry (no b'"usage"', or b'"isSidechain":true') before
+   anything is decoded. is_usage_candidate_span() does the same for a line
+   inside a larger buffer (e.g. an mmap) without slicing it out.
+2. Content cut - loads_without_content() replaces message.content with
+   null before parsing (see transcript.decode).
+3. Backend - the decoder for what's left:
+   - msgspec: usage lines decode straight into small typed structs; fields
+     the struct doesn't declare (message content, tool results) are
+     skipped without building Python objects. A memoryview line is decoded
+     in place.
+   - orjson: fast generic decoder.
+   - json: the stdlib, always available.
+
+msgspec and orjson are optional: the best installed backend is used, and
+CLAUDE_JSON_BACKEND=msgspec|orjson|json forces one (ignored if the named
+backend is not installed). Lines a fast backend rejects (e.g. lone
+surrogates) are retried with the stdlib, so every backend gives the same
+results - except that orjson reads integers beyond 64 bits as floats.
+
+Usage:
+    from decoders import get_loads, get_usage_decoder, is_usage_candidate
+    decode_usage = get_usage_decoder()
+    if is_usage_candidate(line):
+        record = decode_usage(line)   # UsageLine or None
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, NamedTuple
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKENDS = ("msgspec", "orjson", "json")
+
+USAGE_MARKER = b'"usage"'
+SIDECHAIN_MARKER = b'"isSidechain":true'
+
+# message.content is the first "content" key Claude Code writes, followed by
+# stop_reason (assistant messages) or the end of the message (user messages)
+CONTENT_KEY = b'"content":'
+CONTENT_END_MARKERS = (b',"stop_reason":', b'},"')
+
+
+class UsageLine(NamedTuple):
+    """The fields of a transcript line that usage accounting needs."""
+    timestamp: Any
+    usage: Any
+    model: Any
+    message_id: Any
+    is_sidechain: bool
+    is_api_error: bool
+
+
+def is_usage_candidate(line: bytes) -> bool:
+    """Whether a line may hold a main-chain usage entry (cheap byte check)."""
+    return USAGE_MARKER in line and SIDECHAIN_MARKER not in line
+
+
+def is_usage_candidate_span(buf, start: int, end: int) -> bool:
+    """is_usage_candidate() for buf[start:end], without copying the line."""
+    return buf.find(USAGE_MARKER, start, end) != -1 and buf.find(SIDECHAIN_MARKER, start, end) == -1
+
+
+def available_backends() -> list[str]:
+    """Installed backends, fastest first."""
+    installed = {"msgspec": msgspec is not None, "orjson": orjson is not None, "json": True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def resolve_backend(name: str | None = None) -> str:
+    """Pick a backend: name, else $CLAUDE_JSON_BACKEND, else the fastest installed.
+
+    Raises:
+        ValueError: The backend named by the caller is unknown or not installed
+    """
+    installed = available_backends()
+    if name is None:
+        preferred = os.environ.get("CLAUDE_JSON_BACKEND")
+        return preferred if preferred in installed else installed[0]
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    if name not in installed:
+        raise ValueError(f"JSON backend not installed: {name}")
+    return name
+
+
+def get_loads(backend: str | None = None) -> Callable[[bytes], Any]:
+    """Return a loads(bytes) function for the backend.
+
+    Raises ValueError (like json.loads) for invalid JSON.
+    """
+    backend = resolve_backend(backend)
+    if backend == "json":
+        return json.loads
+
+    if backend == "orjson":
+        fast, errors = orjson.loads, (orjson.JSONDecodeError,)
+    else:
+        fast, errors = msgspec.json.decode, (msgspec.DecodeError,)
+
+    def loads(line: bytes) -> Any:
+        try:
+            return fast(line)
+        except errors:
+            return json.loads(line)
+
+    return loads
+
+
+def _loads_object(line: bytes, loads: Callable[[bytes], Any]) -> dict | None:
+    try:
+        data = loads(line)
+    except ValueError:
+        # JSONDecodeError and UnicodeDecodeError
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def loads_without_content(line: bytes, loads: Callable[[bytes], Any] = json.loads) -> dict | None:
+    """Decode a line with the message.content bytes replaced by null.
+
+    Only block-list content is cut (plain string content is short user
+    text). The cut runs from the first "content" key to the nearest end
+    marker and must end in "]". If it is not exactly the content value -
+    the marker sits inside it, or the key belongs to something else - the
+    result either fails to parse (a cut inside a value leaves brackets
+    unbalanced) or has a non-null message.content, and None is returned.
+    This relies on Claude Code not writing other list-valued message keys
+    after content.
+    """
+    start = line.find(CONTENT_KEY)
+    if start == -1 or line[start + len(CONTENT_KEY):start + len(CONTENT_KEY) + 1] != b"[":
+        return None
+    start += len(CONTENT_KEY)
+
+    ends = [pos for pos in (line.find(m, start) for m in CONTENT_END_MARKERS) if pos != -1]
+    if not ends or line[min(ends) - 1:min(ends)] != b"]":
+        return None
+
+    data = _loads_object(line[:start] + b"null" + line[min(ends):], loads)
+    message = data.get("message") if data else None
+    if not isinstance(message, dict) or "content" not in message or message["content"] is not None:
+        return None
+    return data
+
+
+def _usage_from_dict(data: dict | None) -> UsageLine | None:
+    if data is None:
+        return None
+    message = data.get("message", {})
+    if not isinstance(message, dict):
+        return None
+    return UsageLine(
+        data.get("timestamp"),
+        message.get("usage"),
+        message.get("model"),
+        message.get("id"),
+        data.get("isSidechain") is True,
+        data.get("isApiErrorMessage") is True
+    )
+
+
+if msgspec is not None:
+    class _UsageMessage(msgspec.Struct):
+        id: Any = None
+        model: Any = None
+        usage: Any = None
+
+    class _UsageEntry(msgspec.Struct, rename="camel"):
+        timestamp: Any = None
+        message: _UsageMessage | None = None
+        is_sidechain: Any = None
+        is_api_error_message: Any = None
+
+
+def get_usage_decoder(
+    backend: str | None = None
+) -> Callable[[bytes | memoryview], UsageLine | None]:
+    """Return a function decoding a line into a UsageLine (None if not an entry).
+
+    Lines may be bytes or memoryviews; only msgspec reads a memoryview in
+    place, the other backends copy the line first.
+
+    Raises:
+        ValueError: The requested backend is unknown or not installed
+    """
+    backend = resolve_backend(backend)
+    loads = get_loads(backend)
+
+    def decode_generic(line: bytes | memoryview) -> UsageLine | None:
+        if not isinstance(line, bytes):
+            line = bytes(line)
+        data = loads_without_content(line, loads)
+        if data is None:
+            data = _loads_object(line, loads)
+        return _usage_from_dict(data)
+
+    if backend != "msgspec":
+        return decode_generic
+
+    decoder = msgspec.json.Decoder(_UsageEntry)
+
+    def decode_typed(line: bytes | memoryview) -> UsageLine | None:
+        try:
+            entry = decoder.decode(line)
+        except (msgspec.DecodeError, msgspec.ValidationError):
+            # Not an object of the expected shape, or needs the stdlib
+            return decode_generic(line)
+
+        message = entry.message
+        if message is None:
+            # Missing and null messages differ; rare enough to decode again
+            return decode_generic(line)
+        return UsageLine(
+            entry.timestamp,
+            message.usage,
+            message.model,
+            message.id,
+            entry.is_sidechain is True,
+            entry.is_api_error_message is True
+        )
+
+    return decode_typed
@@ -3,9 +3,39 @@
 
 Replaces fetch_issue_context.sh with Python for JSON output.
 
+The issue, its labels and comments, and the whole parent chain come from a
+single GraphQL request with nested parent selections. The worktree index
+(see worktree_index.py) and the tracking check load concurrently with it.
+--serial uses the older path - `gh issue view`, then one GraphQL request
+per ancestor level - which is also the fallback if the single query fails.
+Read-only gh calls go through the shared response cache (gh_cache.py).
+
+Only the last --comments comments are requested (GraphQL comments(last: N)),
+and the issue body and each comment body are cut to a byte budget with a
+continuation marker, so payload and output stay bounded on long-running
+issues with hundreds of (bot) comments. Output is streamed as it is
+encoded rather than built as one string.
+
+Each successful fetch is kept as a snapshot (snapshot.py). When gh fails,
+the snapshot is served instead of an error; with --offline-first it is
+served straight away while a background process refreshes it.
+
+Several issue numbers (or comma lists and ranges like 20-25) switch to
+batch mode: all issues come from one aliased GraphQL query (i20: issue(...)
+i21: ...), parent chains shared between them are parsed once, tracking
+checks run concurrently, and one JSON line per issue is streamed in the
+order given. An epic with 30 sub-issues loads in a single round-trip.
+
 Usage:
     uv run ~/.claude/lib/fetch_issue_context.py <issue_number> [repo]
+    uv run ~/.claude/lib/fetch_issue_context.py <issue> <issue>... [repo]
+    uv run ~/.claude/lib/fetch_issue_context.py 20-25,31 --repo <repo>
+    uv run ~/.claude/lib/fetch_issue_context.py <issue_number> --descendants
+    uv run ~/.claude/lib/fetch_issue_context.py <issue_number> --offline-first
     uv run ~/.claude/lib/fetch_issue_context.py <issue_number> --repo <repo>
+    uv run ~/.claude/lib/fetch_issue_context.py <issue_number> --serial
+    uv run ~/.claude/lib/fetch_issue_context.py <issue_number> --no-cache
+    uv run ~/.claude/lib/fetch_issue_context.py <issue_number> --comments 50 --max-body-bytes 0
 
 Examples:
     fetch_issue_context.py 377                                    # Uses default repo
@@ -16,20 +46,71 @@ Default repo: DaveX2001/deliverable-tracking
 
 Output fields:
     - issue, repo, title, state, status, labels, body, comments
+      (count, total on the issue, history, recent)
     - worktree: path to issue worktree or null
     - ancestors: list of parent issues with their worktree status (via GraphQL)
+    - descendants (with --descendants): sub-issues with parent, depth and
+      worktree, from the local issue graph (issue_graph.py)
     - tracking: MISSING | NO_AC | HAS_AC
+    - staleness: {"source": "live"} or {"source": "snapshot", "saved_at",
+      "age_seconds"} (see snapshot.py)
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import os
+import sqlite3
 import subprocess
-from pathlib import Path
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Iterator
+
+import gh_cache
+import issue_graph
+import snapshot
+import tracking_index
+from worktree_index import get_worktree_index
+
+# Ancestor traversal depth (safety limit)
+ANCESTOR_DEPTH = 10
+
+# The per-level parent walk answers from the local issue graph (see
+# issue_graph.py) instead when it was synced this recently
+GRAPH_MAX_AGE = 15 * 60
+
+# Snapshot kind for last-known-good issue data (see snapshot.py)
+SNAPSHOT_KIND = "issue-context"
+
+# Issues per aliased GraphQL query in batch mode
+BATCH_SIZE = 50
+
+# Concurrent requests and local checks in batch mode
+FETCH_WORKERS = 8
+
+# Comments fetched (the most recent ones) and kept by format_comments
+COMMENT_LIMIT = 20
+
+# Comments format_comments puts in "recent"; the rest go to "history"
+RECENT_COMMENTS = 5
 
+# Byte budgets for the issue body and each comment body (0 = unlimited)
+MAX_BODY_BYTES = 32 * 1024
+MAX_COMMENT_BYTES = 8 * 1024
+
+TRUNCATION_MARKER = "\n\n[... {omitted} more bytes truncated - full text: {source}]"
+
+
+def run_cmd(cmd: list[str], cwd: str | None = None, cache: bool = True) -> str | None:
+    """Run command and return stdout, or None on failure.
+
+    Read-only gh calls are answered from the response cache when fresh.
+    """
+    if cache:
+        return gh_cache.cached_run(cmd, lambda c: run_cmd(c, cwd, cache=False))
 
-def run_cmd(cmd: list[str], cwd: str | None = None) -> str | None:
-    """Run command and return stdout, or None on failure."""
     try:
         result = subprocess.run(
             cmd, capture_output=True, text=True, timeout=30, cwd=cwd
@@ -39,8 +120,19 @@ def run_cmd(cmd: list[str], cwd: str | None = None) -> str | None:
         return None
 
 
-def get_issue_data(issue: str, repo: str) -> dict | None:
-    """Fetch issue data from GitHub."""
+def get_issue_data(
+    issue: str, repo: str, comments: int = COMMENT_LIMIT, serial: bool = False
+) -> dict | None:
+    """Fetch issue data from GitHub, without the parent chain.
+
+    Uses GraphQL so only the last `comments` comments are transferred;
+    `gh issue view`, which returns all of them, is the fallback and the
+    only request with serial.
+    """
+    tree = None if serial else fetch_issue_tree(issue, repo, depth=0, comments=comments)
+    if tree:
+        return tree[0]
+
     output = run_cmd([
         "gh", "issue", "view", issue,
         "--repo", repo,
@@ -51,10 +143,195 @@ def get_issue_data(issue: str, repo: str) -> dict | None:
         return None
 
     try:
-        return json.loads(output)
+        data = json.loads(output)
     except json.JSONDecodeError:
         return None
 
+    if isinstance(data, dict) and isinstance(data.get("comments"), list):
+        data["commentCount"] = len(data["comments"])
+        data["comments"] = data["comments"][-comments:] if comments > 0 else []
+    return data
+
+
+def build_issue_fields(depth: int = ANCESTOR_DEPTH, comments: int = COMMENT_LIMIT) -> str:
+    """GraphQL selection for an issue, its last comments and `depth` levels of parents."""
+    parent = ""
+    for _ in range(depth):
+        parent = f"parent {{ number title state {parent}}} "
+
+    return f'''
+          title
+          state
+          body
+          labels(first: 100) {{ nodes {{ name }} }}
+          comments(last: {max(1, comments)}) {{
+            totalCount
+            nodes {{ author {{ login }} createdAt body }}
+          }}
+          {parent}'''
+
+
+def build_issue_tree_query(depth: int = ANCESTOR_DEPTH, comments: int = COMMENT_LIMIT) -> str:
+    """Build a GraphQL query for an issue, its last comments and `depth` levels of parents."""
+    return f'''
+    query($owner: String!, $name: String!, $number: Int!) {{
+      repository(owner: $owner, name: $name) {{
+        issue(number: $number) {{{build_issue_fields(depth, comments)}
+        }}
+      }}
+    }}
+    '''
+
+
+def build_issue_batch_query(
+    issues: list[str], depth: int = ANCESTOR_DEPTH, comments: int = COMMENT_LIMIT
+) -> str:
+    """Build one GraphQL query for several issues, aliased i<number>.
+
+    The selection is a fragment, so the query grows by one line per issue.
+    """
+    aliases = "\n".join(
+        f"        i{issue}: issue(number: {issue}) {{ ...IssueContext }}" for issue in issues
+    )
+    return f'''
+    query($owner: String!, $name: String!) {{
+      repository(owner: $owner, name: $name) {{
+{aliases}
+      }}
+    }}
+    fragment IssueContext on Issue {{{build_issue_fields(depth, comments)}
+    }}
+    '''
+
+
+def fetch_issue_tree(
+    issue: str, repo: str, depth: int = ANCESTOR_DEPTH, comments: int = COMMENT_LIMIT
+) -> tuple[dict, list[dict]] | None:
+    """Fetch issue data and its parent chain in one GraphQL request.
+
+    Returns:
+        (data, parents) where data has the shape of `gh issue view --json
+        title,state,body,labels,comments` (only the last `comments`
+        comments, plus commentCount) and parents runs from immediate parent
+        to root with number, title, state. None on any failure.
+    """
+    if not issue.isdigit() or "/" not in repo:
+        return None
+
+    owner, name = repo.split("/", 1)
+    output = run_cmd([
+        "gh", "api", "graphql",
+        "-f", f"query={build_issue_tree_query(depth, comments)}",
+        "-f", f"owner={owner}",
+        "-f", f"name={name}",
+        "-F", f"number={issue}"
+    ])
+    if not output:
+        return None
+
+    try:
+        return parse_issue_node(json.loads(output)["data"]["repository"]["issue"], comments)
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def parse_issue_node(
+    node: dict, comments: int = COMMENT_LIMIT, known: dict[int, list[dict]] | None = None
+) -> tuple[dict, list[dict]]:
+    """Split an issue node (see build_issue_fields) into (data, parents).
+
+    Args:
+        node: GraphQL issue node
+        comments: Comments to keep (the most recent)
+        known: Parent chains already parsed, by issue number; shared
+            ancestors are taken from here and new chains added to it. Only
+            chains that reach a root are added - one cut at the query's
+            depth would make later issues below it see too few ancestors.
+
+    Raises:
+        KeyError, TypeError, AttributeError: The node is incomplete
+    """
+    data = {
+        "title": node["title"],
+        "state": node["state"],
+        "body": node["body"],
+        "labels": node["labels"]["nodes"],
+        "comments": [
+            {
+                "author": c.get("author") or {},
+                "createdAt": c.get("createdAt", ""),
+                "body": c.get("body", "")
+            }
+            for c in node["comments"]["nodes"]
+        ][-comments:] if comments > 0 else [],
+        "commentCount": node["comments"].get("totalCount")
+    }
+
+    parents = []
+    # The deepest parent selected has no "parent" key; a root has it as null
+    complete = "parent" in node
+    parent = node.get("parent")
+    while parent:
+        if known is not None and parent["number"] in known:
+            parents.extend(known[parent["number"]])
+            complete = True
+            break
+        parents.append({
+            "number": parent["number"],
+            "title": parent["title"],
+            "state": parent["state"].lower()
+        })
+        complete = "parent" in parent
+        parent = parent.get("parent")
+
+    if known is not None and complete:
+        # Each ancestor's own chain is the tail starting at it
+        for i, ancestor in enumerate(parents):
+            known.setdefault(ancestor["number"], parents[i:])
+    return data, parents
+
+
+def fetch_issue_batch(
+    issues: list[str],
+    repo: str,
+    depth: int = ANCESTOR_DEPTH,
+    comments: int = COMMENT_LIMIT,
+    known: dict[int, list[dict]] | None = None
+) -> dict[str, tuple[dict, list[dict]]] | None:
+    """Fetch several issues and their parent chains in one aliased GraphQL request.
+
+    Returns:
+        {issue: (data, parents)} as fetch_issue_tree() returns them, for the
+        issues that exist; None if the request failed (gh fails the whole
+        request when any issue number does not resolve).
+    """
+    if not issues or not all(issue.isdigit() for issue in issues) or "/" not in repo:
+        return None
+
+    owner, name = repo.split("/", 1)
+    output = run_cmd([
+        "gh", "api", "graphql",
+        "-f", f"query={build_issue_batch_query(issues, depth, comments)}",
+        "-f", f"owner={owner}",
+        "-f", f"name={name}"
+    ])
+    if not output:
+        return None
+
+    known = {} if known is None else known
+    try:
+        repository = json.loads(output)["data"]["repository"]
+        results = {}
+        for issue in issues:
+            node = repository.get(f"i{issue}")
+            if node:
+                data, parents = parse_issue_node(node, comments, known)
+                # A reused chain can run past depth; match a single fetch
+                results[issue] = data, parents[:depth]
+        return results
+    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+        return None
+
 
 def get_parent_issue(issue: str, repo: str) -> dict | None:
     """Get parent issue via GraphQL API.
@@ -94,87 +371,109 @@ def get_parent_issue(issue: str, repo: str) -> dict | None:
         return None
 
 
-def get_ancestors(issue: str, repo: str) -> list[dict]:
-    """Traverse ancestor chain via GraphQL, collecting worktree info for each.
+def get_parent_chain(issue: str, repo: str) -> list[dict]:
+    """Walk the parent chain one GraphQL request per level.
 
-    Returns list of ancestors from immediate parent to root, each with:
-    - number: issue number
-    - title: issue title
-    - state: open/closed
-    - worktree: path or null
+    A recently synced local issue graph answers without any request.
+
+    Returns parents from immediate parent to root with number, title, state.
     """
-    ancestors = []
+    if issue.isdigit():
+        local = issue_graph.lookup_ancestors(repo, int(issue), GRAPH_MAX_AGE)
+        if local is not None:
+            return [{key: parent[key] for key in ("number", "title", "state")} for parent in local]
+
+    parents = []
     current = issue
 
-    # Traverse up to 10 levels (safety limit)
-    for _ in range(10):
+    # Traverse up to ANCESTOR_DEPTH levels (safety limit)
+    for _ in range(ANCESTOR_DEPTH):
         parent = get_parent_issue(current, repo)
         if not parent:
             break
 
-        # Check worktree for this ancestor
-        worktree = detect_worktree(str(parent["number"]))
+        parents.append(parent)
+        current = str(parent["number"])
 
-        ancestors.append({
-            "number": parent["number"],
-            "title": parent["title"],
-            "state": parent["state"],
-            "worktree": worktree
-        })
+    return parents
 
-        current = str(parent["number"])
 
-    return ancestors
+def with_worktrees(parents: list[dict], worktrees: dict[str, str]) -> list[dict]:
+    """Attach the worktree path (or None) to each ancestor."""
+    return [
+        {**parent, "worktree": worktrees.get(str(parent["number"]))}
+        for parent in parents
+    ]
 
 
-def detect_worktree(issue: str) -> str | None:
-    """Check if a worktree exists for this issue."""
-    output = run_cmd(["git", "worktree", "list"])
-    if not output:
-        return None
+def get_ancestors(issue: str, repo: str) -> list[dict]:
+    """Traverse ancestor chain via GraphQL, collecting worktree info for each.
 
-    for line in output.splitlines():
-        if f"issue-{issue}" in line:
-            # Format: /path/to/worktree  abc1234 [branch-name]
-            parts = line.split()
-            if parts:
-                return parts[0]  # Return the path
+    Returns list of ancestors from immediate parent to root, each with:
+    - number: issue number
+    - title: issue title
+    - state: open/closed
+    - worktree: path or null
+    """
+    return with_worktrees(get_parent_chain(issue, repo), get_worktree_index())
 
-    return None
+
+def detect_worktree(issue: str) -> str | None:
+    """Check if a worktree exists for this issue."""
+    return get_worktree_index().get(str(issue))
 
 
 def check_tracking_status(issue: str) -> str:
     """Check tracking file status for this issue.
 
+    Parsed statuses are cached by mtime (see tracking_index.py).
+
     Returns:
         MISSING: No tracking file
         NO_AC: File exists but no AC section
         HAS_AC: File exists with AC section
     """
-    tracking_file = Path.cwd() / ".claude" / "tracking" / f"issue-{issue}" / "tracking.md"
+    return tracking_index.tracking_status(issue)["tracking"]
 
-    if not tracking_file.exists():
-        return "MISSING"
 
-    try:
-        content = tracking_file.read_text()
-        if "## Acceptance Criteria" in content:
-            return "HAS_AC"
-        return "NO_AC"
-    except Exception:
-        return "MISSING"
+def truncate_body(text: str, max_bytes: int, source: str) -> str:
+    """Cut text to max_bytes of UTF-8 (0 = unlimited), ending in a continuation marker.
 
-
-def format_comments(comments: list[dict], limit_recent: int = 5, limit_history: int = 15) -> dict:
+    Args:
+        text: Issue or comment body
+        max_bytes: Byte budget
+        source: Command that shows the full text, for the marker
+    """
+    data = (text or "").encode()
+    if not max_bytes or len(data) <= max_bytes:
+        return text
+
+    # errors="ignore" drops a multi-byte character split by the cut
+    kept = data[:max_bytes].decode(errors="ignore")
+    return kept + TRUNCATION_MARKER.format(omitted=len(data) - len(kept.encode()), source=source)
+
+
+def format_comments(
+    comments: list[dict],
+    limit_recent: int = RECENT_COMMENTS,
+    limit_history: int = COMMENT_LIMIT - RECENT_COMMENTS,
+    total: int | None = None,
+    max_bytes: int = 0,
+    source: str = ""
+) -> dict:
     """Split comments into history and recent.
 
     Args:
         comments: List of comment objects from GitHub API
         limit_recent: Number of comments to include in recent
         limit_history: Max older comments to include in history
+        total: Comment count on the issue, if known (defaults to len(comments))
+        max_bytes: Byte budget per comment body (0 = unlimited)
+        source: Command that shows the full comments, for truncation markers
     """
-    # Limit to last 20 comments total to avoid truncation
-    comments = comments[-20:] if len(comments) > 20 else comments
+    # Keep only the most recent comments to avoid truncation
+    limit = limit_recent + limit_history
+    comments = comments[len(comments) - limit:] if len(comments) > limit else comments
 
     history = []
     recent = []
@@ -190,76 +489,327 @@ def format_comments(comments: list[dict], limit_recent: int = 5, limit_history:
         history.append({
             "author": c.get("author", {}).get("login", "unknown"),
             "date": c.get("createdAt", ""),
-            "body": c.get("body", "")
+            "body": truncate_body(c.get("body", ""), max_bytes, source)
         })
 
     for c in recent_comments:
         recent.append({
             "author": c.get("author", {}).get("login", "unknown"),
             "date": c.get("createdAt", ""),
-            "body": c.get("body", "")
+            "body": truncate_body(c.get("body", ""), max_bytes, source)
         })
 
     return {
         "count": len(comments),
+        "total": total if total is not None else len(comments),
         "history": history,
         "recent": recent
     }
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Fetch GitHub issue context")
-    parser.add_argument("issue", help="Issue number")
-    parser.add_argument("repo_positional", nargs="?", help="Repository (positional)")
-    parser.add_argument("--repo", dest="repo_flag", help="Repository (flag)")
+def parse_issue_numbers(tokens: list[str]) -> list[str]:
+    """Expand issue arguments: numbers, comma lists and ranges (12 15,18 20-25).
 
-    args = parser.parse_args()
+    Returns unique issue numbers in the order given.
 
-    # Determine repo (flag takes precedence over positional)
-    repo = args.repo_flag or args.repo_positional or "DaveX2001/deliverable-tracking"
-    issue = args.issue
+    Raises:
+        ValueError: A token is not a number or range
+    """
+    issues = []
+    for token in tokens:
+        for part in filter(None, token.split(",")):
+            first, sep, last = part.partition("-")
+            if not first.isdigit() or (sep and not last.isdigit()):
+                raise ValueError(f"Invalid issue number or range: {part}")
+            if sep:
+                issues.extend(str(n) for n in range(int(first), int(last) + 1))
+            else:
+                issues.append(str(int(first)))
+    return list(dict.fromkeys(issues))
+
+
+def issue_status(label_names: list[str]) -> str | None:
+    """Workflow status from labels."""
+    for status in ("to-do", "in-progress", "blocked"):
+        if status in label_names:
+            return status
+    return None
 
-    # Fetch issue data
-    data = get_issue_data(issue, repo)
-    if not data:
-        print(json.dumps({"error": f"Failed to fetch issue #{issue} from {repo}"}))
-        return
 
-    # Extract status from labels
-    label_names = [lbl["name"] for lbl in data.get("labels", [])]
-    status = None
-    if "to-do" in label_names:
-        status = "to-do"
-    elif "in-progress" in label_names:
-        status = "in-progress"
-    elif "blocked" in label_names:
-        status = "blocked"
+def fetch_issue(
+    issue: str, repo: str, serial: bool = False, comments: int = COMMENT_LIMIT
+) -> tuple[dict | None, list[dict]]:
+    """(data, parents) for one issue: single query, else the per-level path."""
+    tree = None if serial else fetch_issue_tree(issue, repo, comments=comments)
+    if tree:
+        return tree
 
-    # Detect worktree
-    worktree = detect_worktree(issue)
+    data = get_issue_data(issue, repo, comments=comments, serial=serial)
+    return data, get_parent_chain(issue, repo) if data else []
 
-    # Get ancestor chain with worktrees
-    ancestors = get_ancestors(issue, repo)
 
-    # Check tracking status
-    tracking = check_tracking_status(issue)
+def load_descendants(issues: list[str], repo: str) -> dict[str, list[dict]]:
+    """Sub-issue trees from the local issue graph, synced incrementally first.
 
-    # Format output
-    output = {
+    If the sync fails, whatever the graph already holds is used.
+    """
+    try:
+        with closing(issue_graph.connect()) as conn:
+            issue_graph.sync(conn, repo)
+            return {issue: issue_graph.get_descendants(conn, repo, int(issue)) for issue in issues}
+    except sqlite3.Error:
+        return {}
+
+
+def build_context(
+    issue: str,
+    repo: str,
+    data: dict,
+    parents: list[dict],
+    worktrees: dict[str, str],
+    tracking: str,
+    comments: int = COMMENT_LIMIT,
+    max_body_bytes: int = MAX_BODY_BYTES,
+    max_comment_bytes: int = MAX_COMMENT_BYTES
+) -> dict:
+    """Assemble the output object for one issue."""
+    label_names = [lbl["name"] for lbl in data.get("labels", [])]
+
+    return {
         "issue": int(issue),
         "repo": repo,
         "title": data.get("title", ""),
         "state": data.get("state", ""),
-        "status": status,
+        "status": issue_status(label_names),
         "labels": label_names,
-        "body": data.get("body", ""),
-        "comments": format_comments(data.get("comments", [])),
-        "worktree": worktree,
-        "ancestors": ancestors,
+        "body": truncate_body(
+            data.get("body", ""), max_body_bytes, f"gh issue view {issue} --repo {repo}"
+        ),
+        "comments": format_comments(
+            data.get("comments", []),
+            limit_recent=min(RECENT_COMMENTS, comments),
+            limit_history=max(0, comments - RECENT_COMMENTS),
+            total=data.get("commentCount"),
+            max_bytes=max_comment_bytes,
+            source=f"gh issue view {issue} --repo {repo} --comments"
+        ),
+        # Worktrees for the issue and its ancestor chain
+        "worktree": worktrees.get(issue),
+        "ancestors": with_worktrees(parents, worktrees),
         "tracking": tracking
     }
 
-    print(json.dumps(output, indent=2))
+
+def _snapshot_key(issue: str, repo: str, comments: int) -> str:
+    return f"{repo}#{issue}:{comments}"
+
+
+def load_snapshots(issues: list[str], repo: str, comments: int) -> dict[str, tuple]:
+    """{issue: ((data, parents), saved_at)} for issues with a snapshot."""
+    snapshots = {}
+    for issue in issues:
+        cached = snapshot.load(SNAPSHOT_KIND, _snapshot_key(issue, repo, comments))
+        if cached and isinstance(cached[0], dict):
+            snapshots[issue] = ((cached[0].get("data"), cached[0].get("parents") or []), cached[1])
+    return snapshots
+
+
+def iter_issue_contexts(
+    issues: list[str],
+    repo: str,
+    serial: bool = False,
+    comments: int = COMMENT_LIMIT,
+    descendants: bool = False,
+    offline_first: bool = False,
+    **limits
+) -> Iterator[dict]:
+    """Yield the context of each issue, in order, fetched in as few requests as possible.
+
+    Issues are requested BATCH_SIZE per aliased GraphQL query, with parent
+    chains shared between issues parsed once. Issues a batch could not
+    resolve (e.g. a missing number fails the whole request) are retried
+    one by one, concurrently. The worktree index and tracking checks load
+    while the requests are in flight.
+
+    Live results are saved as snapshots; an issue that can't be fetched is
+    served from its snapshot instead. With offline_first, issues that have
+    a snapshot are served from it without any request and refreshed by a
+    background process. Each context says which it got in "staleness".
+
+    Args:
+        descendants: Add each issue's sub-issue tree from the local issue graph
+        offline_first: Serve snapshots immediately, refresh in the background
+        limits: max_body_bytes / max_comment_bytes for build_context
+    """
+    snapshots = load_snapshots(issues, repo, comments) if offline_first else {}
+    if snapshots:
+        snapshot.refresh_in_background(f"{SNAPSHOT_KIND}:{repo}", [
+            sys.executable, os.path.abspath(__file__), *snapshots, "--repo", repo,
+            "--comments", str(comments), "--refresh-snapshot"
+        ])
+    live = [issue for issue in issues if issue not in snapshots]
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        worktree_future = pool.submit(get_worktree_index)
+        descendants_future = pool.submit(load_descendants, issues, repo) if descendants else None
+        if len(issues) > 1:
+            # One pass over .claude/tracking/ instead of a read per issue
+            tracking_future = pool.submit(tracking_index.scan_tracking)
+        else:
+            tracking_future = pool.submit(
+                lambda: {issues[0]: tracking_index.tracking_status(issues[0])}
+            )
+
+        results = {}
+        if not serial and len(live) > 1:
+            known = {}
+            chunks = [live[i:i + BATCH_SIZE] for i in range(0, len(live), BATCH_SIZE)]
+            for batch in pool.map(
+                lambda chunk: fetch_issue_batch(chunk, repo, comments=comments, known=known), chunks
+            ):
+                results.update(batch or {})
+
+        retry = [issue for issue in live if issue not in results]
+        retried = pool.map(lambda issue: fetch_issue(issue, repo, serial, comments), retry)
+        results.update(zip(retry, retried))
+
+        saved_at = {issue: cached[1] for issue, cached in snapshots.items()}
+        for issue in live:
+            data, parents = results[issue]
+            key = _snapshot_key(issue, repo, comments)
+            if data:
+                snapshot.save(SNAPSHOT_KIND, key, {"data": data, "parents": parents})
+                continue
+            # gh slow or unavailable: last known good data beats an error
+            snapshots.update(load_snapshots([issue], repo, comments))
+            if issue in snapshots:
+                saved_at[issue] = snapshots[issue][1]
+        results.update({issue: cached[0] for issue, cached in snapshots.items()})
+
+        worktrees = worktree_future.result()
+        for issue in issues:
+            data, parents = results[issue]
+            if not data:
+                yield {"issue": int(issue), "error": f"Failed to fetch issue #{issue} from {repo}"}
+                continue
+            context = build_context(
+                issue, repo, data, parents, worktrees,
+                tracking_future.result().get(issue, tracking_index.MISSING)["tracking"],
+                comments=comments, **limits
+            )
+            if descendants_future:
+                context["descendants"] = with_worktrees(
+                    descendants_future.result().get(issue, []), worktrees
+                )
+            context["staleness"] = snapshot.staleness(saved_at.get(issue))
+            yield context
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch GitHub issue context")
+    parser.add_argument(
+        "issue",
+        nargs="+",
+        help="Issue number; several numbers, comma lists or ranges (20-25) for batch mode. "
+             "A trailing owner/repo is taken as the repository"
+    )
+    parser.add_argument("--repo", dest="repo_flag", help="Repository (flag)")
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="No batched GraphQL: gh issue view, then one request per ancestor level"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the gh response cache"
+    )
+    parser.add_argument(
+        "--descendants",
+        action="store_true",
+        help="Include sub-issues (recursively) from the local issue graph"
+    )
+    parser.add_argument(
+        "--offline-first",
+        action="store_true",
+        default=snapshot.offline_first_default(),
+        help="Serve the last snapshot immediately and refresh it in the background "
+             "(default: $CLAUDE_OFFLINE_FIRST)"
+    )
+    parser.add_argument("--refresh-snapshot", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--comments",
+        type=int,
+        default=COMMENT_LIMIT,
+        help=f"Most recent comments to fetch (default: {COMMENT_LIMIT})"
+    )
+    parser.add_argument(
+        "--max-body-bytes",
+        type=int,
+        default=MAX_BODY_BYTES,
+        help=f"Truncate the issue body beyond this many bytes, 0 = never (default: {MAX_BODY_BYTES})"
+    )
+    parser.add_argument(
+        "--max-comment-bytes",
+        type=int,
+        default=MAX_COMMENT_BYTES,
+        help=f"Truncate each comment body beyond this many bytes, 0 = never (default: {MAX_COMMENT_BYTES})"
+    )
+
+    args = parser.parse_args()
+    if args.no_cache or args.refresh_snapshot:
+        gh_cache.disable()
+
+    # Positional repo follows the issue numbers (flag takes precedence)
+    tokens = args.issue
+    repo_positional = tokens.pop() if len(tokens) > 1 and "/" in tokens[-1] else None
+    repo = args.repo_flag or repo_positional or "DaveX2001/deliverable-tracking"
+
+    try:
+        issues = parse_issue_numbers(tokens)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+    options = {
+        "serial": args.serial,
+        "descendants": args.descendants,
+        "offline_first": args.offline_first and not args.refresh_snapshot,
+        "comments": max(0, args.comments),
+        "max_body_bytes": max(0, args.max_body_bytes),
+        "max_comment_bytes": max(0, args.max_comment_bytes)
+    }
+
+    # Background refresh: fetching live saves the snapshots
+    if args.refresh_snapshot:
+        for _ in iter_issue_contexts(issues, repo, **options):
+            pass
+        return
+
+    # One issue number: a single JSON object, as before
+    if len(tokens) == 1 and tokens[0].isdigit():
+        output = next(iter_issue_contexts(issues, repo, **options))
+        if "error" in output:
+            print(json.dumps({"error": output["error"]}))
+            return
+
+        try:
+            # Encoded and written piece by piece, never as one string
+            json.dump(output, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Reader (e.g. head) went away - stop quietly
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+
+    # Batch: JSON Lines, each written as soon as it is ready
+    try:
+        for output in iter_issue_contexts(issues, repo, **options):
+            sys.stdout.write(json.dumps(output) + "\n")
+            sys.stdout.flush()
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+"""Bounded YAML frontmatter reader for markdown files.
+
+read_frontmatter() reads a file line by line only up to the closing `---`
+line, never more than max_bytes, so large skill files with embedded data
+cost a few hundred bytes per lookup instead of a full read. The closing
+delimiter must be a line of its own, so `---` inside a value does not end
+the block.
+
+parse_frontmatter() understands the subset of YAML used in skill and
+command files: `key: value` scalars (plain, single- or double-quoted),
+folded (`>`) and literal (`|`) block scalars with optional chomping
+indicators, and plain values continued on indented lines. Other nested
+structures are kept as their raw text.
+
+Usage:
+    from frontmatter import read_frontmatter
+    read_frontmatter(Path("SKILL.md")).get("description", "")
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 16 * 1024
+
+KEY_PATTERN = re.compile(r'^([A-Za-z0-9_-][^:]*):(?:\s+(.*)|\s*)$')
+
+
+def read_frontmatter_text(path: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> str | None:
+    """Return the raw text between the opening and closing `---` lines.
+
+    Returns None if the file has no frontmatter, the block is not closed
+    within max_bytes, or the file cannot be read.
+    """
+    lines = []
+    consumed = 0
+    try:
+        with path.open('rb') as f:
+            first = f.readline(max_bytes)
+            if first.rstrip(b'\r\n') != b'---':
+                return None
+            consumed = len(first)
+
+            while consumed < max_bytes:
+                line = f.readline(max_bytes - consumed)
+                if not line:
+                    return None
+                consumed += len(line)
+                if line.rstrip(b'\r\n') == b'---':
+                    return b''.join(lines).decode('utf-8', errors='replace')
+                lines.append(line)
+    except OSError:
+        return None
+
+    return None
+
+
+def _unquote(value: str) -> str:
+    """Strip YAML quotes from a scalar."""
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    return value
+
+
+def _block_scalar(style: str, lines: list[str]) -> str:
+    """Join the lines of a `>` or `|` block scalar."""
+    indent = min((len(line) - len(line.lstrip()) for line in lines if line.strip()), default=0)
+    body = [line[indent:] for line in lines]
+
+    # Trailing blank lines only survive keep (+) chomping
+    trailing = 0
+    while body and not body[-1].strip():
+        body.pop()
+        trailing += 1
+
+    if style.startswith('|'):
+        text = '\n'.join(body)
+    else:
+        # Folded: single newlines become spaces, blank lines stay newlines
+        paragraphs = []
+        current = []
+        for line in body:
+            if line.strip():
+                current.append(line.strip())
+            else:
+                paragraphs.append(' '.join(current))
+                current = []
+        paragraphs.append(' '.join(current))
+        text = '\n'.join(paragraphs)
+
+    if '-' in style or not text:
+        return text
+    if '+' in style:
+        return text + '\n' * (trailing + 1)
+    return text + '\n'
+
+
+def parse_frontmatter(text: str) -> dict:
+    """Parse frontmatter text into a dict of top-level keys to string values."""
+    result = {}
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines):
+        match = KEY_PATTERN.match(lines[i])
+        i += 1
+        if not match:
+            continue
+
+        key = match.group(1).strip()
+        value = (match.group(2) or '').strip()
+
+        # Indented lines belong to this key
+        continuation = []
+        while i < len(lines) and (not lines[i].strip() or lines[i][0] in ' \t'):
+            continuation.append(lines[i])
+            i += 1
+        # Only blank lines after the key: an empty value
+        if not any(line.strip() for line in continuation):
+            continuation = []
+
+        if value[:1] in ('>', '|') and re.fullmatch(r'[>|][+-]?\d?', value.split(' #')[0]):
+            result[key] = _block_scalar(value, continuation)
+        elif continuation and not value:
+            # Nested mapping or list - keep the raw, dedented text
+            indent = min(len(line) - len(line.lstrip()) for line in continuation if line.strip())
+            result[key] = '\n'.join(line[indent:] for line in continuation).strip('\n')
+        elif continuation and value[:1] not in ('"', "'"):
+            parts = [value] + [line.strip() for line in continuation if line.strip()]
+            result[key] = ' '.join(part for part in parts if part)
+        else:
+            if continuation:
+                value = ' '.join([value] + [line.strip() for line in continuation if line.strip()])
+            result[key] = _unquote(value)
+
+    return result
+
+
+def read_frontmatter(path: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> dict:
+    """Read and parse a file's frontmatter, or {} if it has none."""
+    text = read_frontmatter_text(path, max_bytes)
+    return parse_frontmatter(text) if text is not None else {}
@@ -0,0 +1,274 @@
+"""On-disk TTL cache for read-only gh invocations made by lib scripts.
+
+Sits in front of each script's run_cmd. Only invocations known to be
+read-only are cached: gh issue view/list, gh label list, GraphQL queries
+(not mutations) and REST `gh api` GETs. Everything else runs uncached.
+
+- Key: the normalized argv (field flags sorted, query whitespace collapsed)
+- TTL: per endpoint (see ttl_for). Label lists and closed issues are nearly
+  immutable and cached for days; open issues and issue lists for minutes.
+- REST `gh api` GETs store the ETag and revalidate with If-None-Match once
+  expired; a 304 renews the entry without using rate limit. GraphQL has no
+  conditional requests, so expired GraphQL entries are simply refetched.
+- Eviction: least recently used entries go once the cache exceeds
+  CLAUDE_GH_CACHE_MAX_BYTES (default 20 MB).
+- Escape hatch: --no-cache on the CLIs, or CLAUDE_PLUGIN_NO_CACHE=1.
+
+Usage:
+    output = gh_cache.cached_run(cmd, run_uncached)   # sync callers
+    output = gh_cache.lookup(cmd)                      # async callers:
+    gh_cache.store(cmd, output)                        # lookup, run, store
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable
+
+from plugin_cache import get_cache_dir, key_digest, load_json, save_json
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+def _env_int(name: str, default: int) -> int:
+    """Integer from the environment, or default if unset or malformed."""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+MAX_BYTES = _env_int("CLAUDE_GH_CACHE_MAX_BYTES", 20 * 1024 * 1024)
+
+# Flags whose values are request fields (order-insensitive)
+FIELD_FLAGS = {"-f", "-F", "--raw-field", "--field", "-H", "--header"}
+
+enabled = os.environ.get("CLAUDE_PLUGIN_NO_CACHE", "") not in ("1", "true", "yes")
+
+
+def disable() -> None:
+    """Turn the cache off for this process (--no-cache)."""
+    global enabled
+    enabled = False
+
+
+def _fields(cmd: list[str]) -> dict[str, str]:
+    """Collect -f/-F key=value fields of a gh api call."""
+    fields = {}
+    for flag, value in zip(cmd, cmd[1:]):
+        if flag in FIELD_FLAGS and flag not in ("-H", "--header"):
+            key, _, val = value.partition("=")
+            fields[key] = val
+    return fields
+
+
+def endpoint(cmd: list[str]) -> str | None:
+    """Classify a gh invocation, or None if it is not cacheable (not read-only)."""
+    if len(cmd) < 3 or Path(cmd[0]).name != "gh":
+        return None
+
+    group, action = cmd[1], cmd[2]
+    if group == "issue" and action == "view":
+        return "issue-view"
+    if group == "issue" and action == "list":
+        return "issue-list"
+    if group == "label" and action == "list":
+        return "label-list"
+    if group != "api":
+        return None
+
+    if action == "graphql":
+        query = _fields(cmd).get("query", "").lstrip()
+        if not query or query.startswith("mutation"):
+            return None
+        if "label(name:" in query:
+            return "graphql-label-issues"
+        if re.search(r"parent\s*\{", query) and "comments" not in query:
+            return "graphql-parent"
+        return "graphql"
+
+    # REST: only GETs. Without an explicit method, fields make gh send a POST
+    method = next((b for a, b in zip(cmd, cmd[1:]) if a in ("-X", "--method")), None)
+    if method is not None and method.upper() != "GET":
+        return None
+    if method is None and (_fields(cmd) or "--input" in cmd):
+        return None
+    return "rest"
+
+
+def normalize(cmd: list[str]) -> str:
+    """Cache key: argv with field pairs sorted and whitespace collapsed."""
+    positional = []
+    fields = []
+    i = 0
+    while i < len(cmd):
+        arg = cmd[i]
+        if arg in FIELD_FLAGS and i + 1 < len(cmd):
+            fields.append([arg, " ".join(cmd[i + 1].split())])
+            i += 2
+            continue
+        positional.append(arg)
+        i += 1
+
+    positional[0] = "gh"
+    return json.dumps([positional, sorted(fields)], separators=(",", ":"))
+
+
+def _closed(output: str) -> bool:
+    """Whether a response describes a closed issue (or closed parent)."""
+    return re.search(r'"state"\s*:\s*"CLOSED"', output, re.IGNORECASE) is not None
+
+
+def ttl_for(cmd: list[str], output: str) -> int:
+    """Seconds a response stays fresh, by endpoint and content."""
+    kind = endpoint(cmd)
+
+    if kind == "label-list":
+        return DAY
+    if kind == "graphql-parent":
+        # The link belongs to the child, which can be moved under another
+        # parent at any time - a closed parent does not make it stable
+        return 10 * MINUTE
+    if kind == "issue-view":
+        return DAY if _closed(output) else 2 * MINUTE
+    if kind in ("issue-list", "graphql-label-issues"):
+        return 5 * MINUTE
+    if kind == "rest":
+        return 5 * MINUTE
+    # Issue trees and other queries include the live issue being worked on
+    return 2 * MINUTE
+
+
+def _entry_file(key: str) -> Path:
+    return get_cache_dir("gh") / f"{key_digest(key)}.json"
+
+
+def _load(cmd: list[str]) -> tuple[Path, dict | None]:
+    key = normalize(cmd)
+    path = _entry_file(key)
+    entry = load_json(path)
+    if entry and entry.get("key") != key:
+        entry = None
+    return path, entry
+
+
+def _touch(path: Path) -> None:
+    """Mark an entry as recently used (mtime drives LRU eviction)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def lookup(cmd: list[str]) -> str | None:
+    """Return a fresh cached response, or None on miss/expiry/uncacheable."""
+    if not enabled or endpoint(cmd) is None:
+        return None
+
+    path, entry = _load(cmd)
+    if not entry or entry.get("expires_at", 0) < time.time():
+        return None
+
+    _touch(path)
+    return entry.get("output")
+
+
+def store(cmd: list[str], output: str, etag: str | None = None) -> None:
+    """Cache a successful response for a read-only invocation."""
+    if not enabled or endpoint(cmd) is None:
+        return
+
+    key = normalize(cmd)
+    now = time.time()
+    save_json(_entry_file(key), {
+        "key": key,
+        "output": output,
+        "etag": etag,
+        "stored_at": now,
+        "expires_at": now + ttl_for(cmd, output)
+    })
+    evict()
+
+
+def evict(max_bytes: int = MAX_BYTES) -> None:
+    """Delete least recently used entries until the cache is under 80% of max_bytes."""
+    try:
+        entries = [e for e in os.scandir(get_cache_dir("gh")) if e.name.endswith(".json")]
+        stats = [(e.path, e.stat()) for e in entries]
+    except OSError:
+        return
+
+    total = sum(st.st_size for _, st in stats)
+    if total <= max_bytes:
+        return
+
+    for path, st in sorted(stats, key=lambda item: item[1].st_mtime):
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= st.st_size
+        if total <= max_bytes * 0.8:
+            break
+
+
+def _run_rest(cmd: list[str], etag: str | None) -> tuple[int, str | None, str | None]:
+    """Run a REST gh api GET with headers included.
+
+    Returns:
+        (status, body, etag); status 0 if the call failed outright
+    """
+    argv = [*cmd, "--include"]
+    if etag:
+        argv += ["-H", f"If-None-Match: {etag}"]
+
+    try:
+        result = subprocess.run(argv, capture_output=True, text=True, timeout=30)
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return 0, None, None
+
+    # gh exits non-zero on 304 but still prints the response head
+    head, _, body = result.stdout.replace("\r\n", "\n").partition("\n\n")
+    status_match = re.match(r"HTTP/\S+\s+(\d{3})", head)
+    if not status_match:
+        return 0, None, None
+
+    etag_match = re.search(r"^etag:\s*(.+)$", head, re.IGNORECASE | re.MULTILINE)
+    return (
+        int(status_match.group(1)),
+        body.strip(),
+        etag_match.group(1).strip() if etag_match else None
+    )
+
+
+def cached_run(cmd: list[str], run: Callable[[list[str]], str | None]) -> str | None:
+    """Serve cmd from the cache, or run it with `run` and cache the result."""
+    if not enabled or endpoint(cmd) is None:
+        return run(cmd)
+
+    path, entry = _load(cmd)
+    if entry and entry.get("expires_at", 0) >= time.time():
+        _touch(path)
+        return entry.get("output")
+
+    if endpoint(cmd) != "rest":
+        output = run(cmd)
+        if output is not None:
+            store(cmd, output)
+        return output
+
+    status, body, etag = _run_rest(cmd, entry.get("etag") if entry else None)
+    if status == 304 and entry:
+        store(cmd, entry["output"], entry.get("etag"))
+        return entry["output"]
+    if 200 <= status < 300:
+        store(cmd, body, etag)
+        return body
+    return None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Roll up the hook telemetry log by hook, decision and day.
+
+The hooks (scripts/hook_telemetry.py, scripts/hook-telemetry.sh) append
+one record per rule evaluation with its time and decision. This reads the
+log and its rotated predecessor and reports, per group, how often each
+hook ran, how often it allowed / asked / denied / blocked, and how long it
+took - showing where session latency goes and which rules fire often
+enough to deserve a fast path.
+
+Usage:
+    uv run ~/.claude/lib/hook_stats.py
+    uv run ~/.claude/lib/hook_stats.py --days 7
+    uv run ~/.claude/lib/hook_stats.py --group-by hook,decision
+    uv run ~/.claude/lib/hook_stats.py --via script
+
+Returns:
+    JSON with log, records, first/last record time and rows of
+    {day, hook, decision, via (as grouped), count, total_ms, mean_ms,
+    p50_ms, p95_ms, max_ms}, slowest total first; or error message.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+from plugin_cache import get_cache_dir
+
+LOG_NAME = "hook-telemetry.jsonl"
+
+GROUP_FIELDS = ["day", "hook", "decision", "via"]
+
+
+def log_files() -> list[Path]:
+    """Telemetry log and its rotated predecessor, oldest first."""
+    log = get_cache_dir() / LOG_NAME
+    return [path for path in (log.with_name(LOG_NAME + ".1"), log) if path.exists()]
+
+
+def read_records(paths: list[Path], since: float = 0, via: str | None = None) -> list[dict]:
+    """Valid records at or after since, optionally from one path (daemon/script)."""
+    records = []
+    for path in paths:
+        with path.open("rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    ts = float(record["ts"])
+                    ms = float(record["ms"])
+                except (ValueError, KeyError, TypeError):
+                    # Torn last line after a crash, or unrelated data
+                    continue
+                if ts < since or (via and record.get("via") != via):
+                    continue
+                record["ts"], record["ms"] = ts, ms
+                records.append(record)
+    return records
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = math.ceil(q / 100 * len(values)) - 1
+    return values[max(0, min(len(values) - 1, index))]
+
+
+def rollup(records: list[dict], group_by: list[str]) -> list[dict]:
+    """Aggregate records into one row per group, slowest total first."""
+    groups = {}
+    for record in records:
+        fields = {
+            "day": time.strftime("%Y-%m-%d", time.gmtime(record["ts"])),
+            "hook": record.get("hook", "unknown"),
+            "decision": record.get("decision", "unknown"),
+            "via": record.get("via", "unknown")
+        }
+        key = tuple(fields[field] for field in group_by)
+        groups.setdefault(key, []).append(record["ms"])
+
+    rows = []
+    for key, latencies in groups.items():
+        latencies.sort()
+        total = sum(latencies)
+        rows.append({
+            **dict(zip(group_by, key)),
+            "count": len(latencies),
+            "total_ms": round(total, 1),
+            "mean_ms": round(total / len(latencies), 3),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "max_ms": round(latencies[-1], 3)
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll up hook timing and decision telemetry")
+    parser.add_argument(
+        "--group-by",
+        default="day,hook,decision",
+        help=f"Comma-separated fields from {','.join(GROUP_FIELDS)} (default: day,hook,decision)"
+    )
+    parser.add_argument(
+        "--days",
+        type=float,
+        help="Only records from the last N days"
+    )
+    parser.add_argument(
+        "--via",
+        choices=["daemon", "script"],
+        help="Only rules run in the hook daemon, or only standalone scripts"
+    )
+
+    args = parser.parse_args()
+
+    group_by = [field.strip() for field in args.group_by.split(",") if field.strip()]
+    unknown = [field for field in group_by if field not in GROUP_FIELDS]
+    if unknown or not group_by:
+        print(json.dumps({"error": f"Unknown --group-by field(s): {','.join(unknown) or 'none given'}"}))
+        sys.exit(1)
+
+    paths = log_files()
+    if not paths:
+        print(json.dumps({"error": f"No hook telemetry yet in {get_cache_dir()}"}))
+        sys.exit(1)
+
+    since = time.time() - args.days * 86400 if args.days else 0
+    records = read_records(paths, since, args.via)
+
+    def iso(ts: float) -> str:
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+    print(json.dumps({
+        "log": str(paths[-1]),
+        "records": len(records),
+        "first": iso(min(r["ts"] for r in records)) if records else None,
+        "last": iso(max(r["ts"] for r in records)) if records else None,
+        "rows": rollup(records, group_by)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""Local issue graph: parent/child edges and state of a repository's issues.
+
+A SQLite store in the plugin cache holds every issue's number, title,
+state, parent and updatedAt. It is filled by a bulk GraphQL sync (100
+issues per page) and kept current incrementally: each sync asks only for
+issues updated since the newest updatedAt already stored. Ancestor and
+descendant lookups are then recursive queries on the local store, with no
+network calls and no depth limit from request nesting. Worktree links come
+from the worktree index (see worktree_index.py) at query time, so they are
+never stale.
+
+Usage:
+    uv run ~/.claude/lib/issue_graph.py sync [--repo <repo>] [--full]
+    uv run ~/.claude/lib/issue_graph.py ancestors <issue_number> [--repo <repo>] [--sync]
+    uv run ~/.claude/lib/issue_graph.py descendants <issue_number> [--repo <repo>] [--depth N] [--sync]
+
+    from issue_graph import connect, get_descendants
+    with closing(connect()) as conn:
+        get_descendants(conn, repo, 227)
+
+Default repo: DaveX2001/deliverable-tracking
+
+Returns:
+    sync: JSON with repo, pages, fetched, issues, cursor
+    ancestors/descendants: JSON with issue, repo, synced_at and a list of
+    {number, title, state, parent, depth, worktree}; or error message.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+
+from plugin_cache import get_cache_dir
+from worktree_index import get_worktree_index
+
+DEFAULT_REPO = "DaveX2001/deliverable-tracking"
+
+# Issues per sync request (GraphQL maximum)
+PAGE_SIZE = 100
+
+# Traversal depth limit; only guards against parent cycles
+MAX_DEPTH = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    state TEXT NOT NULL,
+    parent INTEGER,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+CREATE INDEX IF NOT EXISTS issues_parent ON issues (repo, parent);
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo TEXT PRIMARY KEY,
+    cursor TEXT,
+    synced_at REAL NOT NULL
+);
+"""
+
+SYNC_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String, $since: DateTime) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, filterBy: {since: $since},
+           orderBy: {field: UPDATED_AT, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { number title state updatedAt parent { number } }
+    }
+  }
+}
+"""
+
+ANCESTORS_SQL = """
+WITH RECURSIVE chain(number, depth) AS (
+    SELECT parent, 1 FROM issues WHERE repo = :repo AND number = :issue AND parent IS NOT NULL
+    UNION ALL
+    SELECT i.parent, c.depth + 1
+    FROM issues i JOIN chain c ON i.repo = :repo AND i.number = c.number
+    WHERE i.parent IS NOT NULL AND c.depth < :depth
+)
+SELECT i.number, i.title, i.state, i.parent, c.depth
+FROM chain c JOIN issues i ON i.repo = :repo AND i.number = c.number
+ORDER BY c.depth
+"""
+
+DESCENDANTS_SQL = """
+WITH RECURSIVE tree(number, depth) AS (
+    SELECT number, 1 FROM issues WHERE repo = :repo AND parent = :issue
+    UNION ALL
+    SELECT i.number, t.depth + 1
+    FROM issues i JOIN tree t ON i.repo = :repo AND i.parent = t.number
+    WHERE t.depth < :depth
+)
+SELECT i.number, i.title, i.state, i.parent, t.depth
+FROM tree t JOIN issues i ON i.repo = :repo AND i.number = t.number
+ORDER BY t.depth, i.number
+"""
+
+
+def graph_path() -> Path:
+    """Location of the issue graph database."""
+    return get_cache_dir() / "issue_graph.sqlite3"
+
+
+def connect(path: Path | None = None) -> sqlite3.Connection:
+    """Open (and create if needed) the issue graph database."""
+    conn = sqlite3.connect(path or graph_path(), timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def run_cmd(cmd: list[str]) -> str | None:
+    """Run command and return stdout, or None on failure.
+
+    Sync requests are never cached: the cursor already limits them to changes.
+    """
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        return result.stdout.strip() if result.returncode == 0 else None
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+
+
+def fetch_page(repo: str, after: str | None, since: str | None) -> dict | None:
+    """Fetch one page of issues (oldest update first), or None on failure."""
+    owner, name = repo.split("/", 1)
+    cmd = [
+        "gh", "api", "graphql",
+        "-f", f"query={SYNC_QUERY}",
+        "-f", f"owner={owner}",
+        "-f", f"name={name}",
+        "-F", f"first={PAGE_SIZE}"
+    ]
+    if after:
+        cmd += ["-f", f"after={after}"]
+    if since:
+        cmd += ["-f", f"since={since}"]
+
+    output = run_cmd(cmd)
+    if not output:
+        return None
+    try:
+        return json.loads(output)["data"]["repository"]["issues"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
+
+
+def get_sync_state(conn: sqlite3.Connection, repo: str) -> sqlite3.Row | None:
+    """The repo's sync cursor and time (0 until one completes), or None if never synced."""
+    return conn.execute(
+        "SELECT cursor, synced_at FROM sync_state WHERE repo = ?", (repo,)
+    ).fetchone()
+
+
+def sync(conn: sqlite3.Connection, repo: str, full: bool = False) -> dict:
+    """Bring the graph for repo up to date.
+
+    Requests only issues updated since the newest stored updatedAt (all of
+    them on the first sync or with full=True). Each page is committed with
+    the cursor as it arrives, so an interrupted sync resumes from where it
+    stopped; synced_at only moves when the last page is in, so a partial
+    sync never makes the graph look current.
+
+    Returns:
+        dict with repo, pages, fetched, issues (stored for repo) and cursor,
+        or 'error'
+    """
+    if "/" not in repo:
+        return {"error": f"Invalid repo: {repo}"}
+
+    state = get_sync_state(conn, repo)
+    since = None if full or state is None else state["cursor"]
+    cursor = since
+
+    pages = fetched = 0
+    after = None
+    while True:
+        page = fetch_page(repo, after, since)
+        if page is None:
+            return {"error": f"Failed to sync issues from {repo}", "pages": pages, "fetched": fetched}
+
+        rows = []
+        for node in page.get("nodes") or []:
+            if not node:
+                continue
+            parent = node.get("parent") or {}
+            rows.append((
+                repo, node["number"], node["title"], node["state"].lower(),
+                parent.get("number"), node["updatedAt"]
+            ))
+            # ISO 8601 UTC timestamps compare as strings
+            cursor = max(cursor or "", node["updatedAt"])
+
+        info = page.get("pageInfo") or {}
+        last = not info.get("hasNextPage")
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO issues (repo, number, title, state, parent, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            if last:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (repo, cursor, synced_at) VALUES (?, ?, ?)",
+                    (repo, cursor, time.time())
+                )
+            else:
+                # Keep the last completed sync's time (0: none completed yet)
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (repo, cursor, synced_at) VALUES (?, ?, "
+                    "COALESCE((SELECT synced_at FROM sync_state WHERE repo = ?), 0))",
+                    (repo, cursor, repo)
+                )
+
+        pages += 1
+        fetched += len(rows)
+        if last:
+            break
+        after = info.get("endCursor")
+
+    count = conn.execute("SELECT COUNT(*) FROM issues WHERE repo = ?", (repo,)).fetchone()[0]
+    return {"repo": repo, "pages": pages, "fetched": fetched, "issues": count, "cursor": cursor}
+
+
+def _rows(conn: sqlite3.Connection, sql: str, repo: str, issue: int, depth: int) -> list[dict]:
+    return [
+        dict(row)
+        for row in conn.execute(sql, {"repo": repo, "issue": issue, "depth": depth})
+    ]
+
+
+def get_ancestors(
+    conn: sqlite3.Connection, repo: str, issue: int, depth: int = MAX_DEPTH
+) -> list[dict]:
+    """Parents of an issue from immediate parent to root.
+
+    Each entry has number, title, state, parent and depth (1 = parent).
+    """
+    return _rows(conn, ANCESTORS_SQL, repo, issue, depth)
+
+
+def get_descendants(
+    conn: sqlite3.Connection, repo: str, issue: int, depth: int = MAX_DEPTH
+) -> list[dict]:
+    """Sub-issues of an issue, breadth first, down to depth levels.
+
+    Each entry has number, title, state, parent and depth (1 = child).
+    """
+    return _rows(conn, DESCENDANTS_SQL, repo, issue, depth)
+
+
+def lookup_ancestors(repo: str, issue: int, max_age: float) -> list[dict] | None:
+    """Ancestors from the local graph if it was synced within max_age seconds.
+
+    Returns None when the graph can't answer - never synced, too old, the
+    issue or one of its ancestors is unknown, or the database is
+    unavailable - so callers fall back to the network.
+    """
+    try:
+        with closing(connect()) as conn:
+            state = get_sync_state(conn, repo)
+            if state is None or time.time() - state["synced_at"] > max_age:
+                return None
+            row = conn.execute(
+                "SELECT parent FROM issues WHERE repo = ? AND number = ?", (repo, issue)
+            ).fetchone()
+            if row is None:
+                return None
+            ancestors = get_ancestors(conn, repo, issue)
+    except sqlite3.Error:
+        return None
+
+    # ANCESTORS_SQL drops a parent without a row of its own, ending the chain
+    # early; a complete chain ends at a root (or at the cycle guard)
+    last_parent = ancestors[-1]["parent"] if ancestors else row["parent"]
+    if last_parent is not None and len(ancestors) < MAX_DEPTH:
+        return None
+    return ancestors
+
+
+def with_worktrees(issues: list[dict], worktrees: dict[str, str]) -> list[dict]:
+    """Attach the worktree path (or None) to each issue."""
+    return [{**issue, "worktree": worktrees.get(str(issue["number"]))} for issue in issues]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local issue graph (parents, sub-issues, state)")
+    parser.add_argument("command", choices=["sync", "ancestors", "descendants"])
+    parser.add_argument("issue", nargs="?", type=int, help="Issue number (ancestors, descendants)")
+    parser.add_argument("--repo", default=DEFAULT_REPO, help=f"Repository (default: {DEFAULT_REPO})")
+    parser.add_argument("--full", action="store_true", help="Resync every issue, not just updated ones")
+    parser.add_argument("--sync", action="store_true", help="Sync incrementally before the lookup")
+    parser.add_argument("--depth", type=int, default=MAX_DEPTH, help="Levels to traverse")
+
+    args = parser.parse_args()
+
+    if args.command != "sync" and args.issue is None:
+        parser.error(f"{args.command} needs an issue number")
+
+    try:
+        with closing(connect()) as conn:
+            if args.command == "sync" or args.sync:
+                result = sync(conn, args.repo, full=args.full)
+                if args.command == "sync" or "error" in result:
+                    print(json.dumps(result))
+                    sys.exit(1 if "error" in result else 0)
+
+            state = get_sync_state(conn, args.repo)
+            if state is None or not state["synced_at"]:
+                print(json.dumps({"error": f"Issue graph for {args.repo} not synced - run: issue_graph.py sync"}))
+                sys.exit(1)
+
+            lookup = get_ancestors if args.command == "ancestors" else get_descendants
+            issues = lookup(conn, args.repo, args.issue, max(1, args.depth))
+    except sqlite3.Error as e:
+        print(json.dumps({"error": f"Issue graph unavailable: {e}"}))
+        sys.exit(1)
+
+    print(json.dumps({
+        "issue": args.issue,
+        "repo": args.repo,
+        "synced_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(state["synced_at"])),
+        args.command: with_worktrees(issues, get_worktree_index())
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,81 +5,161 @@ List skills and commands by discovery phase.
 Usage:
     list_skills_by_discovery.py <phase>
     list_skills_by_discovery.py requirements-clarity
+    list_skills_by_discovery.py --all-phases
 
 Searches all skills and commands for (discovery: <phase>) in their descriptions.
+
+Results come from a persistent catalog in the plugin cache that maps each
+file to its description and discovery phases. Files are only re-read when
+their mtime or size changed, so repeated lookups cost one stat per file.
+Even then only the frontmatter block is read (see frontmatter.py).
 """
 
+from __future__ import annotations
+
+import os
 import sys
 import re
 from pathlib import Path
 
+from frontmatter import parse_frontmatter, read_frontmatter
+from plugin_cache import get_cache_dir, load_json, save_json
+
+CATALOG_VERSION = 2
+
+DISCOVERY_PATTERN = re.compile(r'\(discovery: ([^)]*)\)')
+
 def extract_frontmatter(content: str) -> dict:
-    """Extract YAML frontmatter from markdown file."""
-    if not content.startswith('---'):
-        return {}
+    """Extract YAML frontmatter from markdown file contents.
 
-    # Find closing ---
-    end_idx = content.find('---', 3)
-    if end_idx == -1:
+    Prefer frontmatter.read_frontmatter(path), which stops reading at the
+    closing delimiter instead of needing the whole file.
+    """
+    lines = content.splitlines()
+    if not lines or lines[0].rstrip() != '---':
         return {}
 
-    frontmatter = content[3:end_idx].strip()
-    result = {}
+    # Closing --- must be a line of its own
+    for i, line in enumerate(lines[1:], 1):
+        if line.rstrip() == '---':
+            return parse_frontmatter('\n'.join(lines[1:i]))
 
-    for line in frontmatter.split('\n'):
-        if ':' in line:
-            key, _, value = line.partition(':')
-            result[key.strip()] = value.strip()
+    return {}
 
-    return result
 
+def iter_sources():
+    """Yield (kind, name, path, stat) for every installed skill and command file.
 
-def find_skills_by_discovery(phase: str) -> list[tuple[str, str]]:
-    """Find all skills with (discovery: phase) in description."""
-    results = []
+    Uses scandir so each file costs a single stat call.
+    """
     skills_dir = Path.home() / '.claude' / 'skills'
+    commands_dir = Path.home() / '.claude' / 'commands'
 
-    pattern = f'(discovery: {phase})'
-
-    for skill_dir in skills_dir.iterdir():
+    try:
+        skill_dirs = sorted(os.scandir(skills_dir), key=lambda e: e.name)
+    except OSError:
+        skill_dirs = []
+    for skill_dir in skill_dirs:
         if not skill_dir.is_dir():
             continue
-
-        skill_file = skill_dir / 'SKILL.md'
-        if not skill_file.exists():
+        skill_file = Path(skill_dir.path) / 'SKILL.md'
+        try:
+            yield 'skill', skill_dir.name, skill_file, skill_file.stat()
+        except OSError:
             continue
 
-        content = skill_file.read_text()
-        fm = extract_frontmatter(content)
+    try:
+        cmd_files = sorted(os.scandir(commands_dir), key=lambda e: e.name)
+    except OSError:
+        cmd_files = []
+    for cmd_file in cmd_files:
+        if cmd_file.name.endswith('.md') and cmd_file.is_file():
+            yield 'command', f'/{cmd_file.name[:-3]}', Path(cmd_file.path), cmd_file.stat()
+
+
+def load_catalog() -> list[dict]:
+    """Return catalog entries for all skills and commands, refreshing stale ones.
+
+    Each entry has kind, name, path, description and phases. Entries are
+    reused while the file's mtime and size are unchanged.
+    """
+    catalog_file = get_cache_dir('discovery') / 'catalog.json'
+    cached = load_json(catalog_file) or {}
+    if cached.get('version') != CATALOG_VERSION:
+        cached = {}
+    known = cached.get('entries', {})
+
+    entries = {}
+    changed = False
+    for kind, name, path, stat in iter_sources():
+        key = str(path)
+        entry = known.get(key)
+        if not entry or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            try:
+                fm = read_frontmatter(path)
+            except (OSError, ValueError):
+                # One unreadable file must not break discovery for the rest
+                fm = {}
+            desc = fm.get('description', '')
+            entry = {
+                'kind': kind,
+                'name': name,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'description': desc,
+                'phases': DISCOVERY_PATTERN.findall(desc)
+            }
+            changed = True
+
+        entries[key] = entry
+
+    if changed or entries.keys() != known.keys():
+        save_json(catalog_file, {'version': CATALOG_VERSION, 'entries': entries})
+
+    return list(entries.values())
+
+
+def phase_index(catalog: list[dict]) -> dict[str, list[dict]]:
+    """Group catalog entries by discovery phase, skills before commands."""
+    index = {}
+    for kind in ('skill', 'command'):
+        for entry in catalog:
+            if entry['kind'] != kind:
+                continue
+            for phase in dict.fromkeys(entry['phases']):
+                index.setdefault(phase, []).append(entry)
+    return index
 
-        desc = fm.get('description', '')
-        if pattern in desc:
-            name = skill_dir.name
-            results.append((name, desc))
 
-    return results
+def find_skills_by_discovery(phase: str) -> list[tuple[str, str]]:
+    """Find all skills with (discovery: phase) in description."""
+    return [
+        (entry['name'], entry['description'])
+        for entry in phase_index(load_catalog()).get(phase, [])
+        if entry['kind'] == 'skill'
+    ]
 
 
 def find_commands_by_discovery(phase: str) -> list[tuple[str, str]]:
     """Find all commands with (discovery: phase) in description."""
-    results = []
-    commands_dir = Path.home() / '.claude' / 'commands'
-
-    if not commands_dir.exists():
-        return results
+    return [
+        (entry['name'], entry['description'])
+        for entry in phase_index(load_catalog()).get(phase, [])
+        if entry['kind'] == 'command'
+    ]
 
-    pattern = f'(discovery: {phase})'
 
-    for cmd_file in commands_dir.glob('*.md'):
-        content = cmd_file.read_text()
-        fm = extract_frontmatter(content)
-
-        desc = fm.get('description', '')
-        if pattern in desc:
-            name = cmd_file.stem
-            results.append((f'/{name}', desc))
+def print_phase(phase: str, entries: list[dict]):
+    """Print the matches for one phase."""
+    print(f"Skills with (discovery: {phase}):")
+    print("=" * 40)
 
-    return results
+    if not entries:
+        print(f"No skills/commands found with (discovery: {phase})")
+    else:
+        for entry in entries:
+            print(f"- **{entry['name']}**: {entry['description']}")
+            print()
 
 
 def main():
@@ -87,24 +167,17 @@ def main():
         print(__doc__, file=sys.stderr)
         sys.exit(1)
 
-    phase = sys.argv[1]
-
-    print(f"Skills with (discovery: {phase}):")
-    print("=" * 40)
-
-    skills = find_skills_by_discovery(phase)
-    commands = find_commands_by_discovery(phase)
-
-    all_matches = skills + commands
+    index = phase_index(load_catalog())
 
-    if not all_matches:
-        print(f"No skills/commands found with (discovery: {phase})")
-    else:
-        for name, desc in all_matches:
-            print(f"- **{name}**: {desc}")
+    if sys.argv[1] == '--all-phases':
+        for phase in sorted(index):
+            print_phase(phase, index[phase])
             print()
+    else:
+        phase = sys.argv[1]
+        print_phase(phase, index.get(phase, []))
+        print()
 
-    print()
     print("In Thought 1, reason about which of these skills apply to the current task.")
 
 
@@ -3,28 +3,102 @@
 
 Replaces onboarding_bootstrap.sh with Python for cleaner JSON handling.
 
+All probes (SSH config, CLI detection, gh extensions, label + issue query)
+run concurrently under one global deadline, so onboarding takes as long as
+the slowest probe. The label check is folded into the issue query: one
+GraphQL request returns the label (or null) together with its open issues.
+
 Outputs:
-    JSON with session metadata, validated label, and issue list for the detected project.
+    JSON with session metadata, validated label, issue list for the detected
+    project, and per-probe timings in milliseconds.
+
+Read-only gh calls go through the shared response cache (gh_cache.py).
+
+The last good label + issue list is kept as a snapshot (snapshot.py) and
+served when the query fails or gh is missing. With --offline-first it is
+served without waiting for the network and refreshed in the background.
+"staleness" in the output says whether the issue list is live.
 
 Usage:
     uv run ~/.claude/lib/onboarding_bootstrap.py
+    uv run ~/.claude/lib/onboarding_bootstrap.py --no-cache
+    uv run ~/.claude/lib/onboarding_bootstrap.py --offline-first
 """
 
+from __future__ import annotations
+
+import argparse
+import asyncio
 import json
 import os
 import re
 import shutil
-import subprocess
+import sys
+import time
 from pathlib import Path
 
+import gh_cache
+import snapshot
+
+TRACKING_REPO = "DaveX2001/deliverable-tracking"
+
+# Upper bound for the whole bootstrap; probes still running are dropped
+DEADLINE_SECONDS = 20
+
+# Snapshot kind for the last good label + issue list (see snapshot.py)
+SNAPSHOT_KIND = "label-issues"
+
+# Matches the `gh issue list` default limit
+ISSUE_LIMIT = 30
+
+LABEL_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $label: String!, $limit: Int!) {
+  repository(owner: $owner, name: $name) {
+    label(name: $label) {
+      name
+      issues(states: OPEN, first: $limit, orderBy: {field: CREATED_AT, direction: DESC}) {
+        nodes { number title labels(first: 100) { nodes { name } } }
+      }
+    }
+  }
+}
+"""
+
+
+async def run_cmd(cmd: list[str], timeout: float = 30) -> str | None:
+    """Run command and return stdout, or None on failure.
+
+    Read-only gh calls are answered from the response cache when fresh.
+    """
+    cached = gh_cache.lookup(cmd)
+    if cached is not None:
+        return cached
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+    except OSError:
+        return None
 
-def run_cmd(cmd: list[str], capture: bool = True) -> str | None:
-    """Run command and return stdout, or None on failure."""
     try:
-        result = subprocess.run(cmd, capture_output=capture, text=True, timeout=30)
-        return result.stdout.strip() if result.returncode == 0 else None
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
         return None
+    finally:
+        # Also reached when the global deadline cancels this probe
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+    if proc.returncode != 0:
+        return None
+
+    output = stdout.decode().strip()
+    gh_cache.store(cmd, output)
+    return output
 
 
 def get_ssh_hosts() -> str:
@@ -42,12 +116,12 @@ def get_ssh_hosts() -> str:
         return "none"
 
 
-def get_gh_extensions() -> str:
+async def get_gh_extensions() -> str:
     """Get installed GitHub CLI extensions."""
     if not shutil.which("gh"):
         return "none"
 
-    output = run_cmd(["gh", "extension", "list"])
+    output = await run_cmd(["gh", "extension", "list"])
     if not output:
         return "none"
 
@@ -67,65 +141,124 @@ def get_available_clis() -> str:
     return ",".join(clis) if clis else "none"
 
 
-def validate_label(label: str) -> bool | None:
-    """Check if label exists in DaveX2001/deliverable-tracking repo."""
+def filter_actionable(issues: list[dict]) -> list[dict]:
+    """Keep to-do and in-progress issues as {number, title, status}."""
+    result = []
+    for issue in issues:
+        # Filter to to-do or in-progress only
+        label_names = [lbl["name"] for lbl in issue.get("labels", [])]
+        status = None
+        if "to-do" in label_names:
+            status = "to-do"
+        elif "in-progress" in label_names:
+            status = "in-progress"
+
+        if status:
+            result.append({
+                "number": issue["number"],
+                "title": issue["title"],
+                "status": status
+            })
+    return result
+
+
+async def get_label_issues(label: str) -> tuple[bool | None, list[dict]]:
+    """Validate a label and fetch its actionable issues in one request.
+
+    Returns:
+        (validated_label, issue_list). validated_label is True/False when
+        the label does (not) exist in the tracking repo, None when there is
+        no label, no gh, or the request failed.
+    """
     if not label or not shutil.which("gh"):
-        return None
-
-    output = run_cmd([
-        "gh", "label", "list",
-        "--repo", "DaveX2001/deliverable-tracking",
-        "--json", "name",
-        "--jq", ".[].name"
+        return None, []
+
+    owner, name = TRACKING_REPO.split("/")
+    output = await run_cmd([
+        "gh", "api", "graphql",
+        "-f", f"query={LABEL_ISSUES_QUERY}",
+        "-f", f"owner={owner}",
+        "-f", f"name={name}",
+        "-f", f"label={label}",
+        "-F", f"limit={ISSUE_LIMIT}"
     ])
 
     if output is None:
-        return None
-
-    labels = output.splitlines()
-    return label in labels
-
-
-def get_issue_list(label: str) -> list[dict]:
-    """Fetch actionable issues for a label from deliverable-tracking repo."""
-    if not label or not shutil.which("gh"):
-        return []
-
-    output = run_cmd([
-        "gh", "issue", "list",
-        "--repo", "DaveX2001/deliverable-tracking",
-        "--label", label,
-        "--state", "open",
-        "--json", "number,title,labels"
-    ])
-
-    if not output:
-        return []
+        return None, []
 
     try:
-        issues = json.loads(output)
-        result = []
-        for issue in issues:
-            # Filter to to-do or in-progress only
-            label_names = [lbl["name"] for lbl in issue.get("labels", [])]
-            status = None
-            if "to-do" in label_names:
-                status = "to-do"
-            elif "in-progress" in label_names:
-                status = "in-progress"
-
-            if status:
-                result.append({
-                    "number": issue["number"],
-                    "title": issue["title"],
-                    "status": status
-                })
+        label_node = json.loads(output)["data"]["repository"]["label"]
+        # GitHub matches label names case-insensitively; membership is exact
+        if not label_node or label_node["name"] != label:
+            return False, []
+
+        issues = [
+            {
+                "number": node["number"],
+                "title": node["title"],
+                "labels": node["labels"]["nodes"]
+            }
+            for node in label_node["issues"]["nodes"]
+        ]
+        return True, filter_actionable(issues)
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None, []
+
+
+def _snapshot_key(label: str) -> str:
+    return f"{TRACKING_REPO}:{label}"
+
+
+async def refresh_label_snapshot(label: str) -> None:
+    """Fetch the label's issues live and save them as the snapshot."""
+    validated_label, issue_list = await get_label_issues(label)
+    if validated_label is not None:
+        snapshot.save(SNAPSHOT_KIND, _snapshot_key(label), [validated_label, issue_list])
+
+
+async def run_probes(probes: dict, deadline: float) -> tuple[dict, dict]:
+    """Run probes concurrently; ones still running at the deadline get their default.
+
+    Args:
+        probes: {name: (awaitable, default)}
+        deadline: Seconds until unfinished probes are cancelled
+
+    Returns:
+        (results, timings) keyed by probe name; timings in milliseconds,
+        None for probes that hit the deadline
+    """
+    start = time.perf_counter()
+    timings = {}
+
+    async def timed(name, awaitable):
+        result = await awaitable
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
         return result
-    except json.JSONDecodeError:
-        return []
 
-
-def main():
+    tasks = {
+        name: asyncio.create_task(timed(name, awaitable))
+        for name, (awaitable, _) in probes.items()
+    }
+    await asyncio.wait(tasks.values(), timeout=deadline)
+
+    results = {}
+    for name, task in tasks.items():
+        default = probes[name][1]
+        if not task.done():
+            task.cancel()
+            timings[name] = None
+            results[name] = default
+        elif task.exception():
+            results[name] = default
+        else:
+            results[name] = task.result()
+
+    # Let cancelled probes clean up their subprocesses
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+    return results, {name: timings.get(name) for name in probes}
+
+
+async def bootstrap(offline_first: bool = False) -> dict:
     # Get conversation path from env
     conv_path = os.environ.get("CLAUDE_CONVERSATION_PATH", "")
 
@@ -141,32 +274,83 @@ def main():
     if "__" in folder_name:
         detected_label = folder_name.split("__")[0]
 
-    # Get SSH hosts (local only)
-    ssh_hosts = get_ssh_hosts() if env_type == "Local" else "none"
-
-    # Get GH extensions
-    gh_extensions = get_gh_extensions()
-
-    # Get available CLIs
-    clis = get_available_clis()
-
-    # Validate label and fetch issues
-    validated_label = validate_label(detected_label)
-    issue_list = get_issue_list(detected_label) if validated_label else []
-
-    # Output JSON
-    output = {
+    async def ssh_hosts_probe() -> str:
+        # SSH hosts are only relevant locally
+        if env_type != "Local":
+            return "none"
+        return await asyncio.to_thread(get_ssh_hosts)
+
+    cached = snapshot.load(SNAPSHOT_KIND, _snapshot_key(detected_label)) if detected_label else None
+    serve_cached = offline_first and cached is not None
+    if serve_cached:
+        # Same cwd, so the refresh detects the same label
+        snapshot.refresh_in_background(
+            f"{SNAPSHOT_KIND}:{detected_label}",
+            [sys.executable, os.path.abspath(__file__), "--refresh-snapshot"]
+        )
+        label_probe = asyncio.sleep(0, result=tuple(cached[0]))
+    else:
+        label_probe = get_label_issues(detected_label)
+
+    results, timings = await run_probes({
+        "ssh_hosts": (ssh_hosts_probe(), "none"),
+        "clis": (asyncio.to_thread(get_available_clis), "none"),
+        "gh_extensions": (get_gh_extensions(), "none"),
+        "label_issues": (label_probe, (None, []))
+    }, DEADLINE_SECONDS)
+
+    validated_label, issue_list = results["label_issues"]
+    saved_at = None
+    if serve_cached:
+        saved_at = cached[1]
+    elif validated_label is not None:
+        snapshot.save(SNAPSHOT_KIND, _snapshot_key(detected_label), [validated_label, issue_list])
+    elif cached is not None:
+        # Query failed, timed out or no gh: last known good beats nothing
+        (validated_label, issue_list), saved_at = cached
+
+    return {
         "conversation_path": conv_path,
         "environment": env_type,
         "folder_name": folder_name,
         "detected_label": detected_label,
         "validated_label": validated_label,
         "issue_list": issue_list,
-        "ssh_hosts": ssh_hosts,
-        "gh_extensions": gh_extensions,
-        "clis": clis
+        "staleness": snapshot.staleness(saved_at),
+        "ssh_hosts": results["ssh_hosts"],
+        "gh_extensions": results["gh_extensions"],
+        "clis": results["clis"],
+        "timings_ms": timings
     }
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap onboarding session context")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the gh response cache"
+    )
+    parser.add_argument(
+        "--offline-first",
+        action="store_true",
+        default=snapshot.offline_first_default(),
+        help="Serve the last snapshot of the issue list immediately and refresh "
+             "it in the background (default: $CLAUDE_OFFLINE_FIRST)"
+    )
+    parser.add_argument("--refresh-snapshot", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.no_cache or args.refresh_snapshot:
+        gh_cache.disable()
+
+    # Background refresh: only the label query, no output
+    if args.refresh_snapshot:
+        folder_name = Path.cwd().name
+        if "__" in folder_name:
+            asyncio.run(refresh_label_snapshot(folder_name.split("__")[0]))
+        return
+
+    output = asyncio.run(bootstrap(offline_first=args.offline_first))
     print(json.dumps(output, indent=2))
 
 
@@ -0,0 +1,65 @@
+"""Shared on-disk state location for lib scripts.
+
+All persistent caches and checkpoints live under one root:
+    $CLAUDE_PLUGIN_CACHE_DIR, else
+    $XDG_CACHE_HOME/claude-code-team-plugin, else
+    ~/.cache/claude-code-team-plugin
+
+Everything stored here is disposable - deleting the directory only costs a
+slower next run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+APP_NAME = "claude-code-team-plugin"
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """Return (and create) a subdirectory of the plugin cache root."""
+    root = os.environ.get("CLAUDE_PLUGIN_CACHE_DIR")
+    if not root:
+        xdg = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+        root = str(Path(xdg) / APP_NAME)
+
+    path = Path(root).joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def key_digest(key: str) -> str:
+    """Stable short file-name-safe digest for a cache key."""
+    return hashlib.sha256(key.encode()).hexdigest()[:24]
+
+
+def load_json(path: Path) -> dict | None:
+    """Load a JSON object from disk, or None if missing or corrupt."""
+    try:
+        with path.open() as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def save_json(path: Path, data: dict) -> bool:
+    """Atomically write a JSON object (write temp file, then rename).
+
+    Returns False instead of raising - callers treat the cache as optional.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
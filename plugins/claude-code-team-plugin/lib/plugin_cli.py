@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Single fast-start entry point for the plugin's lib scripts.
+
+`uv run lib/<script>.py` pays for uv's environment resolution on every
+call, and each script then imports its whole dependency tree up front. The
+lib scripts are stdlib-only, so they can run under `python3 -S` (no site
+initialisation) instead. This entry point imports only the module of the
+subcommand it runs and hands it the remaining arguments, so each
+subcommand takes exactly its script's arguments (see the script's --help).
+
+self-check measures each subcommand's import time with
+`python3 -S -X importtime` and fails when one exceeds its budget in
+IMPORT_BUDGET_MS, to catch an eager import creeping into the fast path.
+
+Usage:
+    python3 -S ${CLAUDE_PLUGIN_ROOT}/lib/plugin_cli.py context-usage <conversation_path>
+    python3 -S ${CLAUDE_PLUGIN_ROOT}/lib/plugin_cli.py bootstrap [--offline-first]
+    python3 -S ${CLAUDE_PLUGIN_ROOT}/lib/plugin_cli.py issue-context <issue> [<issue> ...] [--repo owner/repo]
+    python3 -S ${CLAUDE_PLUGIN_ROOT}/lib/plugin_cli.py discover <phase>
+    python3 -S ${CLAUDE_PLUGIN_ROOT}/lib/plugin_cli.py self-check [--runs 5] [--scale 1.5]
+
+Subcommands:
+    context-usage   context_usage.py
+    bootstrap       onboarding_bootstrap.py
+    issue-context   fetch_issue_context.py
+    discover        list_skills_by_discovery.py
+    self-check      import-time budget check (JSON; exit 1 if over budget)
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Subcommand -> lib module whose main() it runs
+COMMANDS = {
+    "context-usage": "context_usage",
+    "bootstrap": "onboarding_bootstrap",
+    "issue-context": "fetch_issue_context",
+    "discover": "list_skills_by_discovery",
+}
+
+# Cumulative import time budgets in ms under `python3 -S -X importtime`
+# (which itself inflates them). context_usage runs on every git push;
+# onboarding_bootstrap needs asyncio, which is most of its budget.
+IMPORT_BUDGET_MS = {
+    "plugin_cli": 5,
+    "context_usage": 40,
+    "list_skills_by_discovery": 40,
+    "fetch_issue_context": 80,
+    "onboarding_bootstrap": 100,
+}
+
+
+def import_time_ms(module: str) -> float | None:
+    """Cumulative import time of module in a fresh `python3 -S` process."""
+    import subprocess
+
+    result = subprocess.run(
+        [sys.executable, "-S", "-X", "importtime", "-c", f"import {module}"],
+        cwd=LIB_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+
+    # "import time: <self us> | <cumulative us> | <name>"; top level has one space
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].rstrip() == f" {module}":
+            return int(parts[1]) / 1000
+    return None
+
+
+def self_check(args: list[str]) -> int:
+    """Compare each module's best-of-runs import time with its budget."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="plugin_cli.py self-check")
+    parser.add_argument("--runs", type=int, default=5, help="Measurements per module (best counts)")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply every budget, for slow machines (default: 1.0)"
+    )
+    options = parser.parse_args(args)
+
+    checks = []
+    for module, budget in IMPORT_BUDGET_MS.items():
+        times = [import_time_ms(module) for _ in range(max(1, options.runs))]
+        times = [t for t in times if t is not None]
+        best = min(times) if times else None
+        limit = budget * options.scale
+        checks.append({
+            "module": module,
+            "import_ms": None if best is None else round(best, 1),
+            "budget_ms": round(limit, 1),
+            "ok": best is not None and best <= limit
+        })
+
+    ok = all(check["ok"] for check in checks)
+    print(json.dumps({
+        "python": sys.version.split()[0],
+        "no_site": bool(sys.flags.no_site),
+        "ok": ok,
+        "checks": checks
+    }, indent=2))
+    return 0 if ok else 1
+
+
+def main() -> int:
+    if len(sys.argv) < 2 or sys.argv[1] not in (*COMMANDS, "self-check"):
+        print(__doc__, file=sys.stderr)
+        return 1
+
+    command, args = sys.argv[1], sys.argv[2:]
+    if command == "self-check":
+        return self_check(args)
+
+    module = __import__(COMMANDS[command])
+    # Scripts parse sys.argv; the program name shows up in their --help
+    sys.argv = [f"plugin_cli.py {command}", *args]
+    module.main()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""Token usage and cost accounting for Claude Code conversation JSONL.
+
+One streaming pass per transcript sums the usage of every assistant
+message - input, cache creation (write), cache read and output tokens -
+split into main chain vs sidechain (Task subagents) and by model. From
+those it derives the prompt-cache hit rate (share of prompt tokens served
+from cache), cache misses (prompt tokens that were not) and an estimated
+cost, so sessions whose cache misses drive up latency and spend stand out.
+
+Claude Code writes one line per content block of a message, each carrying
+the message's usage, so lines are counted once per message id (the last
+line wins, it has the final output count). API error entries are skipped.
+
+Transcripts are memory-mapped and only lines holding usage are decoded
+(see transcript.iter_spans); several are processed in a process pool.
+Per-file totals are cached in the plugin cache by path, inode, size and
+mtime, so re-running over a project directory only reads what changed.
+
+Usage:
+    uv run ~/.claude/lib/session_usage.py <conversation_path>
+    uv run ~/.claude/lib/session_usage.py ~/.claude/projects/<project>/ --sort cache_misses --top 10
+    uv run ~/.claude/lib/session_usage.py '~/.claude/projects/*/*.jsonl' --total-only
+    uv run ~/.claude/lib/session_usage.py <path> --prices '{"claude-opus-4-5": [5, 25]}'
+
+Returns:
+    JSON Lines: one report per transcript (path, messages, token counts,
+    cache_hit_rate, cache_misses, cost_usd, plus main/sidechain and
+    per-model breakdowns), then a total line when there are several;
+    or error message.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Iterator
+
+from decoders import USAGE_MARKER, get_usage_decoder
+from plugin_cache import get_cache_dir, key_digest, load_json, save_json
+from transcript import expand_paths, iter_spans, open_buffer
+
+TOKEN_FIELDS = (
+    "input_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+    "output_tokens"
+)
+
+CHAINS = ("main", "sidechain")
+
+# List prices in USD per million tokens (input, output) by model name prefix,
+# longest match wins. Override with CLAUDE_MODEL_PRICES / --prices when
+# they change; models without a price get cost_usd null.
+MODEL_PRICES = {
+    "claude-opus-4-5": (5.0, 25.0),
+    "claude-opus-4": (15.0, 75.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-haiku-4": (1.0, 5.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+}
+
+# Cache writes (5-minute TTL) and reads, relative to the input price
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+# Bump when the cached totals format changes
+CACHE_VERSION = 1
+
+SORT_KEYS = ("cost_usd", "cache_misses", "cache_hit_rate", "messages")
+
+# Fastest installed JSON backend (see decoders.py)
+_decode_usage = get_usage_decoder()
+
+
+def load_prices(spec: str | None = None) -> dict[str, tuple[float, float]]:
+    """Return MODEL_PRICES with overrides applied.
+
+    Args:
+        spec: JSON object of model prefix -> [input, output] USD per million
+            tokens, inline or as a file path; defaults to $CLAUDE_MODEL_PRICES
+
+    Raises:
+        ValueError: The overrides are not a prefix -> price pair mapping
+    """
+    spec = spec if spec is not None else os.environ.get("CLAUDE_MODEL_PRICES", "")
+    if not spec.strip():
+        return dict(MODEL_PRICES)
+
+    try:
+        text = spec if spec.lstrip().startswith("{") else Path(spec).expanduser().read_text()
+        overrides = json.loads(text)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid model prices: {e}") from e
+
+    if not isinstance(overrides, dict) or not all(
+        isinstance(v, list) and len(v) == 2
+        and all(isinstance(p, (int, float)) and not isinstance(p, bool) and p >= 0 for p in v)
+        for v in overrides.values()
+    ):
+        raise ValueError("Model prices must map model prefixes to [input, output] USD per million tokens")
+
+    return {**MODEL_PRICES, **{k: (float(v[0]), float(v[1])) for k, v in overrides.items()}}
+
+
+def model_price(model: str, prices: dict | None = None) -> tuple[float, float] | None:
+    """(input, output) price for a model: longest matching prefix, else None."""
+    prices = MODEL_PRICES if prices is None else prices
+    matches = [prefix for prefix in prices if model.startswith(prefix)]
+    return tuple(prices[max(matches, key=len)]) if matches else None
+
+
+def _empty_counts() -> dict:
+    return {"messages": 0, **dict.fromkeys(TOKEN_FIELDS, 0)}
+
+
+def _add_counts(counts: dict, other: dict) -> None:
+    for field in ("messages", *TOKEN_FIELDS):
+        counts[field] += other.get(field, 0)
+
+
+def scan_usage(path: Path) -> dict:
+    """Sum message usage of one transcript in a single pass.
+
+    Returns:
+        {"main": {model: counts}, "sidechain": {model: counts}} where counts
+        holds messages plus each of TOKEN_FIELDS
+    """
+    totals = {chain: {} for chain in CHAINS}
+    # Per chain: (message id, model, usage) of the message being counted
+    pending = {}
+
+    def flush(chain: str) -> None:
+        _, model, usage = pending.pop(chain)
+        counts = totals[chain].setdefault(model, _empty_counts())
+        counts["messages"] += 1
+        for field in TOKEN_FIELDS:
+            value = usage.get(field)
+            if isinstance(value, int) and not isinstance(value, bool):
+                counts[field] += value
+
+    with open_buffer(path) as buf:
+        for start, end in iter_spans(buf):
+            # Sidechain lines count too, so only the usage marker is checked
+            if buf.find(USAGE_MARKER, start, end) == -1:
+                continue
+
+            with memoryview(buf)[start:end] as line:
+                record = _decode_usage(line)
+            if record is None or not isinstance(record.usage, dict) or record.is_api_error:
+                continue
+
+            chain = "sidechain" if record.is_sidechain else "main"
+            message_id = record.message_id
+            if chain in pending and (message_id is None or pending[chain][0] != message_id):
+                flush(chain)
+            model = record.model if isinstance(record.model, str) else "unknown"
+            pending[chain] = (message_id, model, record.usage)
+
+    for chain in list(pending):
+        flush(chain)
+    return totals
+
+
+def _cache_file(path: Path) -> Path:
+    return get_cache_dir("session_usage") / f"{key_digest(str(path.resolve()))}.json"
+
+
+def load_usage(path: Path, use_cache: bool = True) -> dict:
+    """scan_usage() through the per-file cache (keyed by inode, size and mtime)."""
+    stat = path.stat()
+    stamp = [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+    if use_cache:
+        data = load_json(_cache_file(path))
+        if data and data.get("version") == CACHE_VERSION and data.get("stamp") == stamp:
+            return data["totals"]
+
+    totals = scan_usage(path)
+    if use_cache:
+        save_json(_cache_file(path), {"version": CACHE_VERSION, "stamp": stamp, "totals": totals})
+    return totals
+
+
+def merge_usage(target: dict, totals: dict) -> dict:
+    """Add one transcript's totals into target (same shape as scan_usage())."""
+    for chain in CHAINS:
+        for model, counts in totals.get(chain, {}).items():
+            _add_counts(target.setdefault(chain, {}).setdefault(model, _empty_counts()), counts)
+    return target
+
+
+def _cost(model: str, counts: dict, prices: dict) -> float | None:
+    price = model_price(model, prices)
+    if price is None:
+        return None
+    input_price, output_price = price
+    return (
+        counts["input_tokens"] * input_price
+        + counts["cache_creation_input_tokens"] * input_price * CACHE_WRITE_MULTIPLIER
+        + counts["cache_read_input_tokens"] * input_price * CACHE_READ_MULTIPLIER
+        + counts["output_tokens"] * output_price
+    ) / 1_000_000
+
+
+def _summary(by_model: dict, prices: dict) -> dict:
+    """Counts, cache figures and cost for a {model: counts} mapping."""
+    counts = _empty_counts()
+    cost = 0.0
+    priced = True
+    for model, model_counts in by_model.items():
+        _add_counts(counts, model_counts)
+        model_cost = _cost(model, model_counts, prices)
+        if model_cost is None:
+            priced = priced and not any(model_counts[field] for field in TOKEN_FIELDS)
+        else:
+            cost += model_cost
+
+    misses = counts["input_tokens"] + counts["cache_creation_input_tokens"]
+    prompt = misses + counts["cache_read_input_tokens"]
+    return {
+        **counts,
+        "cache_hit_rate": round(counts["cache_read_input_tokens"] / prompt, 4) if prompt else None,
+        "cache_misses": misses,
+        # Partial sums would understate; unpriced models make the cost unknown
+        "cost_usd": round(cost, 4) if priced else None
+    }
+
+
+def build_report(totals: dict, prices: dict | None = None) -> dict:
+    """Report for scan_usage()/merge_usage() totals: overall, per chain, per model."""
+    prices = MODEL_PRICES if prices is None else prices
+
+    by_model = {}
+    for chain in CHAINS:
+        for model, counts in totals.get(chain, {}).items():
+            _add_counts(by_model.setdefault(model, _empty_counts()), counts)
+
+    return {
+        **_summary(by_model, prices),
+        **{chain: _summary(totals.get(chain, {}), prices) for chain in CHAINS},
+        "models": {model: _summary({model: counts}, prices) for model, counts in sorted(by_model.items())}
+    }
+
+
+def _usage_for_path(path: str, use_cache: bool = True) -> tuple[str, dict | None, str | None]:
+    """(path, totals, error) for one transcript (runs in a worker process)."""
+    try:
+        if not Path(path).is_file():
+            return path, None, f"File not found: {path}"
+        return path, load_usage(Path(path), use_cache), None
+    except Exception as e:
+        return path, None, f"Failed to read file: {e}"
+
+
+def iter_usage(
+    paths: list[str], jobs: int | None = None, use_cache: bool = True
+) -> Iterator[tuple[str, dict | None, str | None]]:
+    """Totals for many transcripts in a process pool, in input order.
+
+    Args:
+        paths: Transcript paths
+        jobs: Worker processes (default: CPU count); 1 runs inline
+        use_cache: Read and update the per-file cache
+    """
+    worker = partial(_usage_for_path, use_cache=use_cache)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        yield from map(worker, paths)
+        return
+
+    # Several transcripts per task keep the pickling overhead down
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(worker, paths, chunksize=chunksize)
+
+
+def _sort_key(key: str):
+    """Worst first: highest cost/misses/messages, lowest cache hit rate."""
+    if key == "cache_hit_rate":
+        return lambda report: report[key] if report[key] is not None else 2.0
+    return lambda report: -(report[key] or 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Token usage, prompt-cache hit rate and cost per conversation JSONL"
+    )
+    parser.add_argument(
+        "conversation_path",
+        nargs="*",
+        help="Conversation JSONL files, glob patterns or directories"
+    )
+    parser.add_argument(
+        "--sort",
+        choices=SORT_KEYS,
+        help="Order sessions worst first by this field (default: input order)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        help="Only print the first N sessions (after sorting)"
+    )
+    parser.add_argument(
+        "--total-only",
+        action="store_true",
+        help="Only print the totals across all sessions"
+    )
+    parser.add_argument(
+        "--prices",
+        help="Model prefix -> [input, output] USD per million tokens overrides, "
+             "as JSON or a JSON file (default: $CLAUDE_MODEL_PRICES)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and don't update the per-file cache"
+    )
+
+    args = parser.parse_args()
+
+    if not args.conversation_path:
+        parser.print_help()
+        sys.exit(1)
+
+    try:
+        prices = load_prices(args.prices)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+    paths = expand_paths(args.conversation_path)
+    if not paths:
+        print(json.dumps({"error": f"No transcripts found: {' '.join(args.conversation_path)}"}))
+        sys.exit(1)
+
+    reports = []
+    total = {}
+    sessions = 0
+    for path, totals, error in iter_usage(paths, jobs=args.jobs, use_cache=not args.no_cache):
+        if error:
+            reports.append({"path": path, "error": error})
+            continue
+        merge_usage(total, totals)
+        sessions += 1
+        if not args.total_only:
+            reports.append({"path": path, **build_report(totals, prices)})
+
+    if args.sort:
+        errors = [report for report in reports if "error" in report]
+        reports = sorted((r for r in reports if "error" not in r), key=_sort_key(args.sort)) + errors
+    if args.top is not None:
+        reports = reports[:max(0, args.top)]
+
+    for report in reports:
+        print(json.dumps(report, separators=(",", ":")))
+    if args.total_only or sessions > 1:
+        print(json.dumps({"total": True, "sessions": sessions, **build_report(total, prices)},
+                         separators=(",", ":")))
+
+
+if __name__ == "__main__":
+    main()
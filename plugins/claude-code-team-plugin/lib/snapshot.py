@@ -0,0 +1,97 @@
+"""Last-known-good snapshots of gh results, for offline and offline-first use.
+
+Scripts save each successful live result here (label + issue list, issue
+context). When gh is slow or unavailable they serve the snapshot instead
+of an empty list or an error, and in offline-first mode they serve it
+right away and refresh it in a detached background process. Either way
+the output says how old the data is:
+
+    "staleness": {"source": "live"}
+    "staleness": {"source": "snapshot", "saved_at": "...Z", "age_seconds": 42}
+
+Unlike the gh response cache (gh_cache.py), snapshots never expire; they
+are only replaced by newer live results.
+
+Offline-first: --offline-first on the CLIs, or CLAUDE_OFFLINE_FIRST=1.
+
+Usage:
+    snapshot.save("issue-context", key, data)
+    cached = snapshot.load("issue-context", key)      # (data, saved_at) or None
+    snapshot.staleness(saved_at)                      # None = live
+    snapshot.refresh_in_background("issue-context", [sys.executable, __file__, ...])
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Any
+
+from plugin_cache import get_cache_dir, key_digest, load_json, save_json
+
+# At most one background refresh per name this often
+REFRESH_INTERVAL = 60
+
+
+def offline_first_default() -> bool:
+    """Whether $CLAUDE_OFFLINE_FIRST asks for offline-first mode."""
+    return os.environ.get("CLAUDE_OFFLINE_FIRST", "") in ("1", "true", "yes")
+
+
+def _snapshot_file(kind: str, key: str) -> Path:
+    return get_cache_dir("snapshots", kind) / f"{key_digest(key)}.json"
+
+
+def save(kind: str, key: str, data: Any) -> bool:
+    """Store a live result as the latest snapshot for (kind, key)."""
+    return save_json(_snapshot_file(kind, key), {"key": key, "saved_at": time.time(), "data": data})
+
+
+def load(kind: str, key: str) -> tuple[Any, float] | None:
+    """Return (data, saved_at) of the latest snapshot, or None."""
+    entry = load_json(_snapshot_file(kind, key))
+    if not entry or entry.get("key") != key or "data" not in entry:
+        return None
+    return entry["data"], entry.get("saved_at") or 0.0
+
+
+def staleness(saved_at: float | None) -> dict:
+    """Staleness field: live data for None, else the snapshot's time and age."""
+    if saved_at is None:
+        return {"source": "live"}
+    return {
+        "source": "snapshot",
+        "saved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(saved_at)),
+        "age_seconds": max(0, round(time.time() - saved_at))
+    }
+
+
+def refresh_in_background(name: str, cmd: list[str]) -> bool:
+    """Start cmd detached to refresh snapshots, unless one started recently.
+
+    The refresh outlives the caller and its output is discarded.
+
+    Returns:
+        True if a refresh was started
+    """
+    marker = get_cache_dir("snapshots") / f".{key_digest(name)}.refresh"
+    try:
+        if time.time() - marker.stat().st_mtime < REFRESH_INTERVAL:
+            return False
+    except OSError:
+        pass
+
+    try:
+        marker.touch()
+        subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError:
+        return False
+    return True
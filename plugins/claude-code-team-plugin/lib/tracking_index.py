@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Tracking-file status for every issue, joined with the open issue list.
+
+Each issue's tracking file lives at .claude/tracking/issue-{n}/tracking.md
+(relative to the project directory). One scan of .claude/tracking/ gives,
+per issue:
+
+- tracking: MISSING | NO_AC | HAS_AC (as fetch_issue_context.py reports it)
+- ac_total / ac_checked: checkboxes (- [ ] / - [x]) in the
+  "## Acceptance Criteria" section
+
+Parsed results are cached in the plugin cache per tracking directory,
+keyed by each file's mtime and size, so a scan only reads files that
+changed since the last one. The report joins the scan with the repo's open
+issues (one gh call, via the gh response cache), and lists tracking
+directories whose issue is not open as orphans.
+
+Usage:
+    uv run ~/.claude/lib/tracking_index.py
+    uv run ~/.claude/lib/tracking_index.py --repo <owner/repo> --label <label>
+    uv run ~/.claude/lib/tracking_index.py --no-issues
+
+    from tracking_index import scan_tracking
+    scan_tracking()["227"]["tracking"]
+
+Default repo: DaveX2001/deliverable-tracking
+
+Returns:
+    JSON with repo, tracking_dir, counts per status, issues (open issues
+    with number, title, tracking, ac_total, ac_checked) and orphans
+    (tracked issue numbers that are not open); or error message.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import gh_cache
+from plugin_cache import get_cache_dir, key_digest, load_json, save_json
+
+DEFAULT_REPO = "DaveX2001/deliverable-tracking"
+
+AC_HEADING = "## Acceptance Criteria"
+
+# Open issues fetched for the report (gh issue list --limit)
+ISSUE_LIMIT = 1000
+
+ISSUE_DIR = re.compile(r"issue-(\d+)$")
+CHECKBOX = re.compile(r"^\s*[-*+]\s+\[([ xX])\]", re.MULTILINE)
+
+MISSING = {"tracking": "MISSING", "ac_total": 0, "ac_checked": 0}
+
+
+def tracking_dir(cwd: Path | None = None) -> Path:
+    """The project's .claude/tracking directory."""
+    return (cwd or Path.cwd()) / ".claude" / "tracking"
+
+
+def parse_tracking(text: str) -> dict:
+    """Status and AC checkbox counts of a tracking file's content."""
+    start = text.find(AC_HEADING)
+    if start == -1:
+        return {"tracking": "NO_AC", "ac_total": 0, "ac_checked": 0}
+
+    # The AC section runs to the next heading of the same or a higher level
+    section = text[start + len(AC_HEADING):]
+    end = re.search(r"^#{1,2}\s", section, re.MULTILINE)
+    if end:
+        section = section[:end.start()]
+
+    boxes = CHECKBOX.findall(section)
+    return {
+        "tracking": "HAS_AC",
+        "ac_total": len(boxes),
+        "ac_checked": sum(1 for box in boxes if box in "xX")
+    }
+
+
+def _cache_file(root: Path) -> Path:
+    return get_cache_dir("tracking") / f"{key_digest(str(root.resolve()))}.json"
+
+
+def _file_status(path: Path, cache: dict, key: str) -> tuple[dict, bool]:
+    """Status of one tracking file, from cache when unchanged.
+
+    Returns:
+        (status, changed) - changed is True when the file was read
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        cache.pop(key, None)
+        return MISSING, False
+
+    cached = cache.get(key)
+    if cached and cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size:
+        return cached["status"], False
+
+    try:
+        status = parse_tracking(path.read_text(errors="replace"))
+    except OSError:
+        return MISSING, False
+    cache[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "status": status}
+    return status, True
+
+
+def scan_tracking(root: Path | None = None) -> dict[str, dict]:
+    """Status of every issue with a tracking directory, keyed by issue number.
+
+    Issues without a tracking directory are absent; their status is MISSING.
+    """
+    root = root or tracking_dir()
+    try:
+        dirs = [
+            (match.group(1), entry.path)
+            for entry in os.scandir(root)
+            if entry.is_dir() and (match := ISSUE_DIR.match(entry.name))
+        ]
+    except OSError:
+        return {}
+
+    cache_file = _cache_file(root)
+    cache = (load_json(cache_file) or {}).get("files", {})
+    changed = False
+    statuses = {}
+    for issue, path in dirs:
+        status, read = _file_status(Path(path) / "tracking.md", cache, issue)
+        statuses[issue] = status
+        changed = changed or read
+
+    # Forget directories that were removed
+    stale = set(cache) - set(statuses)
+    for issue in stale:
+        del cache[issue]
+
+    if changed or stale:
+        save_json(cache_file, {"root": str(root), "files": cache})
+    return statuses
+
+
+def tracking_status(issue: str, root: Path | None = None) -> dict:
+    """Status of one issue's tracking file, through the same cache."""
+    root = root or tracking_dir()
+    cache_file = _cache_file(root)
+    cache = (load_json(cache_file) or {}).get("files", {})
+    status, read = _file_status(root / f"issue-{issue}" / "tracking.md", cache, str(issue))
+    if read:
+        save_json(cache_file, {"root": str(root), "files": cache})
+    return status
+
+
+def run_cmd(cmd: list[str]) -> str | None:
+    """Run command and return stdout, or None on failure.
+
+    Read-only gh calls are answered from the response cache when fresh.
+    """
+    def run(c: list[str]) -> str | None:
+        try:
+            result = subprocess.run(c, capture_output=True, text=True, timeout=30)
+            return result.stdout.strip() if result.returncode == 0 else None
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+
+    return gh_cache.cached_run(cmd, run)
+
+
+def get_open_issues(repo: str, label: str | None = None) -> list[dict] | None:
+    """Open issues as {number, title, labels}, or None on failure."""
+    cmd = [
+        "gh", "issue", "list", "--repo", repo, "--state", "open",
+        "--limit", str(ISSUE_LIMIT), "--json", "number,title,labels"
+    ]
+    if label:
+        cmd += ["--label", label]
+
+    output = run_cmd(cmd)
+    if output is None:
+        return None
+    try:
+        return [
+            {
+                "number": issue["number"],
+                "title": issue["title"],
+                "labels": [lbl["name"] for lbl in issue.get("labels") or []]
+            }
+            for issue in json.loads(output)
+        ]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
+
+
+def build_report(issues: list[dict] | None, statuses: dict[str, dict]) -> dict:
+    """Join open issues with tracking statuses."""
+    counts = {"MISSING": 0, "NO_AC": 0, "HAS_AC": 0}
+    if issues is None:
+        # Tracking directories only
+        rows = [{"number": int(n), **statuses[n]} for n in sorted(statuses, key=int)]
+        for row in rows:
+            counts[row["tracking"]] += 1
+        return {"counts": counts, "issues": rows}
+
+    rows = []
+    for issue in issues:
+        status = statuses.get(str(issue["number"]), MISSING)
+        counts[status["tracking"]] += 1
+        rows.append({**issue, **status})
+
+    open_numbers = {str(issue["number"]) for issue in issues}
+    orphans = sorted((int(n) for n in statuses if n not in open_numbers))
+    return {"counts": counts, "issues": rows, "orphans": orphans}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracking-file status for all open issues")
+    parser.add_argument("--repo", default=DEFAULT_REPO, help=f"Repository (default: {DEFAULT_REPO})")
+    parser.add_argument("--label", help="Only open issues with this label")
+    parser.add_argument(
+        "--no-issues",
+        action="store_true",
+        help="Don't fetch open issues; report every tracking directory"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the gh response cache"
+    )
+
+    args = parser.parse_args()
+    if args.no_cache:
+        gh_cache.disable()
+
+    root = tracking_dir()
+    statuses = scan_tracking(root)
+
+    issues = None
+    if not args.no_issues:
+        issues = get_open_issues(args.repo, args.label)
+        if issues is None:
+            print(json.dumps({"error": f"Failed to list open issues of {args.repo}"}))
+            sys.exit(1)
+
+    report = build_report(issues, statuses)
+    print(json.dumps({
+        "repo": None if args.no_issues else args.repo,
+        "tracking_dir": str(root),
+        **report
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
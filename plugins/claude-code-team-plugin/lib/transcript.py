@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Streaming reader for Claude Code conversation JSONL transcripts.
+
+Transcripts grow to hundreds of megabytes, mostly message content and tool
+results. Everything here is a generator over raw lines, so memory stays
+constant no matter how long the transcript is:
+
+- iter_lines() yields raw byte lines with their offsets; nothing is decoded.
+- open_buffer() / iter_spans() memory-map a transcript and yield line
+  boundaries instead of lines, for scans that prefilter on raw bytes and
+  decode only a few lines (via memoryview, without copying them).
+- decode(line, content=False) decodes everything but message.content,
+  whose bytes are cut out before parsing. Scans that only need headers,
+  model or usage skip the bulk of every message this way. Decoding uses
+  the fastest installed JSON backend (see decoders.py).
+- iter_entries() combines both and filters out sidechain (subagent) and
+  API error entries by default.
+- iter_minimal() / write_minimal() produce the filtered_minimal projection
+  used by the conversation-reader: role, text, timestamp, _id and
+  command_marker, in one streaming pass.
+
+Usage:
+    uv run ~/.claude/lib/transcript.py <conversation_path>
+    uv run ~/.claude/lib/transcript.py <conversation_path> --output filtered_minimal_<id>.jsonl
+    uv run ~/.claude/lib/transcript.py <conversation_path> --include-sidechain --include-api-errors
+
+    from transcript import iter_entries
+    for entry in iter_entries(path, content=False):
+        entry.get("message", {}).get("usage")
+
+Returns:
+    filtered_minimal JSON Lines on stdout, or with --output a JSON summary
+    (records, sizes, reduction) or error message.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import mmap
+import os
+import re
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO, Union
+
+from decoders import get_loads, loads_without_content
+
+# JSON backend (see decoders.py)
+_loads = get_loads()
+
+COMMAND_NAME = re.compile(r"<command-name>(.*?)</command-name>", re.DOTALL)
+COMMAND_ARGS = re.compile(r"<command-args>(.*?)</command-args>", re.DOTALL)
+
+# iter_spans() hands mapped pages back to the OS every this many bytes
+RELEASE_SIZE = 4 * 1024 * 1024
+
+# A mapped transcript, or its bytes if it can't be mapped
+Buffer = Union[mmap.mmap, bytes]
+
+
+def expand_paths(patterns: list[str]) -> list[str]:
+    """Expand glob patterns and directories into transcript paths.
+
+    Directories contribute the *.jsonl files below them, recursively; quote
+    globs to avoid shell argument limits. Plain paths are kept as given,
+    even if missing, so callers can report them. Results are de-duplicated
+    and keep the order patterns were given.
+    """
+    paths = []
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        if glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern)))
+        elif os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, "**", "*.jsonl"), recursive=True)))
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+
+def iter_lines(path: Path, offset: int = 0) -> Iterator[tuple[int, bytes]]:
+    """Yield (offset, line) for each line from offset onward, newline stripped.
+
+    A trailing line without newline may still be mid-write; it is yielded
+    too, callers that track offsets should stop before it.
+    """
+    with path.open("rb") as f:
+        f.seek(offset)
+        for line in f:
+            yield offset, line.rstrip(b"\r\n")
+            offset += len(line)
+
+
+@contextmanager
+def open_buffer(path: Path) -> Iterator[Buffer]:
+    """Map a transcript read-only.
+
+    Files that can't be mapped (empty files, pipes) are read instead.
+    """
+    with path.open("rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            buf = f.read()
+        try:
+            yield buf
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+
+def iter_spans(buf: Buffer, offset: int = 0) -> Iterator[tuple[int, int]]:
+    """Yield (start, end) of each line from offset onward, end past the newline.
+
+    Pages behind the scan are released every RELEASE_SIZE bytes; they stay
+    in the page cache, they just stop counting against this process.
+    """
+    size = len(buf)
+    release = isinstance(buf, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED")
+    released = offset - offset % mmap.PAGESIZE
+
+    while offset < size:
+        newline = buf.find(b"\n", offset)
+        end = size if newline == -1 else newline + 1
+        yield offset, end
+        offset = end
+
+        if release and offset - released >= RELEASE_SIZE:
+            upto = offset - offset % mmap.PAGESIZE
+            buf.madvise(mmap.MADV_DONTNEED, released, upto - released)
+            released = upto
+
+
+def iter_spans_reverse(buf: Buffer) -> Iterator[tuple[int, int]]:
+    """Yield (start, end) of each line from last to first, newline excluded."""
+    end = len(buf)
+    while end >= 0:
+        start = buf.rfind(b"\n", 0, end) + 1
+        yield start, end
+        end = start - 1
+
+
+def _decode_object(line: bytes) -> dict | None:
+    try:
+        data = _loads(line)
+    except ValueError:
+        # JSONDecodeError and UnicodeDecodeError
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def decode(line: bytes, content: bool = True) -> dict | None:
+    """Decode one line, or None if it is not a JSON object.
+
+    Args:
+        line: Raw JSONL line
+        content: Decode message.content. With False it is left as None and
+            never decoded, which skips most of the bytes of a typical line;
+            lines that do not follow the usual layout are decoded in full
+            and have it dropped afterwards.
+    """
+    if content:
+        return _decode_object(line)
+
+    data = loads_without_content(line, _loads)
+    if data is not None:
+        return data
+
+    data = _decode_object(line)
+    if data is not None and isinstance(data.get("message"), dict) and "content" in data["message"]:
+        data["message"]["content"] = None
+    return data
+
+
+def is_sidechain(entry: dict) -> bool:
+    """Whether an entry belongs to a subagent (Task) conversation."""
+    return entry.get("isSidechain") is True
+
+
+def is_api_error(entry: dict) -> bool:
+    """Whether an entry is a synthetic API error message."""
+    return entry.get("isApiErrorMessage") is True
+
+
+def iter_entries(
+    path: Path,
+    content: bool = True,
+    sidechain: bool = False,
+    api_errors: bool = False,
+    offset: int = 0
+) -> Iterator[dict]:
+    """Yield decoded entries of a transcript in file order.
+
+    Args:
+        path: Transcript path
+        content: Decode message.content (see decode())
+        sidechain: Include sidechain entries
+        api_errors: Include API error entries
+        offset: Byte offset to start at
+    """
+    for _, line in iter_lines(path, offset):
+        entry = decode(line, content)
+        if entry is None:
+            continue
+        if not sidechain and is_sidechain(entry):
+            continue
+        if not api_errors and is_api_error(entry):
+            continue
+        yield entry
+
+
+def message_text(content) -> str:
+    """Text of a message's content: the string itself or its text blocks joined.
+
+    Tool calls, tool results, thinking and images contribute no text.
+    """
+    if isinstance(content, str):
+        return content
+    if not isinstance(content, list):
+        return ""
+    parts = [
+        block.get("text", "")
+        for block in content
+        if isinstance(block, dict) and block.get("type") == "text"
+    ]
+    return "\n\n".join(part for part in parts if part)
+
+
+def short_id(uuid: str) -> str:
+    """Compact entry id used in the minimal projection."""
+    return uuid.replace("-", "")[:12]
+
+
+def parse_command(text: str) -> dict | None:
+    """Slash command name and args from a command invocation message, if it is one."""
+    name = COMMAND_NAME.search(text)
+    if not name:
+        return None
+    args = COMMAND_ARGS.search(text)
+    return {
+        "name": name.group(1).strip(),
+        "args": args.group(1).strip() if args else "",
+        "template": ""
+    }
+
+
+def iter_minimal(entries: Iterable[dict]) -> Iterator[dict]:
+    """Project decoded entries onto the filtered_minimal format.
+
+    Only user and assistant messages with text are kept. A slash command
+    invocation becomes a command_marker record; the expanded prompt that
+    follows it is folded in as the marker's template rather than emitted as
+    a separate user message.
+    """
+    pending = None
+
+    for entry in entries:
+        kind = entry.get("type")
+        if kind not in ("user", "assistant"):
+            continue
+
+        message = entry.get("message")
+        if not isinstance(message, dict):
+            continue
+        text = message_text(message.get("content"))
+        if not text.strip():
+            continue
+
+        record = {"role": message.get("role") or kind}
+        timestamp = entry.get("timestamp")
+        uuid = entry.get("uuid") or ""
+
+        if kind == "user":
+            if pending is not None:
+                pending["command_marker"]["template"] = text
+                yield pending
+                pending = None
+                continue
+
+            command = parse_command(text)
+            if command is not None:
+                record["timestamp"] = timestamp
+                record["_id"] = short_id(uuid)
+                record["command_marker"] = command
+                pending = record
+                continue
+        elif pending is not None:
+            yield pending
+            pending = None
+
+        record["text"] = text
+        record["timestamp"] = timestamp
+        record["_id"] = short_id(uuid)
+        yield record
+
+    if pending is not None:
+        yield pending
+
+
+def write_minimal(
+    path: Path, out: TextIO, sidechain: bool = False, api_errors: bool = False
+) -> int:
+    """Stream the filtered_minimal projection of a transcript to out.
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    entries = iter_entries(path, sidechain=sidechain, api_errors=api_errors)
+    for record in iter_minimal(entries):
+        out.write(json.dumps(record) + "\n")
+        count += 1
+    return count
+
+
+def main():
+    # Imported here: context_usage.py and friends import this module and
+    # should not pay for argparse (see plugin_cli.py)
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Extract the filtered_minimal projection of a conversation JSONL"
+    )
+    parser.add_argument(
+        "conversation_path",
+        nargs="?",
+        help="Path to conversation JSONL file"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write records to this file and print a summary instead"
+    )
+    parser.add_argument(
+        "--include-sidechain",
+        action="store_true",
+        help="Keep subagent (sidechain) messages"
+    )
+    parser.add_argument(
+        "--include-api-errors",
+        action="store_true",
+        help="Keep API error messages"
+    )
+
+    args = parser.parse_args()
+
+    if not args.conversation_path:
+        parser.print_help()
+        sys.exit(1)
+
+    path = Path(args.conversation_path)
+    if not path.exists():
+        print(json.dumps({"error": f"File not found: {args.conversation_path}"}))
+        sys.exit(1)
+
+    options = {"sidechain": args.include_sidechain, "api_errors": args.include_api_errors}
+
+    if not args.output:
+        try:
+            write_minimal(path, sys.stdout, **options)
+        except BrokenPipeError:
+            # Reader (e.g. head) went away - stop quietly
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+
+    output = Path(args.output)
+    try:
+        with output.open("w") as out:
+            records = write_minimal(path, out, **options)
+    except OSError as e:
+        print(json.dumps({"error": f"Failed to extract: {e}"}))
+        sys.exit(1)
+
+    input_bytes = path.stat().st_size
+    output_bytes = output.stat().st_size
+    print(json.dumps({
+        "output": str(output),
+        "records": records,
+        "input_bytes": input_bytes,
+        "output_bytes": output_bytes,
+        "reduction_pct": round(100 - output_bytes / input_bytes * 100, 1) if input_bytes else 0
+    }))
+
+
+if __name__ == "__main__":
+    main()
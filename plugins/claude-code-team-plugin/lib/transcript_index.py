@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""Full-text index over conversation transcripts (SQLite FTS5).
+
+Finding "the session where we discussed issue #227" used to mean decoding
+every transcript. This keeps the filtered_minimal projection (see
+transcript.py) of each transcript in an FTS5 table - one row per message
+with role, text, timestamp, _id and command_marker - so a search is one
+ranked index lookup.
+
+Indexing is incremental: each file's byte offset is stored, and the next
+run decodes only lines appended since (a trailing line without newline is
+left for later). A slash command whose expanded prompt has not been
+written yet is indexed without it and re-indexed from its line next time.
+Replaced, truncated or rewritten files are indexed again from the start;
+rewrites are found by a digest of FINGERPRINT_SAMPLES windows spread over
+the indexed bytes (first and last included), so an edit that misses every
+window goes unnoticed. Sidechain (subagent) and API error entries are
+skipped, as in filtered_minimal.
+
+Usage:
+    uv run ~/.claude/lib/transcript_index.py index
+    uv run ~/.claude/lib/transcript_index.py index ~/.claude/projects/<project>/
+    uv run ~/.claude/lib/transcript_index.py search "issue 227"
+    uv run ~/.claude/lib/transcript_index.py search "worktree cleanup" --role user --limit 5
+    uv run ~/.claude/lib/transcript_index.py search "context gate" --sessions --update
+    uv run ~/.claude/lib/transcript_index.py search 'gh NEAR(label issue) OR pars*' --raw
+
+Default paths: ~/.claude/projects/ (every *.jsonl below it)
+
+Returns:
+    index: JSON with files, indexed (changed files), messages (added),
+    total_messages, seconds
+    search: JSON Lines of {path, role, timestamp, _id, command, snippet,
+    score} best match first, or with --sessions one line per session
+    {path, matches, score, first_match}; or error message.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Iterator
+
+from plugin_cache import get_cache_dir
+from transcript import (
+    decode, expand_paths, is_api_error, is_sidechain, iter_minimal, iter_spans, open_buffer,
+    short_id
+)
+
+DEFAULT_PATHS = [str(Path.home() / ".claude" / "projects")]
+
+# Rows per executemany batch while indexing one file
+BATCH_ROWS = 500
+
+# Words of context on each side of a match in snippets
+SNIPPET_TOKENS = 16
+
+# Windows of FINGERPRINT_SIZE bytes before the stored offset that are
+# hashed to detect in-place rewrites
+FINGERPRINT_SAMPLES = 16
+FINGERPRINT_SIZE = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL DEFAULT '',
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages USING fts5(
+    text,
+    role UNINDEXED,
+    timestamp UNINDEXED,
+    msg_id UNINDEXED,
+    command UNINDEXED,
+    file_id UNINDEXED,
+    offset UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# Ranked inside FTS5 first, joined with the file paths after the LIMIT
+SEARCH_SQL = """
+SELECT f.path, m.role, m.timestamp, m.msg_id, m.command, m.snippet, m.rank AS score
+FROM (
+    SELECT role, timestamp, msg_id, command, file_id, rank,
+           snippet(messages, 0, '[', ']', '...', :tokens) AS snippet
+    FROM messages
+    WHERE messages MATCH :query {where}
+    ORDER BY rank
+    LIMIT :limit
+) m JOIN files f ON f.id = m.file_id
+ORDER BY m.rank
+"""
+
+SESSIONS_SQL = """
+SELECT f.path, COUNT(*) AS matches, MIN(m.rank) AS score,
+       MIN(m.timestamp) AS first_match
+FROM messages m JOIN files f ON f.id = m.file_id
+WHERE messages MATCH :query {where}
+GROUP BY f.path
+ORDER BY score
+LIMIT :limit
+"""
+
+
+def index_path() -> Path:
+    """Location of the transcript index database."""
+    return get_cache_dir() / "transcript_index.sqlite3"
+
+
+def connect(path: Path | None = None) -> sqlite3.Connection:
+    """Open (and create if needed) the index database."""
+    conn = sqlite3.connect(path or index_path(), timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+
+    # Indexes created before fingerprints: the empty default forces one full reindex
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(files)")}
+    if "fingerprint" not in columns:
+        conn.execute("ALTER TABLE files ADD COLUMN fingerprint TEXT NOT NULL DEFAULT ''")
+    return conn
+
+
+def record_text(record: dict) -> str:
+    """Searchable text of a minimal record; command markers index name, args and prompt."""
+    command = record.get("command_marker")
+    if command:
+        return "\n".join(part for part in (command["name"], command["args"], command["template"]) if part)
+    return record.get("text", "")
+
+
+def iter_records(path: Path, offset: int, progress: dict) -> Iterator[tuple[dict, int, bool]]:
+    """Yield (record, line offset, final) for complete lines from offset on.
+
+    final is False for a command marker flushed at the end of the data
+    without its expanded prompt - it has to be indexed again once the
+    prompt line is written. progress["end"] is kept at the end of the last
+    complete line read.
+    """
+    state = {"start": offset, "done": False}
+    # Line offsets of entries since the last record; a pending command
+    # marker is yielded only after later entries were read
+    offsets = {}
+    progress["end"] = offset
+
+    with open_buffer(path) as buf:
+        def entries():
+            for start, end in iter_spans(buf, offset):
+                if buf[end - 1:end] != b"\n":
+                    break
+                progress["end"] = end
+                line = buf[start:end]
+                # Only user/assistant messages make minimal records
+                if b'"role"' not in line:
+                    continue
+                entry = decode(line)
+                if entry is None or is_sidechain(entry) or is_api_error(entry):
+                    continue
+                state["start"] = start
+                offsets[short_id(entry.get("uuid") or "")] = start
+                yield entry
+            state["done"] = True
+
+        for record in iter_minimal(entries()):
+            if "command_marker" in record:
+                line_offset = offsets.get(record["_id"], state["start"])
+            else:
+                line_offset = state["start"]
+            offsets.clear()
+
+            pending = (
+                state["done"] and "command_marker" in record
+                and not record["command_marker"]["template"]
+            )
+            yield record, line_offset, not pending
+
+
+def read_fingerprint(path: Path, offset: int) -> str:
+    """Digest of evenly spaced windows of the bytes before offset."""
+    digest = hashlib.blake2b(digest_size=16)
+    span = max(0, offset - FINGERPRINT_SIZE)
+    with path.open("rb") as f:
+        for i in range(FINGERPRINT_SAMPLES):
+            start = span * i // (FINGERPRINT_SAMPLES - 1)
+            f.seek(start)
+            digest.update(f.read(min(FINGERPRINT_SIZE, offset - start)))
+    return digest.hexdigest()
+
+
+def complete_size(path: Path) -> int:
+    """Size of the file up to and including its last newline."""
+    with path.open("rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            step = min(65536, position)
+            f.seek(position - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                return position - step + newline + 1
+            position -= step
+    return 0
+
+
+def index_file(conn: sqlite3.Connection, path: Path) -> int | None:
+    """Index what was appended to one transcript since the last run.
+
+    Returns:
+        Messages added, or None if the file was unchanged
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+
+    key = os.path.abspath(path)
+    row = conn.execute(
+        "SELECT id, inode, offset, fingerprint FROM files WHERE path = ?", (key,)
+    ).fetchone()
+    offset = 0
+    try:
+        if (row is not None and row["inode"] == st.st_ino and row["offset"] <= st.st_size
+                and read_fingerprint(path, row["offset"]) == row["fingerprint"]):
+            offset = row["offset"]
+            if offset == st.st_size or offset == complete_size(path):
+                return None
+    except OSError:
+        return None
+
+    added = 0
+    with conn:
+        if row is None:
+            file_id = conn.execute(
+                "INSERT INTO files (path, inode, offset, indexed_at) VALUES (?, ?, 0, ?)",
+                (key, st.st_ino, time.time())
+            ).lastrowid
+        else:
+            file_id = row["id"]
+        # Rows at or past the resume point are re-created (pending command markers)
+        conn.execute("DELETE FROM messages WHERE file_id = ? AND offset >= ?", (file_id, offset))
+
+        resume = None
+        rows = []
+        progress = {}
+        for record, line_offset, final in iter_records(path, offset, progress):
+            command = record.get("command_marker")
+            rows.append((
+                record_text(record), record["role"], record.get("timestamp"), record.get("_id"),
+                command["name"] if command else None, file_id, line_offset
+            ))
+            if not final and resume is None:
+                resume = line_offset
+            if len(rows) >= BATCH_ROWS:
+                added += _insert(conn, rows)
+                rows = []
+        added += _insert(conn, rows)
+
+        end = progress["end"] if resume is None else resume
+        conn.execute(
+            "UPDATE files SET inode = ?, offset = ?, fingerprint = ?, indexed_at = ? WHERE id = ?",
+            (st.st_ino, end, read_fingerprint(path, end), time.time(), file_id)
+        )
+    return added
+
+
+def _insert(conn: sqlite3.Connection, rows: list[tuple]) -> int:
+    conn.executemany(
+        "INSERT INTO messages (text, role, timestamp, msg_id, command, file_id, offset) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows
+    )
+    return len(rows)
+
+
+def update_index(conn: sqlite3.Connection, patterns: list[str]) -> dict:
+    """Index every transcript matched by patterns; returns a summary."""
+    start = time.perf_counter()
+    paths = expand_paths(patterns)
+    indexed = added = 0
+    for path in paths:
+        count = index_file(conn, Path(path))
+        if count is not None:
+            indexed += 1
+            added += count
+    total = conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+    return {
+        "files": len(paths),
+        "indexed": indexed,
+        "messages": added,
+        "total_messages": total,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+
+def quote_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all of its words."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def search(
+    conn: sqlite3.Connection,
+    query: str,
+    limit: int = 20,
+    role: str | None = None,
+    sessions: bool = False
+) -> list[dict]:
+    """Ranked matches (or sessions) for an FTS5 query; best first."""
+    where = "AND role = :role" if role else ""
+    sql = (SESSIONS_SQL if sessions else SEARCH_SQL).format(where=where)
+    params = {"query": query, "limit": limit, "role": role, "tokens": SNIPPET_TOKENS}
+
+    results = []
+    for row in conn.execute(sql, params):
+        result = dict(row)
+        result["score"] = round(-result["score"], 3)
+        if not sessions:
+            result["_id"] = result.pop("msg_id")
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text index over conversation transcripts")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = sub.add_parser("index", help="Index new and appended transcript lines")
+    index_parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Transcripts, glob patterns or directories (default: ~/.claude/projects/)"
+    )
+
+    search_parser = sub.add_parser("search", help="Search indexed messages")
+    search_parser.add_argument("query", help="Words to find (all must match)")
+    search_parser.add_argument("--limit", type=int, default=20, help="Maximum results")
+    search_parser.add_argument("--role", choices=["user", "assistant"], help="Only this role")
+    search_parser.add_argument(
+        "--sessions",
+        action="store_true",
+        help="One result per session, ranked by its best match"
+    )
+    search_parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Pass the query to FTS5 as is (AND/OR/NOT, NEAR, prefix*)"
+    )
+    search_parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Index ~/.claude/projects/ incrementally before searching"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        with closing(connect()) as conn:
+            if args.command == "index":
+                print(json.dumps(update_index(conn, args.paths or DEFAULT_PATHS)))
+                return
+
+            if args.update:
+                update_index(conn, DEFAULT_PATHS)
+            query = args.query if args.raw else quote_query(args.query)
+            if not query:
+                print(json.dumps({"error": "Empty query"}))
+                sys.exit(1)
+            results = search(conn, query, max(1, args.limit), args.role, args.sessions)
+    except sqlite3.OperationalError as e:
+        # Also FTS5 query syntax errors with --raw
+        print(json.dumps({"error": f"Transcript index: {e}"}))
+        sys.exit(1)
+
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Issue-number -> worktree path index for the current git repository.
+
+Parses `git worktree list --porcelain` once and maps every `issue-N` found
+in a worktree's path or branch to that worktree. Numbers match exactly, so
+issue-1 no longer matches issue-12.
+
+The index is persisted in the plugin cache per repository and reused until
+the worktree metadata changes: the mtime of .git/worktrees (entries added or
+removed), of each worktree's gitdir/HEAD file (moved, switched branch), and
+of the main HEAD. Checking that only needs a few stat calls, so repeated
+lookups - from this process or other scripts - do not fork git.
+
+Usage:
+    from worktree_index import get_worktree_index
+    get_worktree_index().get("227")  # -> "/path/to/issue-227" or None
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+from pathlib import Path
+
+from plugin_cache import get_cache_dir, key_digest, load_json, save_json
+
+ISSUE_PATTERN = re.compile(r"(?<!\d)issue-(\d+)(?!\d)")
+
+# Per-process memo: {common_dir: (signature, index)}
+_memo: dict[str, tuple[list, dict[str, str]]] = {}
+
+
+def find_git_common_dir(start: Path | None = None) -> Path | None:
+    """Locate the repository's common .git directory without running git.
+
+    Handles linked worktrees, whose .git is a file pointing at
+    <common>/.git/worktrees/<name> with a `commondir` file inside.
+    """
+    start = (start or Path.cwd()).resolve()
+    for directory in (start, *start.parents):
+        git_path = directory / ".git"
+        if git_path.is_dir():
+            return git_path
+        if not git_path.is_file():
+            continue
+
+        try:
+            content = git_path.read_text().strip()
+        except OSError:
+            return None
+        if not content.startswith("gitdir:"):
+            return None
+
+        gitdir = Path(content[len("gitdir:"):].strip())
+        if not gitdir.is_absolute():
+            gitdir = directory / gitdir
+        commondir = gitdir / "commondir"
+        try:
+            return (gitdir / commondir.read_text().strip()).resolve()
+        except OSError:
+            return gitdir.resolve()
+
+    return None
+
+
+def worktree_signature(common_dir: Path) -> list:
+    """Mtimes that change whenever `git worktree list` output can change."""
+    def mtime(path: Path) -> int | None:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    signature = [mtime(common_dir / "HEAD"), mtime(common_dir / "worktrees")]
+    if signature[1] is None:
+        return signature
+
+    latest = 0
+    for entry in os.scandir(common_dir / "worktrees"):
+        for name in ("gitdir", "HEAD"):
+            latest = max(latest, mtime(Path(entry.path) / name) or 0)
+    signature.append(latest)
+    return signature
+
+
+def parse_worktree_porcelain(output: str) -> dict[str, str]:
+    """Map issue numbers to worktree paths from `git worktree list --porcelain`.
+
+    The first worktree that mentions an issue wins, in git's listing order.
+    """
+    index: dict[str, str] = {}
+    for block in output.split("\n\n"):
+        path = None
+        branch = ""
+        for line in block.splitlines():
+            if line.startswith("worktree "):
+                path = line[len("worktree "):]
+            elif line.startswith("branch "):
+                branch = line[len("branch "):].removeprefix("refs/heads/")
+
+        if not path:
+            continue
+        for text in (path, branch):
+            for match in ISSUE_PATTERN.finditer(text):
+                index.setdefault(match.group(1), path)
+
+    return index
+
+
+def build_worktree_index(cwd: str | None = None) -> dict[str, str] | None:
+    """Run git and parse the worktree list, or None outside a repository."""
+    try:
+        result = subprocess.run(
+            ["git", "worktree", "list", "--porcelain"],
+            capture_output=True, text=True, timeout=30, cwd=cwd
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+    if result.returncode != 0:
+        return None
+    return parse_worktree_porcelain(result.stdout)
+
+
+def get_worktree_index(use_cache: bool = True) -> dict[str, str]:
+    """Return the issue -> worktree path index for the current repository."""
+    common_dir = find_git_common_dir()
+    if common_dir is None or not use_cache:
+        # Unusual layouts (GIT_DIR, bare repos) - ask git directly
+        return build_worktree_index() or {}
+
+    key = str(common_dir)
+    signature = worktree_signature(common_dir)
+
+    memo = _memo.get(key)
+    if memo and memo[0] == signature:
+        return memo[1]
+
+    cache_file = get_cache_dir("worktrees") / f"{key_digest(key)}.json"
+    cached = load_json(cache_file)
+    if cached and cached.get("common_dir") == key and cached.get("signature") == signature:
+        index = cached.get("index") or {}
+    else:
+        index = build_worktree_index()
+        if index is None:
+            return {}
+        save_json(cache_file, {"common_dir": key, "signature": signature, "index": index})
+
+    _memo[key] = (signature, index)
+    return index
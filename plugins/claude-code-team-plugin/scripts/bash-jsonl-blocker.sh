@@ -3,6 +3,9 @@
 # Blocks ANY Bash command that references conversation JSONL files.
 # Forces use of conversation-reader skill for proper extraction.
 
+# Timing + decision telemetry (see hook-telemetry.sh)
+source "${0%/*}/hook-telemetry.sh" 2>/dev/null
+
 # Read hook input from stdin
 input=$(cat)
 
@@ -14,6 +17,21 @@ if echo "$command" | grep -qE 'extract_conversation\.py'; then
   exit 0
 fi
 
+# Allow transcript.py (streaming transcript reader / filtered_minimal extractor)
+if echo "$command" | grep -qE 'lib/transcript\.py'; then
+  exit 0
+fi
+
+# Allow transcript_index.py (full-text index over filtered_minimal)
+if echo "$command" | grep -qE 'lib/transcript_index\.py'; then
+  exit 0
+fi
+
+# Allow session_usage.py (token usage / cost accounting)
+if echo "$command" | grep -qE 'lib/session_usage\.py'; then
+  exit 0
+fi
+
 # Allow context_usage.py (Ralph context gate check)
 if echo "$command" | grep -qE 'context_usage\.py'; then
   exit 0
@@ -26,6 +44,7 @@ fi
 
 # Block ANY command that references .claude/projects/*.jsonl
 if echo "$command" | grep -qE '\.claude/projects/.*\.jsonl'; then
+  TELEMETRY_DECISION="deny"
   cat << 'EOF'
 {
   "decision": "block",
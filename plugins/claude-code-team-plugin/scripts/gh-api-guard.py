@@ -9,10 +9,21 @@ Handles commands that need finer control than settings.json allow/deny lists:
 Exit behavior:
 - Exit 0 with JSON {"permissionDecision": "allow"} = auto-approve
 - Exit 0 without JSON = fall through to settings.json behavior (ask)
+
+All patterns live in one declarative table (RULES) compiled once into a
+single alternation regex, so each command is classified in one pass.
+evaluate() holds the decision logic without exiting, so hook_rules.py can
+run this guard in-process inside the hook daemon, which keeps the compiled
+table for its whole lifetime.
+
+Standalone runs log their timing and decision (see hook_telemetry.py).
 """
+from __future__ import annotations
+
 import json
 import sys
 import re
+import time
 
 
 def allow(reason: str):
@@ -33,92 +44,155 @@ def ask():
     sys.exit(0)
 
 
-def check_gh_api(command: str):
-    """Handle gh api commands: allow GET, ask for write operations."""
-    write_patterns = [
-        r"--method\s+DELETE",
-        r"--method\s+PATCH",
-        r"--method\s+POST",
-        r"--method\s+PUT",
-        r"-X\s+DELETE",
-        r"-X\s+PATCH",
-        r"-X\s+POST",
-        r"-X\s+PUT",
-    ]
-
-    if any(re.search(p, command, re.IGNORECASE) for p in write_patterns):
-        ask()
-
-    allow("Read-only gh api operation (GET)")
-
-
-def check_git_c(command: str):
-    """Handle git -c commands: allow by default, ask for risky operations."""
-    risky_patterns = [
-        r'reset\s+--hard',
-        r'push\s+.*(-f|--force)',
-        r'commit\s+.*--amend',
-        r'clean\s+-[fd]',
-        r'\brebase\b',
-        r'branch\s+-[dD]',
-        r'stash\s+(drop|clear)',
-    ]
-
-    if any(re.search(p, command) for p in risky_patterns):
-        ask()
-
-    allow("Safe git -c operation")
-
-
-def check_gh_issue_edit(command: str):
-    """Handle gh issue edit: allow label-only ops, ask for others."""
-    # Label-only patterns (safe operations)
-    label_patterns = [
-        r'--add-label',
-        r'--remove-label',
-    ]
-
-    # Non-label patterns (need confirmation)
-    non_label_patterns = [
-        r'--title',
-        r'--body',
-        r'--assignee',
-        r'--milestone',
-        r'--project',
-    ]
-
-    has_label_op = any(re.search(p, command) for p in label_patterns)
-    has_non_label_op = any(re.search(p, command) for p in non_label_patterns)
-
-    # If only label operations, auto-allow
-    if has_label_op and not has_non_label_op:
-        allow("Label-only gh issue edit")
-
-    # Otherwise fall through to ask
-    ask()
+# Declarative rule table: (category, pattern, flags).
+#
+# Routes pick the handler (first matching route in table order wins, as in
+# the old if/elif chain); the other categories are flags the handlers read.
+# Patterns must not capture: the category comes from the named group
+# wrapped around each one. Variable-length tails use lookaheads so a match
+# never swallows text another rule needs to see.
+RULES = [
+    ("route_gh_api", r"gh api", 0),
+    ("route_gh_issue_edit", r"gh issue edit", 0),
+    ("route_git_c", r"^git\s+-c\b", 0),
+
+    # gh api: write methods need confirmation
+    ("api_write", r"--method\s+(?:DELETE|PATCH|POST|PUT)", re.IGNORECASE),
+    ("api_write", r"-X\s+(?:DELETE|PATCH|POST|PUT)", re.IGNORECASE),
+
+    # git -c: risky operations need confirmation
+    ("git_risky", r"reset\s+--hard", 0),
+    ("git_risky", r"push\s+(?=.*(?:-f|--force))", 0),
+    ("git_risky", r"commit\s+(?=.*--amend)", 0),
+    ("git_risky", r"clean\s+-[fd]", 0),
+    ("git_risky", r"\brebase\b", 0),
+    ("git_risky", r"branch\s+-[dD]", 0),
+    ("git_risky", r"stash\s+(?:drop|clear)", 0),
+
+    # gh issue edit: label-only edits are safe
+    ("label_op", r"--add-label", 0),
+    ("label_op", r"--remove-label", 0),
+    ("non_label_op", r"--title", 0),
+    ("non_label_op", r"--body", 0),
+    ("non_label_op", r"--assignee", 0),
+    ("non_label_op", r"--milestone", 0),
+    ("non_label_op", r"--project", 0),
+]
+
+
+def _literal_prefix(pattern: str) -> str | None:
+    """First two literal characters of a pattern (after ^ or \\b), if any."""
+    body = pattern.removeprefix("^").removeprefix(r"\b")
+    match = re.match(r"[\w \-]{2}", body)
+    return match.group() if match else None
+
+
+def compile_rules(rules: list[tuple[str, str, int]]) -> tuple[re.Pattern, list[str]]:
+    """Compile a rule table into one alternation regex.
+
+    The alternation is guarded by a lookahead on the rules' two-character
+    literal prefixes, so positions that cannot start any rule are skipped
+    without trying every alternative.
+
+    Returns:
+        (pattern, categories) where categories[i] is the category of the
+        named group r{i}
+    """
+    alternatives = []
+    categories = []
+    prefixes = set()
+    for i, (category, pattern, flags) in enumerate(rules):
+        prefix = _literal_prefix(pattern)
+        if flags & re.IGNORECASE:
+            pattern = f"(?i:{pattern})"
+            prefix = prefix and f"(?i:{re.escape(prefix)})"
+        else:
+            prefix = prefix and re.escape(prefix)
+
+        alternatives.append(f"(?P<r{i}>{pattern})")
+        categories.append(category)
+        prefixes.add(prefix)
+
+    combined = "|".join(alternatives)
+    # Only gate when every rule has a literal prefix to gate on
+    if None not in prefixes:
+        combined = f"(?={'|'.join(sorted(prefixes))})(?:{combined})"
+
+    return re.compile(combined), categories
+
+
+RULE_PATTERN, RULE_CATEGORIES = compile_rules(RULES)
+
+
+def classify(command: str) -> set[str]:
+    """Return every rule category that matches the command, in one pass.
+
+    Empty when no route can match, since decide() ignores flags without one.
+    """
+    # Literal text each route rule needs (keep in sync with the route_*
+    # rules). Most Bash commands have none, and these substring checks rule
+    # them out far cheaper than the combined regex.
+    if not ("gh api" in command or "gh issue edit" in command or command.startswith("git")):
+        return set()
+    return {RULE_CATEGORIES[int(m.lastgroup[1:])] for m in RULE_PATTERN.finditer(command)}
+
+
+def decide(hits: set[str]) -> str | None:
+    """Map matched categories to an allow reason, or None to fall through."""
+    if "route_gh_api" in hits:
+        # gh api: allow GET, ask for write operations
+        if "api_write" in hits:
+            return None
+        return "Read-only gh api operation (GET)"
+
+    if "route_gh_issue_edit" in hits:
+        # If only label operations, auto-allow; otherwise fall through to ask
+        if "label_op" in hits and "non_label_op" not in hits:
+            return "Label-only gh issue edit"
+        return None
+
+    if "route_git_c" in hits:
+        # git -c: allow by default, ask for risky operations
+        if "git_risky" in hits:
+            return None
+        return "Safe git -c operation"
+
+    # Not a command we handle - fall through
+    return None
+
+
+def evaluate(input_data: dict) -> str | None:
+    """Return the allow reason for a hook payload, or None to fall through."""
+    if input_data.get("tool_name") != "Bash":
+        return None
+
+    command = input_data.get("tool_input", {}).get("command", "")
+    return decide(classify(command))
+
+
+def log_decision(decision: str, start: float):
+    """Append this run's telemetry record; never fails the hook."""
+    try:
+        import hook_telemetry
+    except ImportError:
+        return
+    ms = (time.perf_counter() - start) * 1000
+    hook_telemetry.write([hook_telemetry.record("gh-api-guard.py", decision, ms, "script")])
 
 
 def main():
+    start = time.perf_counter()
     try:
         input_data = json.load(sys.stdin)
     except json.JSONDecodeError:
         sys.exit(0)
 
-    if input_data.get("tool_name") != "Bash":
-        sys.exit(0)
+    reason = evaluate(input_data)
+    log_decision("allow" if reason else "pass", start)
+    if reason:
+        allow(reason)
 
-    command = input_data.get("tool_input", {}).get("command", "")
-
-    # Route to appropriate handler
-    if "gh api" in command:
-        check_gh_api(command)
-    elif "gh issue edit" in command:
-        check_gh_issue_edit(command)
-    elif re.search(r'^git\s+-c\b', command):
-        check_git_c(command)
-
-    # Not a command we handle - fall through
-    sys.exit(0)
+    ask()
 
 
 if __name__ == "__main__":
@@ -3,6 +3,9 @@
 # Workaround for hookify plugin output not being visible to AI
 # See: https://github.com/DaveX2001/claude-code-improvements/issues/125
 
+# Timing + decision telemetry (see hook-telemetry.sh)
+source "${0%/*}/hook-telemetry.sh" 2>/dev/null
+
 # Read hook input from stdin
 input=$(cat)
 
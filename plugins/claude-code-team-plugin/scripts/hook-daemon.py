@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""Resident evaluator for the Bash PreToolUse hook chain.
+
+Every Bash tool call used to start bash-jsonl-blocker.sh, pip-blocker.sh,
+gh-api-guard.py and git-commit-guard.sh, each forking its own jq/grep
+processes. This script replaces that chain with a single hook:
+
+- default (client): forward the hook payload on stdin to the daemon over a
+  Unix socket and relay its merged decision. If the daemon is unreachable,
+  run the original scripts instead and start the daemon for the next call.
+- --start: launch the daemon in the background unless it is running
+  (SessionStart hook).
+- --serve: run the daemon. All rules run in-process (hook_rules.py); it
+  exits after CLAUDE_HOOK_DAEMON_IDLE seconds (default 1800) without calls,
+  or within CHECK_INTERVAL seconds of a change to one of RULE_FILES.
+  Per-rule timings and decisions go to the telemetry log
+  (hook_telemetry.py) after the reply is sent.
+
+The client path only imports os, socket, sys and zlib so the shim starts
+fast under `python3 -S`. It runs on the system python3 (3.9 on macOS), and
+if it fails for any reason the chain scripts run directly, so a bug here
+never lets a command through unchecked.
+
+Usage:
+    python3 -S hook-daemon.py < payload.json
+    python3 -S hook-daemon.py --start
+    python3 hook-daemon.py --serve
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sys
+import zlib
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+IDLE_TIMEOUT = float(os.environ.get("CLAUDE_HOOK_DAEMON_IDLE", "1800"))
+CLIENT_TIMEOUT = 2.0
+
+# Seconds between the daemon's checks for changed rule files
+CHECK_INTERVAL = 30.0
+
+# Files the daemon's answers depend on: the rules it loads and the scripts
+# they port (keep in sync with hook_rules.BASH_CHAIN_SCRIPTS)
+RULE_FILES = [
+    "hook-daemon.py",
+    "hook_rules.py",
+    "hook_telemetry.py",
+    "bash-jsonl-blocker.sh",
+    "pip-blocker.sh",
+    "gh-api-guard.py",
+    "git-commit-guard.sh",
+]
+
+# The chain as standalone scripts, for when hook_rules.py cannot be loaded
+# (keep in sync with hook_rules.BASH_CHAIN_SCRIPTS)
+CHAIN_SCRIPTS = [
+    ["bash", "bash-jsonl-blocker.sh"],
+    ["bash", "pip-blocker.sh"],
+    ["python3", "gh-api-guard.py"],
+    ["bash", "git-commit-guard.sh"],
+]
+
+
+def _runtime_dir() -> str:
+    """Per-user directory holding the daemon socket."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        return os.path.join(base, "claude-code-team-plugin")
+    return f"/tmp/claude-code-team-plugin-{os.getuid()}"
+
+
+def rules_tag() -> int:
+    """CRC of the scripts directory and the mtime and size of each rule file."""
+    tag = zlib.crc32(SCRIPTS_DIR.encode())
+    for name in RULE_FILES:
+        try:
+            st = os.stat(os.path.join(SCRIPTS_DIR, name))
+            stamp = b"%s %d %d" % (name.encode(), st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = name.encode()
+        tag = zlib.crc32(stamp, tag)
+    return tag
+
+
+def socket_path(create: bool = False) -> str | None:
+    """Socket path for this plugin install, or None if the directory is unsafe.
+
+    The directory must belong to the current user and be private, otherwise
+    another user could answer hook queries. The file name is tagged with
+    rules_tag(), so a plugin moved, updated in place or with edited rules
+    never talks to a daemon running the old rules.
+    """
+    runtime_dir = _runtime_dir()
+    if create:
+        os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+
+    try:
+        st = os.stat(runtime_dir)
+    except OSError:
+        return None
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        return None
+
+    return os.path.join(runtime_dir, f"hooks-{rules_tag():08x}.sock")
+
+
+def query_daemon(payload: bytes) -> tuple[int, bytes, bytes] | None:
+    """Send a payload to the daemon; return (exit_code, stdout, stderr) or None."""
+    path = socket_path()
+    if path is None:
+        return None
+
+    chunks = []
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CLIENT_TIMEOUT)
+            sock.connect(path)
+            sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+    except OSError:
+        return None
+
+    # Response: b"<exit> <stdout len> <stderr len>\n" + stdout + stderr
+    header, sep, body = b"".join(chunks).partition(b"\n")
+    try:
+        exit_code, out_len, err_len = map(int, header.split())
+    except ValueError:
+        return None
+    if not sep or len(body) != out_len + err_len:
+        return None
+
+    return exit_code, body[:out_len], body[out_len:]
+
+
+def spawn_daemon() -> None:
+    """Start the daemon detached from this process."""
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.join(SCRIPTS_DIR, "hook-daemon.py"), "--serve"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def run_fallback(payload: bytes) -> tuple[int, bytes, bytes]:
+    """Run the original hook scripts concurrently and merge their results."""
+    import subprocess
+
+    sys.path.insert(0, SCRIPTS_DIR)
+    from hook_rules import BASH_CHAIN_SCRIPTS, HookResult, merge_results
+
+    procs = []
+    for cmd in BASH_CHAIN_SCRIPTS:
+        try:
+            procs.append(subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            ))
+        except OSError:
+            continue
+
+    results = []
+    for proc in procs:
+        try:
+            out, err = proc.communicate(payload, timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            continue
+        results.append(HookResult(
+            proc.returncode,
+            out.decode(errors="replace"),
+            err.decode(errors="replace"),
+        ))
+
+    merged = merge_results(results)
+    return merged.exit_code, merged.stdout.encode(), merged.stderr.encode()
+
+
+def run_chain_directly(payload: bytes) -> tuple[int, bytes, bytes]:
+    """Last resort: run the chain scripts one by one, strictest result wins.
+
+    Decisions are ranked by a plain look at each result - block (exit 2) or
+    deny, then ask, then any other output - without hook_rules.py.
+    """
+    import subprocess
+
+    def rank(exit_code: int, out: bytes) -> int:
+        if exit_code == 2 or b'"deny"' in out:
+            return 3
+        if b'"ask"' in out:
+            return 2
+        return 1 if out.strip() else 0
+
+    best, best_rank = (0, b"", b""), 0
+    for interpreter, script in CHAIN_SCRIPTS:
+        try:
+            proc = subprocess.run(
+                [interpreter, os.path.join(SCRIPTS_DIR, script)],
+                input=payload, capture_output=True, timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        result_rank = rank(proc.returncode, proc.stdout)
+        if result_rank > best_rank:
+            best, best_rank = (proc.returncode, proc.stdout, proc.stderr), result_rank
+    return best
+
+
+def serve() -> int:
+    """Run the daemon until it is idle or its rule files change."""
+    import fcntl
+    import json
+    import socketserver
+    import time
+
+    # Taken before the rules are loaded: a change from here on makes it stale
+    tag = rules_tag()
+
+    sys.path.insert(0, SCRIPTS_DIR)
+    import hook_telemetry
+    from hook_rules import HookResult, decision_name, evaluate_bash_chain
+
+    path = socket_path(create=True)
+    if path is None:
+        return 1
+
+    # One daemon per socket: the lock is held for the daemon's lifetime
+    lock = open(path + ".lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return 0
+
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            self.request.settimeout(CLIENT_TIMEOUT)
+            try:
+                payload = self.rfile.read()
+            except OSError:
+                return
+
+            result = HookResult(0, "", "")
+            timings = []
+            if payload.strip():
+                try:
+                    result = evaluate_bash_chain(json.loads(payload), timings)
+                except ValueError:
+                    pass
+
+            out, err = result.stdout.encode(), result.stderr.encode()
+            header = b"%d %d %d\n" % (result.exit_code, len(out), len(err))
+            self.wfile.write(header + out + err)
+
+            # Release the client before logging
+            try:
+                self.request.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            hook_telemetry.write([
+                hook_telemetry.record(name, decision_name(rule_result), ms, "daemon")
+                for name, rule_result, ms in timings
+            ])
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        timeout = min(CHECK_INTERVAL, IDLE_TIMEOUT)
+        last_request = time.monotonic()
+        idle = False
+        stale = False
+
+        def verify_request(self, request, client_address):
+            self.last_request = time.monotonic()
+            return True
+
+        def handle_timeout(self):
+            # Clients of changed rules already use another socket
+            self.stale = rules_tag() != tag
+            self.idle = self.stale or time.monotonic() - self.last_request >= IDLE_TIMEOUT
+
+    with Server(path, Handler) as server:
+        os.chmod(path, 0o600)
+        try:
+            while not server.idle:
+                server.handle_request()
+        finally:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            if server.stale:
+                # No client computes this tag any more
+                try:
+                    os.unlink(path + ".lock")
+                except FileNotFoundError:
+                    pass
+
+    return 0
+
+
+def main() -> int:
+    if "--serve" in sys.argv[1:]:
+        return serve()
+
+    if "--start" in sys.argv[1:]:
+        # SessionStart hooks receive a payload on stdin - not needed here
+        if query_daemon(b"") is None:
+            spawn_daemon()
+        return 0
+
+    payload = sys.stdin.buffer.read()
+    try:
+        response = query_daemon(payload)
+        if response is None:
+            spawn_daemon()
+            response = run_fallback(payload)
+    except Exception:
+        # Failing here would exit 1, which does not block: fail closed
+        response = run_chain_directly(payload)
+
+    exit_code, out, err = response
+    sys.stdout.buffer.write(out)
+    sys.stderr.buffer.write(err)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
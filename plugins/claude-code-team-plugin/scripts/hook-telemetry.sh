@@ -0,0 +1,44 @@
+#!/bin/bash
+# Hook Telemetry - sourced by the shell hooks
+# Appends one timing + decision record per invocation to the same log as
+# hook_telemetry.py, from an EXIT trap, with no extra processes.
+#
+# Scripts set TELEMETRY_DECISION before exiting (default: pass); exit
+# code 2 is logged as block. Set CLAUDE_HOOK_TELEMETRY=0 to disable.
+
+TELEMETRY_HOOK="${0##*/}"
+TELEMETRY_DECISION="pass"
+TELEMETRY_START="$EPOCHREALTIME"
+
+# Rotate past 1 MiB (MAX_BYTES in hook_telemetry.py). Checking the size
+# costs a fork, so only one invocation in 64 does it.
+TELEMETRY_MAX_BYTES=1048576
+
+telemetry_record() {
+  local status=$?
+  [[ "$CLAUDE_HOOK_TELEMETRY" == "0" || -z "$TELEMETRY_START" ]] && return
+
+  local root="${CLAUDE_PLUGIN_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/claude-code-team-plugin}"
+  local log="$root/hook-telemetry.jsonl"
+  [[ -d "$root" ]] || mkdir -p "$root" 2>/dev/null || return
+
+  local decision="$TELEMETRY_DECISION"
+  [[ $status -eq 2 ]] && decision="block"
+
+  # Microseconds from EPOCHREALTIME (locale may use , as separator)
+  local now="$EPOCHREALTIME"
+  local start_us="${TELEMETRY_START//[.,]/}" now_us="${now//[.,]/}"
+  local us=$(( 10#$now_us - 10#$start_us ))
+  local ms
+  printf -v ms '%d.%03d' $(( us / 1000 )) $(( us % 1000 ))
+
+  if (( RANDOM % 64 == 0 )) && [[ -f "$log" ]] \
+    && (( $(wc -c < "$log") > TELEMETRY_MAX_BYTES )); then
+    mv -f "$log" "$log.1" 2>/dev/null
+  fi
+
+  printf '{"ts":%s,"hook":"%s","decision":"%s","ms":%s,"via":"script"}\n' \
+    "${now/,/.}" "$TELEMETRY_HOOK" "$decision" "$ms" >> "$log" 2>/dev/null
+}
+
+trap telemetry_record EXIT
@@ -0,0 +1,301 @@
+"""In-process PreToolUse rules for the hook daemon.
+
+Python ports of bash-jsonl-blocker.sh, pip-blocker.sh and git-commit-guard.sh,
+plus gh-api-guard.py loaded as a module. Each rule takes the hook payload and
+returns the HookResult its script would have produced (exit code, stdout,
+stderr), or None when the script would exit 0 silently.
+
+The shell scripts stay the source of truth and the fallback when the daemon
+is not running - keep the patterns here in sync with them.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+class HookResult(NamedTuple):
+    exit_code: int
+    stdout: str
+    stderr: str
+
+
+def _load_gh_api_guard():
+    """Import gh-api-guard.py (hyphenated file name) as a module."""
+    spec = importlib.util.spec_from_file_location(
+        "gh_api_guard", SCRIPTS_DIR / "gh-api-guard.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+gh_api_guard = _load_gh_api_guard()
+
+
+def _grep(pattern: re.Pattern, text: str) -> bool:
+    """Match like `echo "$text" | grep -qE pattern` (line by line)."""
+    return any(pattern.search(line) for line in text.split("\n"))
+
+
+def _command(payload: dict) -> str:
+    """Match `jq -r '.tool_input.command // empty'`."""
+    tool_input = payload.get("tool_input")
+    command = tool_input.get("command") if isinstance(tool_input, dict) else None
+    return command if isinstance(command, str) else ""
+
+
+def _deny(reason: str) -> HookResult:
+    output = {
+        "hookSpecificOutput": {
+            "hookEventName": "PreToolUse",
+            "permissionDecision": "deny",
+            "permissionDecisionReason": reason
+        }
+    }
+    return HookResult(0, json.dumps(output, indent=2) + "\n", "")
+
+
+# bash-jsonl-blocker.sh
+CONVERSATION_READER = re.compile(r'extract_conversation\.py')
+TRANSCRIPT_READER = re.compile(r'lib/transcript\.py')
+TRANSCRIPT_INDEX = re.compile(r'lib/transcript_index\.py')
+SESSION_USAGE = re.compile(r'lib/session_usage\.py')
+CONTEXT_USAGE = re.compile(r'context_usage\.py')
+GH_ISSUE_WRITE = re.compile(r'^gh issue (comment|create|edit)')
+CONVERSATION_JSONL = re.compile(r'\.claude/projects/.*\.jsonl')
+
+
+def bash_jsonl_blocker(payload: dict) -> HookResult | None:
+    """Block Bash commands that reference conversation JSONL files."""
+    command = _command(payload)
+
+    if _grep(CONVERSATION_READER, command) or _grep(TRANSCRIPT_READER, command):
+        return None
+    if _grep(TRANSCRIPT_INDEX, command):
+        return None
+    if _grep(SESSION_USAGE, command) or _grep(CONTEXT_USAGE, command):
+        return None
+    if _grep(GH_ISSUE_WRITE, command):
+        return None
+
+    if _grep(CONVERSATION_JSONL, command):
+        output = {
+            "decision": "block",
+            "reason": "Direct access to conversation JSONL is blocked. "
+                      "Invoke Skill(conversation-reader) for proper extraction."
+        }
+        return HookResult(0, json.dumps(output, indent=2) + "\n", "")
+
+    return None
+
+
+# pip-blocker.sh
+GH_COMMAND = re.compile(r'^gh\s')
+PIP_INSTALL = re.compile(r'(^|\s|&&|\|)(pip|pip3)\s+install|uv\s+pip\s+install')
+PYTHON_DIRECT = re.compile(r'(^|\s|&&|\|)python3?\s')
+UV_RUN = re.compile(r'uv run(\s+--?[a-z]|\s+python)')
+PYTHON_VERSION = re.compile(r'python3?\s+(--version|-V)')
+DOCKER = re.compile(r'(^docker\s|^ssh\s.*docker\s)')
+# This plugin's CLI only, one known subcommand with plain arguments
+# (identical to PLUGIN_CLI in pip-blocker.sh)
+PLUGIN_CLI = re.compile(r'^python3 -S \$\{CLAUDE_PLUGIN_ROOT\}/lib/plugin_cli\.py (context-usage|bootstrap|issue-context|discover|self-check)( [A-Za-z0-9_./=#-]+)*$')
+
+PIP_REASON = (
+    "pip/pip3/uv pip commands are blocked. Use native uv instead:\n\n"
+    "**One-off script (temporary deps):**\nuv run --with package script.py\n\n"
+    "**Project with pyproject.toml:**\nuv add package\nuv run script.py\n\n"
+    "**Run with multiple temp deps:**\nuv run --with httpx --with rich script.py\n\n"
+    "Never use pip, pip3, or uv pip. Native uv handles venvs automatically."
+)
+PYTHON_REASON = (
+    "Direct python/python3 execution is blocked. Use uv run instead:\n\n"
+    "**Run script:**\nuv run script.py\n\n"
+    "**Inline code:**\nuv run python -c \"print('hello')\"\n\n"
+    "**With temp deps:**\nuv run --with numpy script.py\n\n"
+    "uv handles venvs and dependencies automatically."
+)
+
+
+def _is_plugin_cli(command: str) -> bool:
+    """Whether command is a plain call of this plugin's CLI.
+
+    The resolved plugin root counts as ${CLAUDE_PLUGIN_ROOT}, as in
+    pip-blocker.sh.
+    """
+    if not command.startswith("python3 -S ") or "\n" in command:
+        return False
+    root = (os.environ.get("CLAUDE_PLUGIN_ROOT") or str(SCRIPTS_DIR.parent)).rstrip("/")
+    prefix = f"python3 -S {root}/"
+    if command.startswith(prefix):
+        command = "python3 -S ${CLAUDE_PLUGIN_ROOT}/" + command[len(prefix):]
+    return PLUGIN_CLI.search(command) is not None
+
+
+def pip_blocker(payload: dict) -> HookResult | None:
+    """Deny pip installs and direct python execution in favour of uv."""
+    command = _command(payload)
+
+    if _grep(GH_COMMAND, command):
+        return None
+
+    if _grep(PIP_INSTALL, command):
+        return _deny(PIP_REASON)
+
+    if _is_plugin_cli(command):
+        return None
+
+    if (_grep(PYTHON_DIRECT, command)
+            and not _grep(UV_RUN, command)
+            and not _grep(PYTHON_VERSION, command)
+            and not _grep(DOCKER, command)):
+        return _deny(PYTHON_REASON)
+
+    return None
+
+
+def gh_api_guard_rule(payload: dict) -> HookResult | None:
+    """Run gh-api-guard.py's decision logic in-process."""
+    reason = gh_api_guard.evaluate(payload)
+    if not reason:
+        return None
+
+    output = {
+        "hookSpecificOutput": {
+            "hookEventName": "PreToolUse",
+            "permissionDecision": "allow",
+            "permissionDecisionReason": reason
+        }
+    }
+    return HookResult(0, json.dumps(output) + "\n", "")
+
+
+# git-commit-guard.sh
+GIT_COMMIT = re.compile(r'git commit')
+ISSUE_REF = re.compile(r'Refs [a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+#[0-9]+')
+
+ISSUE_REF_MESSAGE = """**[require-issue-ref]**
+**Issue reference required in commit message.**
+
+This session is linked to an issue. All commits must include:
+
+```
+Refs {owner}/{repo}#N
+```
+
+Examples:
+- Refs DaveX2001/deliverable-tracking#227
+- Refs DaveX2001/claude-code-improvements#111
+- Refs MariusWilsch/some-repo#42
+
+Add this to your commit message before proceeding.
+"""
+
+
+def git_commit_guard(payload: dict) -> HookResult | None:
+    """Block git commits without a Refs owner/repo#N issue reference."""
+    command = _command(payload)
+
+    if not GIT_COMMIT.search(command) or ISSUE_REF.search(command):
+        return None
+
+    return HookResult(2, "", ISSUE_REF_MESSAGE)
+
+
+Rule = Callable[[dict], Optional[HookResult]]
+
+# Same order as the PreToolUse "Bash" matcher in hooks/hooks.json
+BASH_CHAIN: list[tuple[str, Rule]] = [
+    ("bash-jsonl-blocker.sh", bash_jsonl_blocker),
+    ("pip-blocker.sh", pip_blocker),
+    ("gh-api-guard.py", gh_api_guard_rule),
+    ("git-commit-guard.sh", git_commit_guard),
+]
+
+# Fallback commands for the same chain when the daemon is unreachable
+BASH_CHAIN_SCRIPTS: list[list[str]] = [
+    ["bash", str(SCRIPTS_DIR / "bash-jsonl-blocker.sh")],
+    ["bash", str(SCRIPTS_DIR / "pip-blocker.sh")],
+    ["python3", str(SCRIPTS_DIR / "gh-api-guard.py")],
+    ["bash", str(SCRIPTS_DIR / "git-commit-guard.sh")],
+]
+
+
+def decision_rank(result: HookResult | None) -> int:
+    """Order results by strictness: silent < allow < ask < deny < exit 2."""
+    if result is None:
+        return 0
+    if result.exit_code == 2:
+        return 4
+    if not result.stdout.strip():
+        return 0
+
+    try:
+        output = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return 0
+    if not isinstance(output, dict):
+        return 0
+
+    if output.get("decision") == "block":
+        return 3
+    decision = (output.get("hookSpecificOutput") or {}).get("permissionDecision")
+    return {"allow": 1, "ask": 2, "deny": 3}.get(decision, 0)
+
+
+DECISION_NAMES = ["pass", "allow", "ask", "deny", "block"]
+
+
+def decision_name(result: HookResult | None) -> str:
+    """Telemetry name of a result's decision (see hook_telemetry.py)."""
+    return DECISION_NAMES[decision_rank(result)]
+
+
+def merge_results(results: list[HookResult | None]) -> HookResult:
+    """Combine chain results into one decision - the strictest wins.
+
+    Ties go to the earliest hook in the chain.
+    """
+    best = None
+    best_rank = 0
+    for result in results:
+        rank = decision_rank(result)
+        if rank > best_rank:
+            best, best_rank = result, rank
+
+    return best or HookResult(0, "", "")
+
+
+def run_rule(rule: Rule, payload: dict) -> HookResult | None:
+    """Run one rule; a crashing rule counts as no decision, like a crashing script."""
+    try:
+        return rule(payload)
+    except Exception:
+        return None
+
+
+def evaluate_bash_chain(payload: dict, timings: list | None = None) -> HookResult:
+    """Run every Bash PreToolUse rule and return the merged decision.
+
+    Args:
+        timings: If given, (hook name, result, milliseconds) is appended
+            for each rule
+    """
+    if not isinstance(payload, dict):
+        return HookResult(0, "", "")
+
+    results = []
+    for name, rule in BASH_CHAIN:
+        start = time.perf_counter()
+        results.append(run_rule(rule, payload))
+        if timings is not None:
+            timings.append((name, results[-1], (time.perf_counter() - start) * 1000))
+    return merge_results(results)
@@ -0,0 +1,79 @@
+"""Per-hook timing and decision records for the Python hooks.
+
+Each hook invocation appends its records to one JSON Lines log with a
+single write, so concurrent hooks never interleave partial lines:
+
+    {"ts": 1760803200.123, "hook": "gh-api-guard.py", "decision": "allow",
+     "ms": 0.04, "via": "daemon"}
+
+decision is pass (no output), allow, ask, deny or block (exit 2); the
+context gate logs info or warn. via is daemon for rules evaluated inside
+hook-daemon.py and script for standalone runs. ms is time spent in the
+rule or script, not interpreter startup.
+
+The log lives in the plugin cache ($CLAUDE_PLUGIN_CACHE_DIR, else
+$XDG_CACHE_HOME/claude-code-team-plugin) as hook-telemetry.jsonl. Once it
+passes MAX_BYTES it is rotated to hook-telemetry.jsonl.1, replacing the
+previous one, so telemetry never takes more than twice that. The shell
+hooks write the same records through hook-telemetry.sh.
+
+Set CLAUDE_HOOK_TELEMETRY=0 to disable. Aggregate with lib/hook_stats.py.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+APP_NAME = "claude-code-team-plugin"
+LOG_NAME = "hook-telemetry.jsonl"
+
+# Rotate the log past this size (keep in sync with hook-telemetry.sh)
+MAX_BYTES = 1024 * 1024
+
+
+def enabled() -> bool:
+    """Whether telemetry is on ($CLAUDE_HOOK_TELEMETRY != 0)."""
+    return os.environ.get("CLAUDE_HOOK_TELEMETRY", "1") != "0"
+
+
+def log_path() -> str:
+    """Telemetry log location (same root as lib/plugin_cache.py)."""
+    root = os.environ.get("CLAUDE_PLUGIN_CACHE_DIR")
+    if not root:
+        xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        root = os.path.join(xdg, APP_NAME)
+    return os.path.join(root, LOG_NAME)
+
+
+def record(hook: str, decision: str, ms: float, via: str, ts: float | None = None) -> dict:
+    """One log record; ts defaults to now."""
+    ts = time.time() if ts is None else ts
+    return {"ts": round(ts, 3), "hook": hook, "decision": decision, "ms": round(ms, 3), "via": via}
+
+
+def write(records: list[dict]) -> None:
+    """Append records in one write, rotating the log when it is full.
+
+    Telemetry must never break a hook, so every error is swallowed.
+    """
+    if not records or not enabled():
+        return
+
+    data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode()
+    path = log_path()
+    try:
+        try:
+            if os.stat(path).st_size + len(data) > MAX_BYTES:
+                os.replace(path, path + ".1")
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
@@ -3,6 +3,9 @@
 # Blocks raw Read on conversation JSONL files.
 # Redirects to conversation-reader skill for proper extraction.
 
+# Timing + decision telemetry (see hook-telemetry.sh)
+source "${0%/*}/hook-telemetry.sh" 2>/dev/null
+
 # Read hook input from stdin
 input=$(cat)
 
@@ -11,6 +14,7 @@ file_path=$(echo "$input" | jq -r '.tool_input.file_path // empty')
 
 # Check if file_path matches conversation JSONL pattern
 if echo "$file_path" | grep -qE '\.claude/projects/.*\.jsonl$'; then
+  TELEMETRY_DECISION="deny"
   cat << 'EOF'
 {
   "hookSpecificOutput": {
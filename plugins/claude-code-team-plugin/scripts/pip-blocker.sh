@@ -3,6 +3,9 @@
 # Enforces uv usage instead of pip/pip3/uv pip commands.
 # Denies pip commands and instructs Claude to use proper uv workflow.
 
+# Timing + decision telemetry (see hook-telemetry.sh)
+source "${0%/*}/hook-telemetry.sh" 2>/dev/null
+
 # Read hook input from stdin
 input=$(cat)
 
@@ -16,6 +19,7 @@ fi
 
 # Check if command contains pip install patterns
 if echo "$command" | grep -qE '(^|\s|&&|\|)(pip|pip3)\s+install|uv\s+pip\s+install'; then
+  TELEMETRY_DECISION="deny"
   cat << 'EOF'
 {
   "hookSpecificOutput": {
@@ -28,12 +32,26 @@ EOF
   exit 0
 fi
 
+# Allow this plugin's CLI (stdlib only; python3 -S keeps its startup fast):
+# the whole command must be one known subcommand with plain arguments - no
+# other plugin_cli.py, chaining, substitution, redirection or second line.
+# The resolved plugin root counts as ${CLAUDE_PLUGIN_ROOT}.
+PLUGIN_CLI='^python3 -S \$\{CLAUDE_PLUGIN_ROOT\}/lib/plugin_cli\.py (context-usage|bootstrap|issue-context|discover|self-check)( [A-Za-z0-9_./=#-]+)*$'
+if [[ "$command" == "python3 -S "* && "$command" != *$'\n'* ]]; then
+  plugin_root="${CLAUDE_PLUGIN_ROOT:-$(cd "$(dirname "$0")/.." && pwd -P)}"
+  cli_command=${command/#"python3 -S ${plugin_root%/}/"/'python3 -S ${CLAUDE_PLUGIN_ROOT}/'}
+  if echo "$cli_command" | grep -qE "$PLUGIN_CLI"; then
+    exit 0
+  fi
+fi
+
 # Check if command runs python/python3 directly (should use uv run instead)
 # Skip if using uv run (with any flags before python)
 if echo "$command" | grep -qE '(^|\s|&&|\|)python3?\s' && \
    ! echo "$command" | grep -qE 'uv run(\s+--?[a-z]|\s+python)' && \
    ! echo "$command" | grep -qE 'python3?\s+(--version|-V)' && \
    ! echo "$command" | grep -qE '(^docker\s|^ssh\s.*docker\s)'; then
+  TELEMETRY_DECISION="deny"
   cat << 'EOF'
 {
   "hookSpecificOutput": {
@@ -9,6 +9,9 @@
 
 set -e
 
+# Timing + decision telemetry (see hook-telemetry.sh)
+source "${0%/*}/hook-telemetry.sh" 2>/dev/null
+
 # Read hook input from stdin
 INPUT=$(cat)
 
@@ -31,7 +34,7 @@ fi
 PLUGIN_ROOT="${CLAUDE_PLUGIN_ROOT:-$(dirname "$(dirname "$0")")}"
 
 # Run context usage calculation
-RESULT=$(uv run "$PLUGIN_ROOT/lib/context_usage.py" "$TRANSCRIPT_PATH" 2>/dev/null)
+RESULT=$(python3 -S "$PLUGIN_ROOT/lib/plugin_cli.py" context-usage "$TRANSCRIPT_PATH" 2>/dev/null)
 
 if [[ -z "$RESULT" ]]; then
     exit 0
@@ -40,6 +43,7 @@ fi
 # Parse result
 PERCENTAGE=$(echo "$RESULT" | jq -r '.percentage // 0' 2>/dev/null)
 TOKENS=$(echo "$RESULT" | jq -r '.tokens // 0' 2>/dev/null)
+LIMIT=$(echo "$RESULT" | jq -r '.limit // 200000' 2>/dev/null)
 
 # Format token count for readability
 if [[ "$TOKENS" -ge 1000 ]]; then
@@ -47,15 +51,18 @@ if [[ "$TOKENS" -ge 1000 ]]; then
 else
     TOKENS_DISPLAY="$TOKENS"
 fi
+LIMIT_DISPLAY="$((LIMIT / 1000))k"
 
 # Output JSON with additionalContext so Claude sees the context percentage
 # Plain echo only goes to verbose mode; JSON additionalContext reaches Claude
 if [[ "$PERCENTAGE" -ge 60 ]]; then
     # Warning at ≥60% - signal graceful exit consideration
-    MESSAGE="⚠️ CONTEXT GATE: ${PERCENTAGE}% (${TOKENS_DISPLAY}/200k tokens). Consider graceful exit after completing current task."
+    TELEMETRY_DECISION="warn"
+    MESSAGE="⚠️ CONTEXT GATE: ${PERCENTAGE}% (${TOKENS_DISPLAY}/${LIMIT_DISPLAY} tokens). Consider graceful exit after completing current task."
 elif [[ "$PERCENTAGE" -ge 30 ]]; then
     # Info for notable percentages
-    MESSAGE="Context: ${PERCENTAGE}% (${TOKENS_DISPLAY}/200k)"
+    TELEMETRY_DECISION="info"
+    MESSAGE="Context: ${PERCENTAGE}% (${TOKENS_DISPLAY}/${LIMIT_DISPLAY})"
 else
     # Below 30% - no output needed
     exit 0